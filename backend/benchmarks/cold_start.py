@@ -0,0 +1,98 @@
+"""
+Cold-Start Benchmark
+Measures how long a fresh worker takes to import the app and to answer its
+first /health and first /api/chat request, plus the slowest imports.
+
+    uv run python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+from benchmarks.run import BACKEND_DIR, REQUIRED_ENV, market_state_env
+from benchmarks.stubs import StubConfig, StubServer, free_port
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env: Dict[str, str], top: int) -> List[tuple]:
+    """Modules imported at depth <= 1 (main and its direct imports) by cumulative time."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    totals: Dict[str, int] = {}
+    for line in out.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match and len(match.group(2)) <= 3:  # depth 0 and 1
+            totals[match.group(3)] = totals.get(match.group(3), 0) + int(match.group(1))
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+def measure_first_requests(env: Dict[str, str]) -> Dict[str, float]:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if proc.poll() is not None:
+                raise RuntimeError("Backend exited during startup")
+            try:
+                if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                time.sleep(0.05)
+        health = time.perf_counter() - started
+        payload = {"user_id": 99, "message": "What is the ADA rate?", "context": {"user_id": 99}}
+        httpx.post(f"{base_url}/api/chat", json=payload, timeout=120).raise_for_status()
+        chat = time.perf_counter() - started
+    finally:
+        proc.kill()
+        proc.wait()
+    return {"first_health_s": health, "first_chat_s": chat}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RemitAI cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="How many slow imports to list")
+    args = parser.parse_args()
+
+    stub = StubServer(StubConfig(upstream_latency=0.0, llm_latency=0.0)).start()
+    # No persisted market state: every run starts truly cold
+    env = {**os.environ, **REQUIRED_ENV, **stub.env(), **market_state_env(None)}
+    try:
+        imports = [measure_import(env) for _ in range(args.runs)]
+        firsts = [measure_first_requests(env) for _ in range(args.runs)]
+        slow = slowest_imports(env, args.top)
+    finally:
+        stub.stop()
+
+    print(f"import main        median {statistics.median(imports):.2f}s  (runs: {', '.join(f'{t:.2f}' for t in imports)})")
+    for key in ("first_health_s", "first_chat_s"):
+        values = [f[key] for f in firsts]
+        print(f"{key:<18} median {statistics.median(values):.2f}s  (runs: {', '.join(f'{v:.2f}' for v in values)})")
+    print("\nSlowest imports (cumulative):")
+    for name, micros in slow:
+        print(f"  {name:<40} {micros / 1_000_000:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
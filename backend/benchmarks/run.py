@@ -0,0 +1,289 @@
+"""
+Load & Latency Benchmark
+Starts the backend against local upstream stubs, drives the hot endpoints at
+fixed concurrency levels and reports throughput and p50/p95/p99 latency.
+
+    uv run python -m benchmarks.run                       # run and print
+    uv run python -m benchmarks.run --save baseline       # store benchmarks/baselines/baseline.json
+    uv run python -m benchmarks.run --compare baseline    # fail on p95 regressions
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.stubs import StubConfig, StubServer, free_port
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Settings without defaults; placeholders are enough since every upstream is stubbed.
+REQUIRED_ENV = {
+    "CARDANO_BLOCKFROST_API_KEY": "bench",
+    "BLOCKFROST_API_KEY_PREPROD": "bench",
+    "MASUMI_API_KEY": "bench",
+    "ENCRYPTION_KEY": "bench",
+    "ADMIN_KEY": "bench",
+    "AGENT_WALLET_ADDRESS": "addr_test1_bench",
+    "AGENT_WALLET_SIGNING_KEY": "bench",
+    "PAYMENT_API_KEY": "bench",
+    "SELLER_VKEY": "",  # empty = no payment proof required for jobs
+}
+
+
+def market_state_env(workdir: Optional[Path]) -> Dict[str, str]:
+    """
+    Market snapshot, price history and last-known-good paths under `workdir`,
+    or "" (disabled) without one, so stub prices never reach a real server's
+    files. Same idea as tests/conftest.py.
+    """
+    return {
+        "MARKET_SNAPSHOT_FILE": str(workdir / "market.snapshot") if workdir else "",
+        "PRICE_HISTORY_DIR": str(workdir / "price-history") if workdir else "",
+        "MARKET_LKG_FILE": str(workdir / "market_last_good.json") if workdir else "",
+    }
+
+
+# --- Scenarios ---
+
+Scenario = Callable[[httpx.AsyncClient], Awaitable[None]]
+
+
+async def rater_rate(client: httpx.AsyncClient):
+    r = await client.post("/api/rater/rate", json={
+        "from_currency": "ADA", "to_currency": "USD", "amount": 500, "from_country": "USA", "to_country": "India",
+    })
+    r.raise_for_status()
+
+
+async def rater_providers(client: httpx.AsyncClient):
+    (await client.get("/api/rater/providers")).raise_for_status()
+
+
+async def users_list(client: httpx.AsyncClient):
+    (await client.get("/api/users")).raise_for_status()
+
+
+async def users_get(client: httpx.AsyncClient):
+    (await client.get("/api/users/99")).raise_for_status()
+
+
+async def users_payees(client: httpx.AsyncClient):
+    (await client.get("/api/users/99/payees")).raise_for_status()
+
+
+async def users_search(client: httpx.AsyncClient):
+    (await client.get("/api/users/99/payees/search", params={"q": "sister"})).raise_for_status()
+
+
+async def chat(client: httpx.AsyncClient):
+    payload = {"user_id": 99, "message": "What is the ADA to iUSD rate?", "context": {"user_id": 99}}
+    async with client.stream("POST", "/api/chat", json=payload) as r:
+        r.raise_for_status()
+        async for _ in r.aiter_bytes():
+            pass
+
+
+async def masumi_job(client: httpx.AsyncClient):
+    r = await client.post("/api/masumi/start_job", json={"input": {"message": "Rate for 100 ADA?"}})
+    r.raise_for_status()
+    job_id = r.json()["job_id"]
+    while True:
+        status = (await client.get(f"/api/masumi/status/{job_id}")).json()
+        if status["status"] == "completed":
+            return
+        if status["status"] != "processing":
+            raise RuntimeError(f"Job {job_id} failed: {status}")
+        await asyncio.sleep(0.05)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "rater_rate": rater_rate,
+    "rater_providers": rater_providers,
+    "users_list": users_list,
+    "users_get": users_get,
+    "users_payees": users_payees,
+    "users_search": users_search,
+    "chat": chat,
+    "masumi_job": masumi_job,
+}
+
+# LLM-bound scenarios are much slower; scale their request count down.
+SLOW_SCENARIOS = {"chat", "masumi_job"}
+
+
+# --- Measurement ---
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def drive(client: httpx.AsyncClient, scenario: Scenario, concurrency: int, total: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                await scenario(client)
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+# --- Backend process ---
+
+def start_backend(stub: StubServer, data_file: Path) -> Tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = {
+        **os.environ, **REQUIRED_ENV, **stub.env(), **market_state_env(data_file.parent),
+        "USERS_DATA_FILE": str(data_file),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("Backend exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("Backend did not become healthy in time")
+
+
+async def run_all(base_url: str, scenarios: List[str], levels: List[int], requests: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    limits = httpx.Limits(max_connections=max(levels) * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        for name in scenarios:
+            total = max(1, requests // 10) if name in SLOW_SCENARIOS else requests
+            await SCENARIOS[name](client)  # warm-up
+            results[name] = {}
+            for c in levels:
+                stats = await drive(client, SCENARIOS[name], c, max(total, c))
+                results[name][str(c)] = stats
+                print(f"{name:<16} c={c:<4} {stats['throughput_rps']:>9} req/s  "
+                      f"p50={stats['p50_ms']:>8}ms  p95={stats['p95_ms']:>8}ms  p99={stats['p99_ms']:>8}ms  "
+                      f"errors={stats['errors']}")
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Returns a list of p95 regressions beyond `tolerance` (fraction)."""
+    regressions = []
+    for name, levels in results.items():
+        for c, stats in levels.items():
+            base = baseline.get("results", {}).get(name, {}).get(c)
+            if not base or not base["p95_ms"]:
+                continue
+            if stats["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+                regressions.append(f"{name} c={c}: p95 {base['p95_ms']}ms -> {stats['p95_ms']}ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RemitAI load & latency benchmark")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario and level")
+    parser.add_argument("--upstream-latency", type=float, default=0.02, help="Stubbed upstream latency (s)")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Fake LLM latency (s)")
+    parser.add_argument("--save", metavar="NAME", help="Save results as a named baseline")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against a named baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 regression (fraction)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    stub = StubServer(StubConfig(upstream_latency=args.upstream_latency, llm_latency=args.llm_latency)).start()
+    workdir = Path(tempfile.mkdtemp(prefix="remit-bench-"))
+    data_file = workdir / "users.json"
+    shutil.copy(BACKEND_DIR / "src/data/users.json", data_file)
+
+    proc, base_url = start_backend(stub, data_file)
+    try:
+        results = asyncio.run(run_all(base_url, scenarios, levels, args.requests))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        stub.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "upstream_latency_s": args.upstream_latency,
+            "llm_latency_s": args.llm_latency,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(report, indent=4))
+        print(f"Saved baseline to {path}")
+
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("Performance regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"No p95 regressions beyond {args.tolerance:.0%} vs '{args.compare}'.")
+
+
+if __name__ == "__main__":
+    main()
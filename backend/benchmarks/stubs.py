@@ -0,0 +1,169 @@
+"""
+Local Upstream Stubs
+One FastAPI app that impersonates every upstream the backend talks to, so
+benchmarks are reproducible and never touch the real services:
+
+    /minswap/aggregator/*        Minswap aggregator (estimate, wallet)
+    /binance/api/v3/ticker/price Binance ticker
+    /coingecko/api/v3/simple/*   CoinGecko simple price
+    /masumi/api/v1/payment/*     Masumi payment service
+    /llm/v1/chat/completions     OpenAI-compatible fake LLM
+"""
+import asyncio
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+ADA_USD = 0.35
+
+
+class StubConfig:
+    """Latency knobs (seconds) for each stubbed upstream."""
+
+    def __init__(self, upstream_latency: float = 0.02, llm_latency: float = 0.2, jitter: float = 0.1, seed: int = 42):
+        self.upstream_latency = upstream_latency
+        self.llm_latency = llm_latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+
+    async def sleep(self, base: float):
+        if base > 0:
+            await asyncio.sleep(base * (1 + self.random.uniform(-self.jitter, self.jitter)))
+
+
+def create_stub_app(config: StubConfig) -> FastAPI:
+    app = FastAPI(title="RemitAI Upstream Stubs")
+
+    # --- Minswap Aggregator ---
+    @app.post("/minswap/aggregator/estimate")
+    async def minswap_estimate(payload: Dict[str, Any]):
+        await config.sleep(config.upstream_latency)
+        amount = float(payload.get("amount", 0))
+        if not payload.get("amount_in_decimal"):
+            amount /= 1_000_000
+        # Simple constant-product style impact: 0.1% per 10k ADA
+        impact = min(amount / 10_000 * 0.1, 30.0)
+        out = amount * ADA_USD * (1 - impact / 100)
+        return {
+            "amount_out": str(out) if payload.get("amount_in_decimal") else str(int(out * 1_000_000)),
+            "min_amount_out": str(out * 0.99) if payload.get("amount_in_decimal") else str(int(out * 0.99 * 1_000_000)),
+            "avg_price_impact": round(impact, 4),
+            "paths": [[{"protocol": "MinswapV2"}]],
+        }
+
+    @app.post("/minswap/aggregator/wallet")
+    async def minswap_wallet(payload: Dict[str, Any]):
+        await config.sleep(config.upstream_latency)
+        return {
+            "wallet": payload.get("wallet"),
+            "ada": {"amount": "1523.4", "decimals": 6},
+            "balance": [],
+        }
+
+    # --- Binance ---
+    @app.get("/binance/api/v3/ticker/price")
+    async def binance_ticker(symbol: str = "ADAUSDT"):
+        await config.sleep(config.upstream_latency)
+        return {"symbol": symbol, "price": f"{ADA_USD:.8f}"}
+
+    # --- CoinGecko ---
+    @app.get("/coingecko/api/v3/simple/price")
+    async def coingecko_price(ids: str = "cardano", vs_currencies: str = "usd", include_24hr_vol: bool = False):
+        await config.sleep(config.upstream_latency)
+        rates = {c: round(ADA_USD * (1 + i * 0.731), 6) for i, c in enumerate(vs_currencies.split(","))}
+        rates["usd"] = ADA_USD
+        if include_24hr_vol:
+            rates.update({f"{c}_24h_vol": 350_000_000 * rates[c] / ADA_USD for c in list(rates)})
+        return {coin: {c: v for c, v in rates.items() if c.split("_")[0] in vs_currencies.split(",")} for coin in ids.split(",")}
+
+    # --- Masumi Payment Service ---
+    @app.get("/masumi/api/v1/payment/")
+    async def masumi_payments(network: str = "Preprod", limit: int = 100):
+        await config.sleep(config.upstream_latency)
+        return {"status": "success", "data": {"Payments": []}}
+
+    @app.post("/masumi/api/v1/payment/resolve-blockchain-identifier")
+    async def masumi_resolve(payload: Dict[str, Any]):
+        await config.sleep(config.upstream_latency)
+        return {"status": "success", "data": {"status": "PAID_AND_CONFIRMED", "onChainState": "FundsLocked"}}
+
+    # --- Fake LLM (OpenAI chat completions) ---
+    @app.post("/llm/v1/chat/completions")
+    async def fake_llm(request: Request):
+        body = await request.json()
+        await config.sleep(config.llm_latency)
+        prompt = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+        if "Classify this message" in prompt:
+            answer = "rate_inquiry"
+        elif "category tags" in prompt:
+            answer = '["Family", "Support"]'
+        else:
+            answer = f"1 ADA is currently worth about {ADA_USD} iUSD."
+        content = f"Thought: I now know the final answer\nFinal Answer: {answer}"
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                      "total_tokens": (len(prompt) + len(content)) // 4},
+        }
+
+    return app
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StubServer:
+    """Runs the stub app with uvicorn in a background thread."""
+
+    def __init__(self, config: Optional[StubConfig] = None, port: Optional[int] = None):
+        self.config = config or StubConfig()
+        self.port = port or free_port()
+        self._server = uvicorn.Server(uvicorn.Config(
+            create_stub_app(self.config), host="127.0.0.1", port=self.port, log_level="warning"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def env(self) -> Dict[str, str]:
+        """Environment overrides that point the backend at this stub."""
+        return {
+            "MINSWAP_AGGREGATOR_URL": f"{self.base_url}/minswap/aggregator",
+            "BINANCE_API_URL": f"{self.base_url}/binance/api/v3/ticker/price",
+            "COINGECKO_API_URL": f"{self.base_url}/coingecko/api/v3",
+            "MASUMI_PAYMENT_SERVICE_URL": f"{self.base_url}/masumi/api/v1",
+            "MASUMI_REGISTRY_SERVICE_URL": f"{self.base_url}/masumi/api/v1",
+            "PAYMENT_SERVICE_URL": f"{self.base_url}/masumi/api/v1",
+            "LLM_PROVIDER": "openai",
+            "OPENAI_API_KEY": "stub",
+            "OPENAI_MODEL_NAME": "gpt-4o",
+            "OPENAI_BASE_URL": f"{self.base_url}/llm/v1",
+        }
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        deadline = time.time() + 10
+        while not self._server.started:
+            if time.time() > deadline:
+                raise RuntimeError("Stub server failed to start")
+            time.sleep(0.02)
+        return self
+
+    def stop(self):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
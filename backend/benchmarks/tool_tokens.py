@@ -0,0 +1,113 @@
+"""
+Agent Tool Prompt-Token Benchmark
+Compares the prompt tokens of the `verbose` and `compact` tool output formats
+(src/tools/tool_format.py) on representative tool results. A ReAct run feeds
+every tool observation back into each later LLM step, so the per-run saving is
+the per-call saving times the steps that follow it.
+
+    uv run python -m benchmarks.tool_tokens
+    uv run python -m benchmarks.tool_tokens --matches 1,5,20 --steps 4
+"""
+import argparse
+import json
+import os
+import random
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.run import BACKEND_DIR, REQUIRED_ENV, market_state_env
+
+# Nothing is called; the service URLs only need to be set
+for key, value in {**REQUIRED_ENV, **market_state_env(None), "MASUMI_PAYMENT_SERVICE_URL": "http://127.0.0.1:9",
+                   "MASUMI_REGISTRY_SERVICE_URL": "http://127.0.0.1:9", "PAYMENT_SERVICE_URL": "http://127.0.0.1:9"}.items():
+    os.environ.setdefault(key, value)
+
+from src.core.llm_scheduler import estimate_tokens  # noqa: E402
+from src.models.schemas import Payee, SplitOrderLeg, SplitOrderPlan  # noqa: E402
+from src.tools.tool_format import CompactFormat, VerboseFormat  # noqa: E402
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None  # falls back to the scheduler's ~4 chars/token estimate
+
+TAGS = ["Family", "Sister", "Rent", "Housing", "Business", "Student", "Utilities", "Priority"]
+COUNTRIES = [("Philippines", "PHP"), ("India", "INR"), ("Finland", "Euro"), ("Nepal", "NPR")]
+
+
+def token_counter() -> Tuple[str, Callable[[str], int]]:
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding("cl100k_base")
+            return "tiktoken cl100k_base", lambda text: len(encoding.encode(text))
+        except Exception:
+            pass  # the encoding file may need a download
+    return "~4 chars/token estimate", estimate_tokens
+
+
+def sample_payees(count: int, seed: int = 7) -> List[Payee]:
+    """The seed users' payees first, then realistic synthetic ones."""
+    with open(BACKEND_DIR / "src" / "data" / "users.json") as f:
+        payees = [Payee(**p) for user in json.load(f) for p in user.get("payees", [])]
+    rng = random.Random(seed)
+    while len(payees) < count:
+        country, currency = rng.choice(COUNTRIES)
+        payees.append(Payee(
+            id=f"{rng.getrandbits(32):08x}",
+            name=f"Payee {len(payees) + 1}",
+            wallet_address="addr_test1q" + "".join(rng.choice("023456789acdefghjklmnpqrstuvwxyz") for _ in range(97)),
+            country=country,
+            currency=currency,
+            tags=rng.sample(TAGS, 3),
+            created_at="2025-11-29T22:24:51.440762",
+        ))
+    return payees[:count]
+
+
+def scenarios(matches: List[int]) -> Dict[str, Callable]:
+    quote = {"success": True, "input_ada": 250.0, "estimated_iusd": 87.449125, "minimum_iusd": 86.574634,
+             "price_impact_percent": 0.0025, "protocols_used": ["MinswapV2", "WingRiders"]}
+    plan = SplitOrderPlan(
+        amount_ada=50000.0, expected_output_usd=17412.55, best_single_provider="Exchange",
+        best_single_output_usd=17250.0, savings_usd=162.55, compute_ms=3.2,
+        legs=[
+            SplitOrderLeg(provider="DEX", amount_ada=30000.0, slices=4, expected_output_usd=10462.5,
+                          effective_rate=0.34875, estimated_time_hours=0.6),
+            SplitOrderLeg(provider="Exchange", amount_ada=20000.0, expected_output_usd=6950.05,
+                          effective_rate=0.3475, estimated_time_hours=1.0),
+        ],
+    )
+    cases = {
+        f"search_my_payees (n={n})": (lambda fmt, n=n: fmt.payees("family", sample_payees(n)))
+        for n in matches
+    }
+    cases.update({
+        "swap_ada_to_stable": lambda fmt: fmt.quote(250.0, quote),
+        "get_ada_to_stable_rate": lambda fmt: fmt.dex_rate("ADA/iUSD", 0.34979965),
+        "get_corridor_rate": lambda fmt: fmt.corridor_rate("usd", "php", 58.73412),
+        "plan_split_remittance": lambda fmt: fmt.split_plan(50000.0, plan),
+    })
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--matches", default="1,5,20", help="Payee search result sizes to measure")
+    parser.add_argument("--steps", type=int, default=4, help="LLM steps after the tool call that re-send its output")
+    parser.add_argument("--top-k", type=int, default=3, help="Payee matches kept by the compact format")
+    args = parser.parse_args()
+
+    counter_name, count = token_counter()
+    verbose, compact = VerboseFormat(), CompactFormat(top_k=args.top_k)
+    print(f"Tokens counted with {counter_name}; per run = per call x {args.steps} later steps\n")
+    print(f"{'tool output':<34}{'verbose':>9}{'compact':>9}{'saved':>8}{'per run':>10}")
+    total_verbose = total_compact = 0
+    for name, render in scenarios([int(m) for m in args.matches.split(",")]).items():
+        v, c = count(render(verbose)), count(render(compact))
+        total_verbose, total_compact = total_verbose + v, total_compact + c
+        print(f"{name:<34}{v:>9}{c:>9}{(v - c) / v:>8.0%}{(v - c) * args.steps:>10}")
+    print(f"{'total':<34}{total_verbose:>9}{total_compact:>9}{(total_verbose - total_compact) / total_verbose:>8.0%}"
+          f"{(total_verbose - total_compact) * args.steps:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,56 @@
 RemitAI Python Backend
 CrewAI-powered agent for remittance optimization
 """
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from src.core.settings import settings
+from src.core.llm_scheduler import llm_scheduler
+from src.core.metrics import HTTP_REQUEST_DURATION, monitor_event_loop_lag
+from src.core.circuit_breaker import breakers
+from src.core.tracing import start_trace, end_trace, export_trace
+from src.core.profiler import SamplingProfiler, is_profile_request
+from src.dependencies import warm_up, get_rater_service, get_wallet_service
+from src.services.market_snapshot import market_snapshot
+from src.services.market_refresher import run_refresher
+from src.services.last_known_good import last_known_good, start_staleness_tracking, stop_staleness_tracking
+from loguru import logger
 
 # Import Routers
-from src.routers import users, chat, rater
+from src.routers import users, chat, rater, metrics
 from src.agents import masumi_agent
 
+
+def _log_warmup_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"Warm-up failed: {task.exception()}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    last_known_good.load()
+    lag_monitor = asyncio.create_task(monitor_event_loop_lag())
+    refresher = asyncio.create_task(run_refresher())
+    route_table = asyncio.create_task(get_rater_service().run_route_table_refresher())
+    if settings.WARMUP_ON_STARTUP:
+        # Off the event loop so the worker starts serving immediately
+        warmup = asyncio.create_task(asyncio.to_thread(warm_up))
+        warmup.add_done_callback(_log_warmup_failure)
+    yield
+    lag_monitor.cancel()
+    refresher.cancel()
+    route_table.cancel()
+    await get_wallet_service().aclose()
+
+
 app = FastAPI(
     title="RemitAI Backend",
     version="2.0.0",
-    description="Service-Oriented Architecture with CrewAI"
+    description="Service-Oriented Architecture with CrewAI",
+    lifespan=lifespan
 )
 
 # CORS
@@ -25,10 +63,78 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def report_stale_data(request: Request, call_next):
+    stale, token = start_staleness_tracking()
+    try:
+        response = await call_next(request)
+    finally:
+        stop_staleness_tracking(token)
+    if stale:
+        response.headers["X-Data-Stale-Seconds"] = str(int(max(stale.values())))
+        response.headers["X-Data-Stale-Sources"] = ",".join(sorted(stale))
+    return response
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/api/users/{user_id}), not the raw path
+        route = request.scope.get("route")
+        HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    if not settings.TRACING_ENABLED:
+        return await call_next(request)
+
+    trace, token = start_trace(f"{request.method} {request.url.path}")
+    profiler = SamplingProfiler().start() if is_profile_request(request) else None
+    try:
+        response = await call_next(request)
+    finally:
+        end_trace(token)
+    response.headers["Server-Timing"] = trace.server_timing()
+
+    if profiler:
+        # Drain the body so streamed work is part of the profile
+        async for _ in response.body_iterator:
+            pass
+        profiler.stop()
+        return PlainTextResponse(profiler.collapsed(), headers={
+            "Server-Timing": trace.server_timing(),
+            "X-Profiled-Status": str(response.status_code),
+            "X-Profile-Samples": str(profiler.samples),
+        })
+
+    if settings.TRACE_EXPORT_FILE:
+        body = response.body_iterator
+
+        async def export_when_done():
+            try:
+                async for chunk in body:
+                    yield chunk
+            finally:
+                await asyncio.to_thread(export_trace, trace, settings.TRACE_EXPORT_FILE)
+
+        response.body_iterator = export_when_done()
+    return response
+
 # Register Routers
 app.include_router(users.router)
 app.include_router(chat.router)
 app.include_router(rater.router)
+app.include_router(metrics.router)
 
 # Masumi Protocol
 app.include_router(masumi_agent.router)
@@ -40,5 +146,10 @@ def health_check():
     return {
         "status": "healthy",
         "llm_provider": settings.LLM_PROVIDER,
-        "network": settings.CARDANO_NETWORK
+        "network": settings.CARDANO_NETWORK,
+        "llm_scheduler": llm_scheduler.metrics(),
+        "market_snapshot_age_s": market_snapshot.status(),
+        "last_known_good_age_s": last_known_good.status(),
+        "route_table": get_rater_service().route_table.status(),
+        "circuit_breakers": {name: breaker.status() for name, breaker in breakers.items()}
     }
\ No newline at end of file
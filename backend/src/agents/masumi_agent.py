@@ -3,14 +3,15 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from typing import Dict, Any, Optional
-from src.agents.remit_agent import RemitAgentManager
+from src.core.llm_scheduler import Priority
+from src.core.metrics import JOB_QUEUE_DEPTH
 from src.core.settings import settings
-from src.services.masumi_service import masumi_service 
+from src.dependencies import get_agent_manager, get_masumi_service
 from loguru import logger
 import uuid
+from src.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/masumi", tags=["Masumi Protocol (MIP-003)"])
-agent_manager = RemitAgentManager()
+router = APIRouter(prefix="/api/masumi", tags=["Masumi Protocol (MIP-003)"], route_class=TracedRoute)
 
 # --- MIP-003 Models ---
 class JobRequest(BaseModel):
@@ -48,6 +49,7 @@ async def get_input_schema():
 
 # In-memory job store (Use Redis/DB for production)
 job_store = {}
+JOB_QUEUE_DEPTH.set_function(lambda: sum(1 for job in list(job_store.values()) if job["status"] == "processing"))
 
 @router.post("/start_job")
 async def start_job(request: JobRequest, background_tasks: BackgroundTasks):
@@ -57,7 +59,7 @@ async def start_job(request: JobRequest, background_tasks: BackgroundTasks):
         if not request.payment_tx_hash:
             raise HTTPException(status_code=402, detail="Payment required: payment_tx_hash is missing.")
         
-        is_paid = await masumi_service.verify_payment(request.payment_tx_hash)
+        is_paid = await get_masumi_service().verify_payment(request.payment_tx_hash)
         if not is_paid:
             raise HTTPException(status_code=402, detail="Payment not confirmed or invalid. Please ensure the transaction is confirmed on the blockchain.")
 
@@ -91,7 +93,7 @@ async def run_agent_task(job_id: str, message: str, context: Optional[dict]):
         logger.info(f"Starting background task for job_id: {job_id}")
         
         result_chunks = []
-        async for chunk in agent_manager.chat(message, context):
+        async for chunk in get_agent_manager(Priority.JOB).chat(message, context):
             result_chunks.append(chunk)
         
         final_result = "".join(result_chunks)
@@ -1,29 +1,37 @@
 from crewai import Agent, Task, Crew, Process
 from src.tools.agent_tools import RemitTools
+from src.tools.tool_cache import tool_run
 from src.core.llm_factory import LLMFactory
-from src.services.user_service import UserService
-from src.services.context_service import ContextService
+from src.core.llm_scheduler import Priority
+from src.core.tracing import span
+from src.core.settings import settings
+from src.dependencies import get_user_service, get_context_service
+from src.services.context_service import truncate_to_tokens
 from typing import Union, AsyncGenerator
 
 class RemitAgentManager:
-    def __init__(self):
-        self.llm = LLMFactory.create_llm()
-        self.user_service = UserService()
-        self.context_service = ContextService()
+    def __init__(self, priority: Priority = Priority.INTERACTIVE):
+        self.llm = LLMFactory.create_llm(priority)
+        # Shared with the routers; conversation history must be too
+        self.user_service = get_user_service()
+        self.context_service = get_context_service()
 
     async def chat(self, user_message: str, context: Union[dict, None] = None) -> AsyncGenerator[str, None]:
         context = context or {}
         conversation_id = context.get("conversation_id", "default")
         current_user_id = context.get("user_id", 99)
 
+        # Both bounded, so every prompt stays under a fixed token budget
+        history = self.context_service.get_history(conversation_id)
         self.context_service.add_message(conversation_id, "user", user_message)
+        user_message = truncate_to_tokens(user_message, settings.CHAT_MESSAGE_MAX_TOKENS)
 
         # --- 1️⃣ ROUTING AGENT ---
         router = Agent(
             role="Intent Router",
             goal='Decide if user intent is "rate_inquiry" or "transaction_plan" ONLY.',
             backstory="You analyze user intent and pick one of two possible categories.",
-            llm=self.llm,
+            llm=self.llm.with_call_site("intent_router"),
         )
 
         route_task = Task(
@@ -38,7 +46,8 @@ class RemitAgentManager:
             process=Process.sequential,
         )
 
-        routing_decision = str(route_crew.kickoff()).strip().lower()
+        with span("crew.intent_router"):
+            routing_decision = str(route_crew.kickoff()).strip().lower()
         if "rate" in routing_decision:
             intent = "rate_inquiry"
         elif "transaction" in routing_decision or "plan" in routing_decision:
@@ -52,13 +61,13 @@ class RemitAgentManager:
                 role="Rate Inquiry Specialist",
                 goal="Answer user questions about crypto exchange rates using your tools.",
                 backstory="You are a financial expert who provides accurate exchange rates.",
-                tools=[RemitTools.get_ada_to_stable_rate, RemitTools.swap_ada_to_stable],
-                llm=self.llm,
+                tools=[RemitTools.get_ada_to_stable_rate, RemitTools.get_corridor_rate, RemitTools.swap_ada_to_stable, RemitTools.plan_split_remittance],
+                llm=self.llm.with_call_site("rate_inquiry"),
                 verbose=True,
             )
 
             task = Task(
-                description=f"The user asked: '{user_message}'. Use your tools to get a clear, concise rate answer.",
+                description=f"{history}The user asked: '{user_message}'. Use your tools to get a clear, concise rate answer.",
                 expected_output="A helpful answer with the exchange rate.",
                 agent=agent,
             )
@@ -68,17 +77,17 @@ class RemitAgentManager:
                 role="Transaction Planner",
                 goal="Help the user prepare a remittance transaction.",
                 backstory="You find recipients and calculate transaction quotes.",
-                tools=[RemitTools.search_my_payees, RemitTools.swap_ada_to_stable],
-                llm=self.llm,
+                tools=[RemitTools.prepare_transfer, RemitTools.search_my_payees, RemitTools.swap_ada_to_stable],
+                llm=self.llm.with_call_site("transaction_plan"),
                 verbose=True,
             )
 
             task = Task(
-                description=f"""The user said: '{user_message}'.
-                1. Identify recipient (using Search My Payees tool with user_id={current_user_id}).
-                2. Identify amount of ADA to send.
-                3. Use Swap ADA to Stablecoin to get a quote.
-                4. Summarize the transaction plan clearly.""",
+                description=f"""{history}The user said: '{user_message}'.
+                1. Identify the recipient and the amount of ADA to send.
+                2. If you have both, use Prepare Transfer (with user_id={current_user_id}) to find the recipient and get the quote in one step.
+                   Otherwise use Search My Payees (with user_id={current_user_id}) or Swap ADA to Stablecoin for the part you have.
+                3. Summarize the transaction plan clearly.""",
                 expected_output="Transaction plan summary or ask for missing amount.",
                 agent=agent,
             )
@@ -93,11 +102,15 @@ class RemitAgentManager:
             process=Process.sequential,
         )
 
-        try:
-            for chunk in specialist_crew.kickoff_stream():
-                yield str(chunk)
-        except Exception as e:
-            result = specialist_crew.kickoff()
-            yield str(result)
+        reply = []
+        with span(f"crew.{intent}"), tool_run(intent):
+            try:
+                for chunk in specialist_crew.kickoff_stream():
+                    reply.append(str(chunk))
+                    yield str(chunk)
+            except Exception as e:
+                result = specialist_crew.kickoff()
+                reply = [str(result)]
+                yield str(result)
 
-        self.context_service.add_message(conversation_id, "assistant", "✅ Done.")
+        self.context_service.add_message(conversation_id, "assistant", "".join(reply) or "✅ Done.")
@@ -0,0 +1,80 @@
+"""
+Circuit Breakers
+One breaker per market-data upstream. After CIRCUIT_FAILURE_THRESHOLD
+consecutive failures a breaker opens and calls fail immediately (callers fall
+back as if the upstream had errored) instead of waiting out their timeouts.
+After CIRCUIT_RESET_SECONDS one probe call is let through (half-open): success
+closes the breaker, failure opens it again.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.core.settings import settings
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. In half-open, only one probe at a time."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            # A probe that never reported back (e.g. cancelled) stops blocking after reset_timeout
+            if self.state == HALF_OPEN and (not self._probing or time.monotonic() - self._probe_started >= self.reset_timeout):
+                self._probing, self._probe_started = True, time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed: upstream recovered")
+            self.state, self.failures, self._probing = CLOSED, 0, False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                if self.state == CLOSED:
+                    logger.warning(f"Circuit '{self.name}' opened after {self.failures} consecutive failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at)) if self.state == OPEN else 0.0
+            return {"state": self.state, "consecutive_failures": self.failures, "retry_in_s": round(retry_in, 1)}
+
+
+# Upstreams whose failures we can absorb with a fallback (prices, quotes)
+breakers: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(name, settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_SECONDS)
+    for name in ("binance", "minswap", "coingecko")
+}
+
+
+def get_breaker(upstream: str) -> Optional[CircuitBreaker]:
+    return breakers.get(upstream)
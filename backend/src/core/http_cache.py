@@ -0,0 +1,119 @@
+"""
+HTTP Response Cache
+Conditional GETs and compression for hot read endpoints. Each endpoint names
+its data version; the strong ETag is derived from it, so `If-None-Match` is
+answered with a 304 before anything is loaded or serialized. Serialized (and
+compressed) bodies are kept per ETag, so only a new version re-serializes.
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # the `compression` extra; gzip is always available
+
+COMPRESS_MIN_BYTES = 1024  # smaller bodies aren't worth compressing
+
+_COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {"gzip": lambda body: gzip.compress(body, compresslevel=6)}
+if brotli is not None:
+    _COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=5)
+_PREFERENCE = ("br", "gzip")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding the client accepts (q > 0), or None for identity."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    options = [e for e in _PREFERENCE if e in _COMPRESSORS and accepted.get(e, accepted.get("*", 0)) > 0]
+    return max(options, key=lambda e: accepted.get(e, accepted.get("*", 0)), default=None)
+
+
+def _matching_etag(if_none_match: Optional[str], candidates: List[str]) -> Optional[str]:
+    """First of `candidates` (opaque tags, unquoted) named by `If-None-Match`, using weak comparison."""
+    if not if_none_match:
+        return None
+    if if_none_match.strip() == "*":
+        return candidates[0]
+    tags = {tag.strip().removeprefix("W/").strip('"') for tag in if_none_match.split(",")}
+    return next((c for c in candidates if c in tags), None)
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._bodies: "OrderedDict[str, Dict[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _body(self, etag: str, encoding: str, build: Callable[[], Any]) -> bytes:
+        with self._lock:
+            variants = self._bodies.get(etag)
+            if variants is not None:
+                self._bodies.move_to_end(etag)
+                if encoding in variants:
+                    return variants[encoding]
+        if variants is None:
+            content = build()
+            if not isinstance(content, bytes):  # already-serialized JSON passes through
+                content = JSONResponse(jsonable_encoder(content)).body
+            variants = {"identity": content}
+        if encoding != "identity":
+            variants[encoding] = _COMPRESSORS[encoding](variants["identity"])
+        with self._lock:
+            self._bodies[etag] = variants
+            self._bodies.move_to_end(etag)
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+        return variants[encoding]
+
+    def _compressible(self, etag: str) -> bool:
+        """Whether the body for `etag` is compressed; assumed so while it isn't cached."""
+        with self._lock:
+            variants = self._bodies.get(etag)
+        return variants is None or len(variants["identity"]) >= COMPRESS_MIN_BYTES
+
+    def respond(self, request: Request, key: str, version: Any, build: Callable[[], Any], cache_control: str) -> Response:
+        """
+        JSON response for `key` at `version`. `build` returns the content (or
+        JSON bytes) and is only called when no body is cached for this version.
+        """
+        etag = hashlib.blake2b(f"{key}|{version}".encode(), digest_size=12).hexdigest()
+        headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+        # The 304 names the representation the client would get, so the
+        # compressed variant's tag is checked first.
+        candidates = [f"{etag}-{encoding}", etag] if encoding and self._compressible(etag) else [etag]
+        matched = _matching_etag(request.headers.get("if-none-match"), candidates)
+        if matched:
+            headers["ETag"] = f'"{matched}"'
+            return Response(status_code=304, headers=headers)
+
+        body = self._body(etag, "identity", build)
+        if encoding and len(body) >= COMPRESS_MIN_BYTES:
+            body = self._body(etag, encoding, build)
+            headers["ETag"] = f'"{etag}-{encoding}"'  # a distinct representation needs its own strong tag
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type="application/json", headers=headers)
+
+    def clear(self):
+        with self._lock:
+            self._bodies.clear()
+
+
+# Singleton instance
+response_cache = ResponseCache()
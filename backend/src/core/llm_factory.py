@@ -1,20 +1,56 @@
 import os
+from functools import lru_cache
 from crewai import LLM
 from src.core.settings import settings
+from src.core.llm_router import RoutingLLM
+from src.core.llm_scheduler import Priority
+from src.core.scheduled_llm import ScheduledLLM
 
 class LLMFactory:
     @staticmethod
-    def create_llm():
+    def create_llm(priority: Priority = Priority.INTERACTIVE):
+        """
+        Creates a CrewAI LLM whose calls go through the central LLM scheduler
+        with the given priority class. All of them share one backend LLM.
+        """
+        return ScheduledLLM(LLMFactory.shared_base_llm(), priority)
+
+    @staticmethod
+    @lru_cache()
+    def shared_base_llm():
+        """The process-wide backend LLM, built on first use."""
+        return LLMFactory.create_base_llm()
+
+    @staticmethod
+    def create_base_llm():
         """
         Creates a native CrewAI LLM instance.
+        If fallback providers are configured, returns a RoutingLLM over all of them.
         """
-        provider = settings.LLM_PROVIDER.lower()
-        
+        fallbacks = [p.strip() for p in settings.LLM_FALLBACK_PROVIDERS.split(",") if p.strip()]
+        if not fallbacks:
+            return LLMFactory.create_provider_llm(settings.LLM_PROVIDER)
+
+        providers = [settings.LLM_PROVIDER] + [p for p in fallbacks if p.lower() != settings.LLM_PROVIDER.lower()]
+        return RoutingLLM(
+            model="router/" + "+".join(p.lower() for p in providers),
+            backends=[LLMFactory.create_provider_llm(p) for p in providers],
+            hedge_after_seconds=settings.LLM_HEDGE_AFTER_SECONDS,
+        )
+
+    @staticmethod
+    def create_provider_llm(provider: str):
+        """
+        Creates a native CrewAI LLM instance for a single provider.
+        """
+        provider = provider.lower()
+
         if provider == "openai":
             # CrewAI/LiteLLM expects model names like 'gpt-4o'
             return LLM(
                 model=settings.OPENAI_MODEL_NAME,
                 api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
                 temperature=0
             )
             
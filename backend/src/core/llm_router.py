@@ -0,0 +1,208 @@
+"""
+Latency-aware LLM Router
+Spreads calls across several configured LLM backends, preferring the fastest healthy one.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from loguru import logger
+
+from src.core.llm_stop_words import with_stop_words
+
+# Shared pool for backend calls. Hedged requests that lose the race keep running
+# here until the provider answers; their result only feeds the latency stats.
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="llm-router")
+
+
+class BackendStats:
+    """Rolling latency and error window for one backend."""
+
+    def __init__(self, name: str, window: int = 20):
+        self.name = name
+        self._latencies = deque(maxlen=window)
+        self._errors = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.unhealthy_until = 0.0
+
+    def record(self, latency: float, ok: bool):
+        with self._lock:
+            self._errors.append(0 if ok else 1)
+            if ok:
+                self._latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._errors)
+
+    @property
+    def failed_only(self) -> bool:
+        """True when the backend has been tried but never answered successfully."""
+        with self._lock:
+            return bool(self._errors) and not self._latencies
+
+    @property
+    def avg_latency(self) -> float:
+        with self._lock:
+            if not self._latencies:
+                return 0.0
+            return sum(self._latencies) / len(self._latencies)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._errors:
+                return 0.0
+            return sum(self._errors) / len(self._errors)
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "avg_latency_s": round(self.avg_latency, 4),
+            "error_rate": round(self.error_rate, 3),
+            "samples": self.samples,
+            "healthy": self.is_healthy(time.monotonic()),
+        }
+
+
+class RoutingLLM(BaseLLM):
+    """
+    A CrewAI-compatible LLM that holds several backends and routes each call
+    to the fastest healthy one, failing over to the next on errors.
+
+    If `hedge_after_seconds` is set, a second backend is fired when the first
+    has not answered within that time and whichever answers first wins.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        backends: List[Any],
+        hedge_after_seconds: float = 0.0,
+        max_error_rate: float = 0.5,
+        min_samples: int = 3,
+        cooldown_seconds: float = 30.0,
+        **kwargs: Any,
+    ):
+        if not backends:
+            raise ValueError("RoutingLLM needs at least one backend")
+        super().__init__(model=model, **kwargs)
+        self.backends = backends
+        self.hedge_after_seconds = hedge_after_seconds
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.cooldown_seconds = cooldown_seconds
+        self._stats = [BackendStats(getattr(b, "model", f"backend-{i}")) for i, b in enumerate(backends)]
+
+    # --- Routing ---
+
+    def _ranked(self) -> List[int]:
+        """
+        Backend indexes ordered by health, then rolling latency, then error rate,
+        then config order. Backends that have only ever failed have no latency to
+        compare and go after every measured one; untried backends sort first so
+        they get sampled.
+        """
+        now = time.monotonic()
+
+        def key(i: int):
+            stats = self._stats[i]
+            return (not stats.is_healthy(now), stats.failed_only, stats.avg_latency, stats.error_rate, i)
+
+        return sorted(range(len(self.backends)), key=key)
+
+    def _timed_call(self, index: int, messages: Any, kwargs: Dict[str, Any]) -> Any:
+        stats = self._stats[index]
+        backend = with_stop_words(self.backends[index], self.stop)
+        start = time.perf_counter()
+        try:
+            result = backend.call(messages, **kwargs)
+        except Exception:
+            stats.record(time.perf_counter() - start, ok=False)
+            if stats.samples >= self.min_samples and stats.error_rate > self.max_error_rate:
+                stats.unhealthy_until = time.monotonic() + self.cooldown_seconds
+                logger.warning(f"LLM backend '{stats.name}' marked unhealthy for {self.cooldown_seconds}s")
+            raise
+        stats.record(time.perf_counter() - start, ok=True)
+        return result
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> Any:
+        kwargs = {
+            "tools": tools,
+            "callbacks": callbacks,
+            "available_functions": available_functions,
+            "from_task": from_task,
+            "from_agent": from_agent,
+        }
+        if response_model is not None:
+            kwargs["response_model"] = response_model
+
+        order = self._ranked()
+        pending: Dict[Any, int] = {}
+        last_error: Optional[Exception] = None
+        launched = 0
+
+        def launch():
+            nonlocal launched
+            index = order[launched]
+            launched += 1
+            ctx = contextvars.copy_context()
+            pending[_executor.submit(ctx.run, self._timed_call, index, messages, kwargs)] = index
+
+        launch()
+        while pending:
+            can_hedge = self.hedge_after_seconds > 0 and launched < len(order)
+            done, _ = wait(pending, timeout=self.hedge_after_seconds if can_hedge else None, return_when=FIRST_COMPLETED)
+
+            if not done:
+                logger.info(f"Hedging LLM call: '{self._stats[order[launched]].name}' after {self.hedge_after_seconds}s")
+                launch()
+                continue
+
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    logger.warning(f"LLM backend '{self._stats[index].name}' failed: {e}")
+                    last_error = e
+
+            if not pending and launched < len(order):
+                launch()
+
+        raise last_error
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-backend rolling stats, in current routing order."""
+        return [self._stats[i].snapshot() for i in self._ranked()]
+
+    # --- Capabilities are those of the primary (first configured) backend ---
+
+    def supports_function_calling(self) -> bool:
+        primary = self.backends[0]
+        return bool(getattr(primary, "supports_function_calling", lambda: False)())
+
+    def supports_stop_words(self) -> bool:
+        primary = self.backends[0]
+        return bool(getattr(primary, "supports_stop_words", lambda: False)())
+
+    def get_context_window_size(self) -> int:
+        return min(
+            getattr(b, "get_context_window_size", lambda: 8192)() for b in self.backends
+        )
@@ -0,0 +1,189 @@
+"""
+LLM Call Scheduler
+Central gate for every LLM call: priority classes, per-class concurrency limits
+and a tokens-per-minute budget, so background bursts can't starve live chats.
+LLMs are bound to it through `ScheduledLLM` (src/core/scheduled_llm.py).
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from src.core.settings import settings
+
+
+class Priority(str, Enum):
+    INTERACTIVE = "interactive"  # /api/chat turns
+    JOB = "job"                  # Masumi background jobs
+    BULK = "bulk"                # Payee tag generation, imports
+
+    @property
+    def rank(self) -> int:
+        return list(Priority).index(self)
+
+
+def estimate_tokens(payload: Any) -> int:
+    """Rough token estimate (~4 chars per token) for budgeting."""
+    if payload is None:
+        return 0
+    if isinstance(payload, str):
+        return len(payload) // 4 + 1
+    if isinstance(payload, list):
+        return sum(estimate_tokens(m.get("content") if isinstance(m, dict) else m) for m in payload)
+    return len(str(payload)) // 4 + 1
+
+
+class _ClassStats:
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.tokens = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "tokens": self.tokens,
+            "avg_queue_ms": round(self.total_wait / self.completed * 1000, 1) if self.completed else 0.0,
+            "max_queue_ms": round(self.max_wait * 1000, 1),
+        }
+
+
+class LLMScheduler:
+    """
+    Grants LLM call slots in priority order.
+
+    A waiter runs when it is the highest-priority waiter whose class still has
+    capacity, the global concurrency limit isn't reached and the rolling
+    tokens-per-minute budget allows it. Non-interactive classes may only use
+    (1 - interactive_reserve) of the token budget.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        class_limits: Optional[Dict[Priority, int]] = None,
+        tokens_per_minute: int = 0,
+        interactive_reserve: float = 0.3,
+    ):
+        self.max_concurrency = max_concurrency
+        self.class_limits = class_limits or {p: max_concurrency for p in Priority}
+        self.tokens_per_minute = tokens_per_minute
+        self.interactive_reserve = interactive_reserve
+
+        self._cond = threading.Condition()
+        self._waiters: List[tuple] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._token_log = deque()  # (timestamp, tokens)
+        self._stats = {p: _ClassStats() for p in Priority}
+
+    # --- Budget ---
+
+    def _tokens_used(self, now: float) -> int:
+        while self._token_log and now - self._token_log[0][0] >= 60:
+            self._token_log.popleft()
+        return sum(t for _, t in self._token_log)
+
+    def _budget_wait(self, priority: Priority, tokens: int, now: float) -> float:
+        """Seconds until the budget admits this call (0 = admit now)."""
+        if not self.tokens_per_minute:
+            return 0.0
+        budget = self.tokens_per_minute
+        if priority is not Priority.INTERACTIVE:
+            budget = int(budget * (1 - self.interactive_reserve))
+        used = self._tokens_used(now)
+        # A single call bigger than the budget is admitted once the window is empty.
+        if used + tokens <= budget or used == 0:
+            return 0.0
+        return max(0.05, 60 - (now - self._token_log[0][0]))
+
+    # --- Slots ---
+
+    def _next_eligible(self) -> Optional[tuple]:
+        for entry in sorted(self._waiters):
+            priority = entry[2]
+            if self._stats[priority].in_flight < self.class_limits.get(priority, self.max_concurrency):
+                return entry
+        return None
+
+    @contextmanager
+    def slot(self, priority: Priority = Priority.INTERACTIVE, tokens: int = 0):
+        """Blocks until a call slot is granted, then holds it for the `with` body."""
+        priority = Priority(priority)
+        stats = self._stats[priority]
+        entry = (priority.rank, next(self._seq), priority)
+        enqueued = time.monotonic()
+
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            stats.queued += 1
+            while True:
+                now = time.monotonic()
+                wait_for = None
+                if self._in_flight < self.max_concurrency and self._next_eligible() == entry:
+                    wait_for = self._budget_wait(priority, tokens, now)
+                    if wait_for == 0:
+                        break
+                self._cond.wait(timeout=wait_for)
+
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            stats.queued -= 1
+            stats.in_flight += 1
+            self._in_flight += 1
+            if tokens:
+                self._token_log.append((now, tokens))
+
+        waited = time.monotonic() - enqueued
+        if waited > 1.0:
+            logger.info(f"LLM call ({priority.value}) queued for {waited:.2f}s")
+
+        try:
+            yield
+        finally:
+            with self._cond:
+                stats.in_flight -= 1
+                stats.completed += 1
+                stats.tokens += tokens
+                stats.total_wait += waited
+                stats.max_wait = max(stats.max_wait, waited)
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def record_tokens(self, tokens: int):
+        """Adds tokens spent beyond the up-front estimate (e.g. the completion)."""
+        if tokens <= 0:
+            return
+        with self._cond:
+            self._token_log.append((time.monotonic(), tokens))
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "in_flight": self._in_flight,
+                "tokens_last_minute": self._tokens_used(time.monotonic()),
+                "classes": {p.value: s.snapshot() for p, s in self._stats.items()},
+            }
+
+
+# Singleton instance shared by every ScheduledLLM
+llm_scheduler = LLMScheduler(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    class_limits={
+        Priority.INTERACTIVE: settings.LLM_INTERACTIVE_CONCURRENCY,
+        Priority.JOB: settings.LLM_JOB_CONCURRENCY,
+        Priority.BULK: settings.LLM_BULK_CONCURRENCY,
+    },
+    tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+)
@@ -0,0 +1,17 @@
+"""
+LLM Stop Words
+CrewAI sets stop words on the LLM it was handed, which for us is a wrapper.
+The LLMs behind it are shared by concurrent crews, so each call gets its own
+copy carrying the stop words instead of the shared instance being changed.
+"""
+import copy
+from typing import Any, List, Optional
+
+
+def with_stop_words(llm: Any, stop: Optional[List[str]]) -> Any:
+    """`llm` itself if it already uses `stop`, else a shallow per-call copy that does."""
+    if not stop or list(getattr(llm, "stop", None) or []) == list(stop):
+        return llm
+    clone = copy.copy(llm)  # shares the provider client
+    clone.stop = list(stop)
+    return clone
@@ -0,0 +1,231 @@
+"""
+Metrics Registry
+Minimal in-process Prometheus metrics (counters, gauges, histograms) rendered
+in the text exposition format by the /metrics endpoint.
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.core.circuit_breaker import CircuitOpenError, get_breaker
+from src.core.tracing import span
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels: str):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def set_function(self, function: Callable[[], float]):
+        """Computes the (unlabelled) value at scrape time."""
+        self._function = function
+
+    def _samples(self) -> List[str]:
+        if self._function is not None:
+            return [f"{self.name} {_format_value(self._function())}"]
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(self._sums[key])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+registry = Registry()
+
+# --- HTTP ---
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "remit_http_request_duration_seconds", "Latency of HTTP requests by route", ("method", "route", "status")
+))
+
+# --- Upstreams (binance, minswap, coingecko, masumi) ---
+UPSTREAM_REQUEST_DURATION = registry.register(Histogram(
+    "remit_upstream_request_duration_seconds", "Latency of upstream API calls", ("upstream", "operation")
+))
+UPSTREAM_ERRORS = registry.register(Counter(
+    "remit_upstream_errors_total", "Failed upstream API calls", ("upstream", "operation", "reason")
+))
+
+# --- LLM ---
+LLM_CALLS = registry.register(Counter(
+    "remit_llm_calls_total", "LLM calls by call site", ("call_site", "outcome")
+))
+LLM_CALL_DURATION = registry.register(Histogram(
+    "remit_llm_call_duration_seconds", "LLM call latency by call site", ("call_site",)
+))
+LLM_TOKENS = registry.register(Counter(
+    "remit_llm_tokens_total", "Estimated LLM tokens by call site", ("call_site", "type")
+))
+
+# --- Jobs & runtime ---
+JOB_QUEUE_DEPTH = registry.register(Gauge(
+    "remit_job_queue_depth", "Masumi jobs currently processing"
+))
+EVENT_LOOP_LAG = registry.register(Histogram(
+    "remit_event_loop_lag_seconds", "Delay of scheduled event-loop wakeups",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+))
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str):
+    """
+    Times an upstream call; exceptions are counted as errors and re-raised.
+    Upstreams with a circuit breaker fail fast (CircuitOpenError) while it is
+    open; timeouts, connection errors, 5xx and 429 count against it.
+    """
+    breaker = get_breaker(upstream)
+    if breaker is not None and not breaker.allow():
+        UPSTREAM_ERRORS.inc(upstream=upstream, operation=operation, reason="circuit_open")
+        raise CircuitOpenError(f"{upstream} circuit is open")
+
+    start = time.perf_counter()
+    try:
+        with span(f"{upstream}.{operation}"):
+            yield
+    except Exception as e:
+        status = getattr(getattr(e, "response", None), "status_code", None)
+        UPSTREAM_ERRORS.inc(upstream=upstream, operation=operation, reason=f"http_{status}" if status else type(e).__name__)
+        if breaker is not None:
+            # A 4xx (other than 429) means the upstream is up and rejected this request
+            if status is not None and 400 <= status < 500 and status != 429:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        raise
+    else:
+        if breaker is not None:
+            breaker.record_success()
+    finally:
+        UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - start, upstream=upstream, operation=operation)
+
+
+def record_upstream_error(upstream: str, operation: str, reason: str):
+    """For failures that don't raise, e.g. a non-200 status."""
+    UPSTREAM_ERRORS.inc(upstream=upstream, operation=operation, reason=reason)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """Runs forever, measuring how late the loop wakes up from a sleep."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
@@ -0,0 +1,27 @@
+"""
+Cursor Pagination
+Opaque cursors for listing endpoints: the sort key of the last item returned,
+base64url-encoded so clients treat it as a token rather than building one.
+"""
+import base64
+import json
+from typing import Any, Dict
+
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 100
+
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Raises ValueError for anything `encode_cursor` didn't produce."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
@@ -0,0 +1,63 @@
+"""
+On-demand Sampling Profiler
+Admins can profile a single request by sending `X-Profile: 1` together with
+`X-Admin-Key`. The response body is replaced by the collapsed stacks
+(flamegraph.pl / speedscope compatible) sampled while the request ran.
+"""
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+from fastapi import Request
+
+from src.core.settings import settings
+
+
+def is_profile_request(request: Request) -> bool:
+    if request.headers.get("x-profile") != "1" or not settings.ADMIN_KEY:
+        return False
+    return secrets.compare_digest(request.headers.get("x-admin-key", ""), settings.ADMIN_KEY)
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread (the event loop by default) every `interval`
+    seconds. Anything else running on that thread meanwhile is sampled too.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.001):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+            time.sleep(self.interval)
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        """One `frame;frame;frame count` line per distinct stack, hottest first."""
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common()) + "\n"
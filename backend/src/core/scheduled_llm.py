@@ -0,0 +1,83 @@
+"""
+Scheduled LLM
+CrewAI LLM wrapper that sends every call through the central LLM scheduler.
+"""
+import time
+from typing import Any, Dict, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+
+from src.core.llm_scheduler import LLMScheduler, Priority, estimate_tokens, llm_scheduler
+from src.core.llm_stop_words import with_stop_words
+from src.core.metrics import LLM_CALLS, LLM_CALL_DURATION, LLM_TOKENS
+
+
+class ScheduledLLM(BaseLLM):
+    """Wraps an LLM so every call goes through the scheduler with a fixed priority."""
+
+    def __init__(
+        self,
+        inner: Any,
+        priority: Priority = Priority.INTERACTIVE,
+        scheduler: Optional[LLMScheduler] = None,
+        call_site: Optional[str] = None,
+    ):
+        super().__init__(model=inner.model, temperature=getattr(inner, "temperature", None))
+        self.inner = inner
+        self.priority = Priority(priority)
+        self.scheduler = scheduler
+        self.call_site = call_site or self.priority.value
+
+    def with_call_site(self, call_site: str) -> "ScheduledLLM":
+        """Same backend and priority, labelled with another call site in /metrics."""
+        return ScheduledLLM(self.inner, self.priority, self.scheduler, call_site)
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> Any:
+        scheduler = self.scheduler or llm_scheduler
+        kwargs = {
+            "tools": tools,
+            "callbacks": callbacks,
+            "available_functions": available_functions,
+            "from_task": from_task,
+            "from_agent": from_agent,
+        }
+        if response_model is not None:
+            kwargs["response_model"] = response_model
+
+        inner = with_stop_words(self.inner, self.stop)
+        call_site = self.call_site
+        prompt_tokens = estimate_tokens(messages)
+        with scheduler.slot(self.priority, tokens=prompt_tokens):
+            start = time.perf_counter()
+            try:
+                result = inner.call(messages, **kwargs)
+            except Exception:
+                LLM_CALLS.inc(call_site=call_site, outcome="error")
+                raise
+            finally:
+                LLM_CALL_DURATION.observe(time.perf_counter() - start, call_site=call_site)
+
+        completion_tokens = estimate_tokens(result)
+        scheduler.record_tokens(completion_tokens)
+        LLM_CALLS.inc(call_site=call_site, outcome="ok")
+        LLM_TOKENS.inc(prompt_tokens, call_site=call_site, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, call_site=call_site, type="completion")
+        return result
+
+    def supports_function_calling(self) -> bool:
+        return bool(getattr(self.inner, "supports_function_calling", lambda: False)())
+
+    def supports_stop_words(self) -> bool:
+        return bool(getattr(self.inner, "supports_stop_words", lambda: False)())
+
+    def get_context_window_size(self) -> int:
+        return getattr(self.inner, "get_context_window_size", lambda: 8192)()
@@ -0,0 +1,79 @@
+"""
+Fast JSON Serialization
+Large list responses skip pydantic: stored records are projected onto the
+response model's fields (defaults filled in, unknown keys dropped) and encoded
+straight to bytes. Values are trusted as stored; set
+VALIDATE_FAST_RESPONSES=true to run them through the model instead when
+debugging.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Tuple, Type, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.core.settings import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # falls back to the stdlib encoder
+
+_REQUIRED = object()
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes, same output as FastAPI's JSONResponse for plain data."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """(model, is_list) if a field holds a model or a list of models."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    if get_origin(annotation) in (list, List):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0], True
+    return None, False
+
+
+@lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> tuple:
+    plan = []
+    for name, field in model.model_fields.items():
+        default = _REQUIRED if field.is_required() else field.get_default(call_default_factory=True)
+        nested, is_list = _nested_model(field.annotation)
+        plan.append((field.alias or name, default, nested, is_list))
+    return tuple(plan)
+
+
+def project(record: dict, model: Type[BaseModel]) -> dict:
+    """`record` shaped like `model.model_dump()` would be, without building the model."""
+    out = {}
+    for key, default, nested, is_list in _plan(model):
+        if key in record:
+            value = record[key]
+        elif default is _REQUIRED:
+            raise ValueError(f"{model.__name__} record is missing '{key}'")
+        else:
+            value = default
+        if nested is not None and value is not None:
+            value = [project(v, nested) for v in value] if is_list else project(value, nested)
+        out[key] = value
+    return out
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def serialize_records(records: Iterable[dict], model: Type[BaseModel]) -> bytes:
+    """JSON array of `records` as a List[model] response body."""
+    if settings.VALIDATE_FAST_RESPONSES:
+        adapter = _list_adapter(model)
+        return adapter.dump_json(adapter.validate_python(list(records)))
+    return dumps([project(r, model) for r in records])
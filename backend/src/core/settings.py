@@ -54,6 +54,17 @@ class Settings(BaseSettings):
     # --- AI Provider Configuration ---
     # Options: "ollama", "openai", "openrouter", "gemini"
     LLM_PROVIDER: str = "ollama" 
+    # Comma-separated extra providers for latency-aware failover, e.g. "gemini,openai"
+    LLM_FALLBACK_PROVIDERS: str = ""
+    # Fire a second (hedged) request if the first backend hasn't answered in N seconds. 0 = off
+    LLM_HEDGE_AFTER_SECONDS: float = 0.0
+
+    # --- LLM Scheduler ---
+    LLM_MAX_CONCURRENCY: int = 8
+    LLM_INTERACTIVE_CONCURRENCY: int = 6
+    LLM_JOB_CONCURRENCY: int = 3
+    LLM_BULK_CONCURRENCY: int = 1
+    LLM_TOKENS_PER_MINUTE: int = 0 # 0 = no budget
 
     # --- API Keys for AI Providers ---
     OPENAI_API_KEY: str = ""
@@ -64,6 +75,79 @@ class Settings(BaseSettings):
     OPENAI_MODEL_NAME: str = "gpt-4o" # Model to use if LLM_PROVIDER is 'openai'
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_MODEL: str = "llama3" # Default model if LLM_PROVIDER is 'ollama'
+    OPENAI_BASE_URL: str = "" # Optional OpenAI-compatible endpoint (e.g. the benchmark fake LLM)
+
+    # --- Upstream Market Data APIs ---
+    MINSWAP_AGGREGATOR_URL: str = "https://agg-api.minswap.org/aggregator"
+    BINANCE_API_URL: str = "https://api.binance.com/api/v3/ticker/price"
+    COINGECKO_API_URL: str = "https://api.coingecko.com/api/v3"
+
+    # --- Circuit Breakers (Binance, Minswap, CoinGecko) ---
+    CIRCUIT_FAILURE_THRESHOLD: int = 3 # Consecutive failures before failing fast
+    CIRCUIT_RESET_SECONDS: float = 30.0 # Time open before a probe call is let through
+
+    # --- Shared Market Snapshot (one upstream poller per host) ---
+    MARKET_SNAPSHOT_FILE: str = "/tmp/remit-market.snapshot" # "" = disabled, every worker polls
+    # "auto": the first worker to take the lock refreshes; "reader": never refresh (use with a sidecar)
+    MARKET_SNAPSHOT_ROLE: str = "auto"
+    MARKET_SNAPSHOT_REFRESH_SECONDS: float = 15.0
+    MARKET_SNAPSHOT_MAX_AGE_SECONDS: float = 60.0
+
+    # --- Last-Known-Good Market Data (warm restarts, degraded mode) ---
+    MARKET_LKG_FILE: str = "src/data/market_last_good.json" # "" = disabled
+    MARKET_LKG_WRITE_SECONDS: float = 10.0
+    # After a restart, data up to this old is served first while live data warms up
+    MARKET_LKG_SERVE_MAX_AGE_SECONDS: float = 900.0
+
+    # --- Minswap Quoting ---
+    MINSWAP_MAX_CONCURRENCY: int = 4 # Parallel estimate calls when quoting a ladder
+    PRICE_CURVE_TTL_SECONDS: float = 60.0
+    ROUTE_TABLE_REFRESH_SECONDS: float = 30.0
+    RATE_BATCH_MAX_REQUESTS: int = 200
+
+    # --- Conversation History (chat prompts) ---
+    HISTORY_TOKEN_BUDGET: int = 1200 # Max history tokens injected into a prompt
+    HISTORY_MESSAGE_MAX_TOKENS: int = 300 # Longer messages are cut when rendered
+    HISTORY_SUMMARY_MAX_TOKENS: int = 250 # Size of the rolling summary of older turns
+    HISTORY_KEEP_RECENT_MESSAGES: int = 2 # Never folded into the summary
+    CHAT_MESSAGE_MAX_TOKENS: int = 1000 # The current message, as placed in the prompt
+
+    # --- Agent Tools ---
+    # Market-quote tool results are reused across crew runs for this long (identical
+    # calls within one run are always deduplicated). 0 = per-run only
+    AGENT_TOOL_CACHE_TTL_SECONDS: float = 10.0
+    # "compact" (only what the agent needs) or "verbose" (full payee JSON, long sentences)
+    AGENT_TOOL_OUTPUT: str = "compact"
+    AGENT_TOOL_TOP_K: int = 3 # Payee matches returned to the agent
+
+    # --- Wallet Balances (Minswap /wallet) ---
+    WALLET_BALANCE_TTL_SECONDS: float = 20.0 # 0 = no caching
+    WALLET_MAX_CONCURRENCY: int = 8 # Parallel /wallet calls (also the connection pool size)
+    WALLET_TIMEOUT_SECONDS: float = 5.0
+    WALLET_BATCH_MAX: int = 100
+
+    # --- Split-Order Planning ---
+    MINSWAP_ORDER_FEE_ADA: float = 2.0 # Batcher + network fee paid per DEX order (each slice)
+    SPLIT_SLICE_INTERVAL_MINUTES: float = 10.0 # Gap between time-sliced DEX orders
+
+    # --- Price History (written by the market snapshot refresher) ---
+    PRICE_HISTORY_DIR: str = "src/data/price_history" # "" = disabled
+    PRICE_HISTORY_RETENTION_DAYS: float = 30.0 # Raw samples older than this are dropped as files fill; 0 = keep all
+
+    # --- Observability ---
+    TRACING_ENABLED: bool = True
+    TRACE_EXPORT_FILE: str = "" # Append every request trace as JSONL here, e.g. "traces.jsonl"
+
+    # --- Startup ---
+    # Build the agent/LLM singletons in the background right after startup,
+    # instead of on the first chat request
+    WARMUP_ON_STARTUP: bool = True
+
+    # --- Storage ---
+    USERS_DATA_FILE: str = "src/data/users.json"
+    # Validate stored records through their pydantic models on the fast list
+    # endpoints (/api/users, payees); off by default, for debugging bad data
+    VALIDATE_FAST_RESPONSES: bool = False
 
 
 # Create a single instance of the settings to be imported by other parts of the app
@@ -0,0 +1,161 @@
+"""
+Request Tracing
+Lightweight in-process spans, collected per request and reported in the
+Server-Timing header (and optionally appended to a local JSONL file).
+"""
+import asyncio
+import functools
+import json
+import re
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+
+_TOKEN_UNSAFE = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+
+class Trace:
+    """All spans recorded while handling one request."""
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans: List[Tuple[str, float, float]] = []  # (name, offset_s, duration_s)
+
+    def add(self, name: str, start: float, duration: float):
+        with self._lock:
+            self.spans.append((name, start - self._start, duration))
+
+    def duration_of(self, name: str) -> float:
+        with self._lock:
+            return sum(d for n, _, d in self.spans if n == name)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def server_timing(self) -> str:
+        """Spans aggregated by name, e.g. `minswap.estimate;dur=84.2;desc="x2"`."""
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for name, _, duration in self.spans:
+                entry = totals.setdefault(name, [0.0, 0])
+                entry[0] += duration
+                entry[1] += 1
+        parts = []
+        for name, (duration, count) in totals.items():
+            part = f"{_TOKEN_UNSAFE.sub('_', name)};dur={duration * 1000:.1f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = [
+                {"name": n, "offset_ms": round(o * 1000, 3), "duration_ms": round(d * 1000, 3)}
+                for n, o, d in self.spans
+            ]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration_ms": round(self.elapsed * 1000, 3),
+            "spans": spans,
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def start_trace(name: str) -> Tuple[Trace, Any]:
+    trace = Trace(name)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token: Any):
+    _current_trace.reset(token)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str):
+    """Records a span on the current request's trace (no-op outside a request)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start)
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of `span` for sync and async functions."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+_export_lock = threading.Lock()
+
+
+def export_trace(trace: Trace, path: str):
+    """Appends one trace as a JSON line. Blocking; call it off the event loop."""
+    line = json.dumps(trace.to_dict())
+    with _export_lock:
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute that records a `handler` span around the endpoint function and a
+    `framework` span for the rest of the route (validation + serialization).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, traced("handler")(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            trace = _current_trace.get()
+            start = time.perf_counter()
+            response = await handler(request)
+            if trace is not None:
+                total = time.perf_counter() - start
+                trace.add("framework", start, max(0.0, total - trace.duration_of("handler")))
+            return response
+
+        return traced_handler
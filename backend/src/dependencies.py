@@ -1,7 +1,16 @@
+"""
+Shared, lazily-built service singletons.
+Nothing heavy is created (or imported) until first use, so importing the app
+stays cheap. crewai and the masumi SDK load only when a getter needs them.
+"""
 from functools import lru_cache
+from src.core.llm_scheduler import Priority
 from src.services.dex_service import DexService
 from src.services.user_service import UserService
 from src.services.rater_service import RaterService
+from src.services.context_service import ContextService
+from src.services.cross_rate_service import CrossRateService
+from src.services.wallet_service import WalletService
 
 
 @lru_cache()
@@ -14,6 +23,44 @@ def get_dex_service() -> DexService:
    return DexService()
 
 
+@lru_cache()
+def get_cross_rate_service() -> CrossRateService:
+    return CrossRateService()
+
+
 @lru_cache()
 def get_rater_service() -> RaterService:
-    return RaterService()
+    return RaterService(get_cross_rate_service())
+
+
+@lru_cache()
+def get_wallet_service() -> WalletService:
+    return WalletService()
+
+
+@lru_cache()
+def get_context_service() -> ContextService:
+    return ContextService()
+
+
+@lru_cache()
+def get_masumi_service():
+    from src.services.masumi_service import MasumiService  # imports the masumi SDK
+    return MasumiService()
+
+
+@lru_cache()
+def get_agent_manager(priority: Priority = Priority.INTERACTIVE):
+    from src.agents.remit_agent import RemitAgentManager  # imports crewai
+    return RemitAgentManager(priority)
+
+
+def get_chat_agent_manager():
+    return get_agent_manager(Priority.INTERACTIVE)
+
+
+def warm_up():
+    """Builds the heavy singletons ahead of the first request (blocking)."""
+    get_agent_manager(Priority.INTERACTIVE)
+    get_agent_manager(Priority.JOB)
+    get_masumi_service()
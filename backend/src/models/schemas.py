@@ -34,6 +34,14 @@ class UserSearchResponse(BaseModel):
     users: List[User]
     query: str
 
+class UserPage(BaseModel):
+    items: List[User]  # ordered by id
+    next_cursor: Optional[str] = None  # None on the last page
+
+class PayeePage(BaseModel):
+    items: List[Payee]  # ordered by creation time
+    next_cursor: Optional[str] = None  # None on the last page
+
 # --- AI Tagging Schemas ---
 class TagRequest(BaseModel):
     description: str
@@ -116,11 +124,89 @@ class RateRequest(BaseModel):
     amount: float
     from_country: Optional[str] = None
     to_country: Optional[str] = None
-    preferred_speed: Optional[str] = "normal"
+    preferred_speed: Optional[str] = "normal"  # "fast", "normal" or "cheap"
+    # Optional per-metric weight overrides, e.g. {"cost": 0.7, "speed": 0.1, "reliability": 0.2}
+    scoring_weights: Optional[Dict[str, float]] = None
     
 class RateResponse(BaseModel):
-    route_rating: RouteRating
+    route_rating: Optional[RouteRating] = None  # None if the corridor has no rating (yet)
     recommended_providers: List[ProviderRating]
     alternative_routes: List[RouteRating] = []
     best_transaction: TransactionRating
-    timestamp: datetime
\ No newline at end of file
+    timestamp: datetime
+
+class RateBatchRequest(BaseModel):
+    requests: List[RateRequest]
+
+class RateBatchItem(BaseModel):
+    index: int  # position in RateBatchRequest.requests
+    result: Optional[RateResponse] = None
+    error: Optional[str] = None
+
+class RateBatchResponse(BaseModel):
+    results: List[RateBatchItem]  # in request order
+    distinct_amounts: int  # Minswap quotes fetched for the whole batch
+
+class PriceImpactPoint(BaseModel):
+    amount_ada: float
+    amount_out: float
+    effective_rate: float
+    price_impact_percent: float
+    interpolated: bool  # between two quoted ladder amounts
+    extrapolated: bool = False  # outside the quoted range; priced at the nearest end point
+
+class PriceImpactCurveResponse(BaseModel):
+    pair: str
+    source: str  # "live" (just quoted) or "cache" (interpolated from a fitted curve)
+    fitted_at: datetime
+    min_amount_ada: float
+    max_amount_ada: float
+    points: List[PriceImpactPoint]
+
+class SplitOrderLeg(BaseModel):
+    provider: str
+    amount_ada: float
+    slices: int = 1  # DEX swaps can be split into equal orders executed one after another
+    expected_output_usd: float
+    effective_rate: float
+    estimated_time_hours: float
+
+class SplitOrderPlan(BaseModel):
+    amount_ada: float
+    expected_output_usd: float
+    legs: List[SplitOrderLeg]
+    best_single_provider: str
+    best_single_output_usd: float
+    savings_usd: float
+    compute_ms: float
+
+class PricePoint(BaseModel):
+    timestamp: datetime
+    value: float
+
+class PriceCandle(BaseModel):
+    timestamp: datetime  # bucket start
+    open: float
+    high: float
+    low: float
+    close: float
+    samples: int
+
+class PriceHistoryResponse(BaseModel):
+    series: str
+    interval: str  # "raw", "1m" or "1h"
+    points: List[PricePoint] = []  # interval == "raw"
+    candles: List[PriceCandle] = []  # downsampled intervals
+    volatility: Optional[float] = None  # std-dev of log returns between samples in the range
+
+class WalletBalancesRequest(BaseModel):
+    wallets: List[str]
+    amount_in_decimal: bool = True
+
+class WalletBalanceItem(BaseModel):
+    wallet: str
+    balance: Optional[Dict[str, Any]] = None  # Minswap /wallet response
+    error: Optional[str] = None
+
+class WalletBalancesResponse(BaseModel):
+    results: List[WalletBalanceItem]  # in request order
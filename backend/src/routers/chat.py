@@ -1,13 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from src.models.schemas import ChatRequest
-from src.agents.remit_agent import RemitAgentManager
+from src.dependencies import get_chat_agent_manager
+from src.core.tracing import TracedRoute
 
-router = APIRouter(tags=["AI Chat"])
-agent_manager = RemitAgentManager()
+router = APIRouter(tags=["AI Chat"], route_class=TracedRoute)
 
 @router.post("/api/chat")
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, agent_manager = Depends(get_chat_agent_manager)):
     async def event_stream():
         async for chunk in agent_manager.chat(request.message, request.context):
             yield f"data: {chunk}\n\n"
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.core.metrics import registry
+
+router = APIRouter(tags=["Observability"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus scrape endpoint (text exposition format).
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,25 +1,40 @@
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from src.models.schemas import (
     RateRequest,
     RateResponse,
+    RateBatchRequest,
+    RateBatchResponse,
     ProviderRating,
     RouteRating,
-    TransactionRating
+    TransactionRating,
+    PriceImpactCurveResponse,
+    SplitOrderPlan,
+    PriceHistoryResponse
 )
 from src.services.rater_service import RaterService
 from src.dependencies import get_rater_service
 from src.core.constant import current_support_for_ada_conversation
+from src.core.settings import settings
+from src.core.http_cache import response_cache
+from src.core.tracing import TracedRoute
 
-router = APIRouter(prefix="/api/rater", tags=["Rater"])
+router = APIRouter(prefix="/api/rater", tags=["Rater"], route_class=TracedRoute)
+
+CURRENCIES_VERSION = ",".join(current_support_for_ada_conversation)
 
 @router.get("/currencies")
-async def get_supported_currencies():
+async def get_supported_currencies(request: Request):
     """
     Get list of supported currencies for remittance.
     """
-    return {"currencies": current_support_for_ada_conversation}
+    return response_cache.respond(
+        request, "currencies", CURRENCIES_VERSION,
+        lambda: {"currencies": current_support_for_ada_conversation},
+        cache_control="public, max-age=86400",
+    )
 
 @router.post("/rate", response_model=RateResponse)
 async def get_comprehensive_rate(
@@ -38,14 +53,49 @@ async def get_comprehensive_rate(
             detail=f"Rating engine error: {str(e)}"
         )
 
+@router.post("/rate/batch", response_model=RateBatchResponse)
+async def get_batch_rates(
+    batch: RateBatchRequest,
+    stream: bool = Query(False, description="Stream results as NDJSON, in completion order"),
+    rater_service: RaterService = Depends(get_rater_service)
+):
+    """
+    Rate many (amount, from, to) combinations at once. Upstream prices and
+    quotes are fetched once per distinct amount and shared by the whole batch.
+    """
+    if not batch.requests:
+        raise HTTPException(status_code=400, detail="At least one request is required")
+    if len(batch.requests) > settings.RATE_BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.RATE_BATCH_MAX_REQUESTS} requests per batch")
+
+    if stream:
+        async def ndjson():
+            async for item in rater_service.rate_batch_stream(batch.requests):
+                yield item.model_dump_json() + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = await rater_service.rate_batch(batch.requests)
+    return RateBatchResponse(results=results, distinct_amounts=len({r.amount for r in batch.requests}))
+
 @router.get("/providers", response_model=List[ProviderRating])
 async def get_all_providers(
+    request: Request,
+    preferred_speed: str = "normal",
+    limit: Optional[int] = Query(None, ge=1),
     rater_service: RaterService = Depends(get_rater_service)
 ):
     """
-    Get ratings for all tracked providers (Real + Baseline).
+    Get ratings for all tracked providers (Real + Baseline), as of the last
+    background refresh. Cached until the provider metrics change.
     """
-    return await rater_service.get_all_providers()
+    if not rater_service.reference_version:
+        await rater_service.refresh_route_table()  # first request before the background build
+    return response_cache.respond(
+        request, f"providers|{preferred_speed}|{limit}", rater_service.reference_version,
+        lambda: rater_service.reference_providers(preferred_speed, limit),
+        cache_control=f"public, max-age={rater_service.reference_max_age()}",
+    )
 
 @router.get("/providers/{provider_name}", response_model=ProviderRating)
 async def get_provider_rating(
@@ -68,9 +118,70 @@ async def get_route_rating(
     to_country: str = "India",
     rater_service: RaterService = Depends(get_rater_service)
 ):
-    return await rater_service.rate_route(
-        from_currency, to_currency, from_country, to_country
-    )
+    try:
+        route = await rater_service.rate_route(from_currency, to_currency, from_country, to_country)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    if route is None:
+        raise HTTPException(status_code=404, detail="Route not supported")
+    return route
+
+@router.get("/curve", response_model=PriceImpactCurveResponse)
+async def get_price_impact_curve(
+    amounts: Optional[List[float]] = Query(None, description="ADA amounts, e.g. ?amounts=100&amounts=10000"),
+    rater_service: RaterService = Depends(get_rater_service)
+):
+    """
+    How much each amount would receive (and lose to price impact) when swapping ADA to iUSD.
+    """
+    if amounts and len(amounts) > 50:
+        raise HTTPException(status_code=400, detail="At most 50 amounts per request")
+    if amounts and any(a <= 0 for a in amounts):
+        raise HTTPException(status_code=400, detail="Amounts must be positive")
+    try:
+        return await rater_service.get_price_impact_curve(amounts)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+@router.get("/split", response_model=SplitOrderPlan)
+async def plan_split_order(
+    amount: float = Query(..., gt=0, description="Total ADA to send"),
+    max_slices: int = Query(8, ge=1, le=32, description="Max sequential DEX orders"),
+    rater_service: RaterService = Depends(get_rater_service)
+):
+    """
+    Split a large remittance across providers and time-sliced DEX swaps to maximize what arrives.
+    """
+    try:
+        return await rater_service.plan_split_order(amount, max_slices)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+@router.get("/history")
+async def list_price_history(rater_service: RaterService = Depends(get_rater_service)):
+    """
+    Names of the recorded price and quote series.
+    """
+    return {"series": rater_service.history.series()}
+
+@router.get("/history/{series}", response_model=PriceHistoryResponse)
+async def get_price_history(
+    series: str,
+    interval: str = Query("raw", description="raw, 1m or 1h (OHLC candles)"),
+    start: Optional[float] = Query(None, description="Unix timestamp (inclusive)"),
+    end: Optional[float] = Query(None, description="Unix timestamp (exclusive)"),
+    rater_service: RaterService = Depends(get_rater_service)
+):
+    """
+    Historical ADA prices and Minswap quotes, e.g. /history/ada_usd?interval=1m.
+    """
+    try:
+        history = await rater_service.get_price_history(series, interval, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if history is None:
+        raise HTTPException(status_code=404, detail="Series not found")
+    return history
 
 @router.post("/transaction", response_model=TransactionRating)
 async def rate_transaction(
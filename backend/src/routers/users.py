@@ -1,14 +1,72 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from typing import List
-from src.models.schemas import User, UserSearchResponse, Payee, PayeeCreate, TagRequest, TagResponse
+from fastapi import APIRouter, Depends, HTTPException, Body, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional, Union
+from src.models.schemas import (
+    User, UserSearchResponse, UserPage, Payee, PayeePage, PayeeCreate, TagRequest, TagResponse,
+    WalletBalancesRequest, WalletBalancesResponse,
+)
 from src.services.user_service import UserService
-from src.dependencies import get_user_service
+from src.services.wallet_service import WalletService
+from src.dependencies import get_user_service, get_wallet_service
+from src.core.settings import settings
+from src.core.tracing import TracedRoute
+from src.core.http_cache import response_cache
+from src.core.serialization import dumps, project, serialize_records
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor
 
-router = APIRouter(prefix="/api/users", tags=["Users"])
+# users.json can change at any time, so clients revalidate (cheap: 304) on every read
+USERS_CACHE_CONTROL = "private, no-cache"
 
-@router.get("", response_model=List[User])
-async def get_all_users(service: UserService = Depends(get_user_service)):
-    return service.get_all()
+router = APIRouter(prefix="/api/users", tags=["Users"], route_class=TracedRoute)
+
+def _ndjson(records, model) -> StreamingResponse:
+    # A sync generator: Starlette reads it in a worker thread, record by record
+    lines = (dumps(project(r, model)) + b"\n" for r in records)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+def _page(items, model, has_more: bool, cursor_of) -> bytes:
+    next_cursor = encode_cursor(cursor_of(items[-1])) if has_more and items else None
+    return dumps({"items": [project(i, model) for i in items], "next_cursor": next_cursor})
+
+def _cursor(cursor: Optional[str], **fields: type):
+    """The cursor's sort key as a tuple, in `fields` order; 400 if missing or mistyped."""
+    if cursor is None:
+        return None
+    try:
+        position = decode_cursor(cursor)
+        after = tuple(position[f] for f in fields)
+    except (ValueError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not all(type(v) is t for v, t in zip(after, fields.values())):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return after
+
+@router.get("", response_model=Union[List[User], UserPage])
+async def get_all_users(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns {items, next_cursor}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    format: Optional[Literal["json", "ndjson"]] = Query(None, description="'ndjson' streams one user per line"),
+    service: UserService = Depends(get_user_service)
+):
+    """
+    All users as one array; with `limit`/`cursor`, pages ordered by id.
+    """
+    if format == "ndjson":
+        return _ndjson(service.iter_records(), User)
+    if limit is None and cursor is None:
+        return response_cache.respond(
+            request, "users", service.data_version(),
+            lambda: serialize_records(service.get_all_records(), User), USERS_CACHE_CONTROL,
+        )
+    after = _cursor(cursor, id=int)
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    def build():
+        users, has_more = service.page_users(after[0] if after else None, limit)
+        return _page(users, User, has_more, lambda u: {"id": u["id"]})
+
+    return response_cache.respond(request, f"users|{cursor}|{limit}", service.data_version(), build, USERS_CACHE_CONTROL)
 
 @router.get("/{user_id}", response_model=User)
 async def get_user(user_id: int, service: UserService = Depends(get_user_service)):
@@ -51,17 +109,67 @@ async def search_payees(
     """
     return service.search_payees(user_id, q)
 
-@router.get("/{user_id}/payees", response_model=List[Payee])
+@router.get("/{user_id}/payees", response_model=Union[List[Payee], PayeePage])
 async def get_payees(
+    request: Request,
     user_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns {items, next_cursor}"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    format: Optional[Literal["json", "ndjson"]] = Query(None, description="'ndjson' streams one payee per line"),
     service: UserService = Depends(get_user_service)
 ):
     """
-    Get all payees for a user.
+    Get all payees for a user; with `limit`/`cursor`, pages ordered by creation time.
     """
-    return service.get_payees(user_id)
+    if format == "ndjson":
+        return _ndjson(service.get_payee_records(user_id), Payee)
+    if limit is None and cursor is None:
+        return response_cache.respond(
+            request, f"payees|{user_id}", service.data_version(),
+            lambda: serialize_records(service.get_payee_records(user_id), Payee), USERS_CACHE_CONTROL,
+        )
+    after = _cursor(cursor, created_at=str, id=str)
+    limit = limit or DEFAULT_PAGE_SIZE
+
+    def build():
+        payees, has_more = service.page_payees(user_id, after, limit)
+        return _page(payees, Payee, has_more, lambda p: {"created_at": p.get("created_at") or "", "id": p.get("id") or ""})
 
+    return response_cache.respond(
+        request, f"payees|{user_id}|{cursor}|{limit}", service.data_version(), build, USERS_CACHE_CONTROL,
+    )
 
+# --- Wallet Balances ---
+
+@router.post("/wallets/balances", response_model=WalletBalancesResponse)
+async def get_wallet_balances(
+    batch: WalletBalancesRequest,
+    wallets: WalletService = Depends(get_wallet_service)
+):
+    """
+    Balances of many wallets at once, fetched concurrently and cached briefly.
+    A failed lookup only fails its own item.
+    """
+    if not batch.wallets:
+        raise HTTPException(status_code=400, detail="At least one wallet is required")
+    if len(batch.wallets) > settings.WALLET_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"At most {settings.WALLET_BATCH_MAX} wallets per batch")
+    return WalletBalancesResponse(results=await wallets.get_balances(batch.wallets, batch.amount_in_decimal))
+
+@router.get("/{user_id}/balances", response_model=WalletBalancesResponse)
+async def get_user_balances(
+    user_id: int,
+    service: UserService = Depends(get_user_service),
+    wallets: WalletService = Depends(get_wallet_service)
+):
+    """
+    Dashboard balances: the user's own wallet first, then each payee's wallet.
+    """
+    user = service.get_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    addresses = list(dict.fromkeys([user.wallet] + [p.wallet_address for p in user.payees]))
+    return WalletBalancesResponse(results=await wallets.get_balances(addresses))
 
 
 # --- AI Utility ---
@@ -1,39 +1,159 @@
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Optional
 from datetime import datetime, timezone
+from loguru import logger
+from src.core.llm_scheduler import Priority, estimate_tokens
+from src.core.settings import settings
+
+TRUNCATION_MARK = " …[truncated]"
+
+# Summaries are LLM calls; they run here, never on the request path
+_summarizer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history-summary")
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cuts `text` to roughly `max_tokens` (same ~4 chars/token estimate as the scheduler)."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[:max(0, max_tokens * 4 - len(TRUNCATION_MARK))] + TRUNCATION_MARK
+
+
+class _Conversation:
+    def __init__(self):
+        self.messages: List[Dict[str, Any]] = []  # not yet folded into the summary
+        self.summary = ""
+        self.summarizing = False
+        self.lock = threading.Lock()
+
 
 class ContextService:
     """
     Stores conversation history and user context in memory.
     In production, this would connect to Redis or Postgres.
+
+    Each message keeps an approximate token count. Once a conversation's
+    history passes HISTORY_TOKEN_BUDGET, its oldest turns are folded into a
+    rolling summary in the background (the previous summary plus the newly
+    folded turns only), and `get_history` never renders more than the budget.
     """
-    def __init__(self):
-        self._history: Dict[str, List[Dict[str, str]]] = {}
+    def __init__(self, summarize: Optional[Callable[[str, List[Dict[str, Any]]], str]] = None):
+        self._history: Dict[str, _Conversation] = {}
+        self._summarize = summarize or self._summarize_with_llm
+        self._llm = None
+
+    @property
+    def llm(self):
+        """Built on first summary; importing crewai is slow."""
+        if self._llm is None:
+            from src.core.llm_factory import LLMFactory
+            # Summaries are background work; they must never starve live chats
+            self._llm = LLMFactory.create_llm(Priority.BULK).with_call_site("history_summary")
+        return self._llm
 
     def add_message(self, conversation_id: str, role: str, content: str):
-        if conversation_id not in self._history:
-            self._history[conversation_id] = []
-        
-        self._history[conversation_id].append({
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now(tz=timezone.utc)
-
-        })
-
-    def get_history(self, conversation_id: str, limit: int = 5) -> str:
-        """Returns the last N messages formatted as a string for the LLM"""
-        if conversation_id not in self._history:
+        conversation = self._history.setdefault(conversation_id, _Conversation())
+        with conversation.lock:
+            conversation.messages.append({
+                "role": role,
+                "content": content,
+                "tokens": estimate_tokens(content),
+                "timestamp": datetime.now(tz=timezone.utc)
+            })
+            fold = self._messages_to_fold(conversation)
+            if fold and not conversation.summarizing:
+                conversation.summarizing = True
+                _summarizer_pool.submit(self._fold, conversation, fold)
+
+    def get_history(self, conversation_id: str, limit: int = 5, max_tokens: Optional[int] = None) -> str:
+        """
+        The running summary plus the most recent messages (at most `limit`),
+        formatted for the LLM and kept under `max_tokens` (HISTORY_TOKEN_BUDGET).
+        """
+        conversation = self._history.get(conversation_id)
+        if conversation is None:
             return ""
-        
-        # Get last N messages
-        messages = self._history[conversation_id][-limit:]
-        
+        budget = max_tokens or settings.HISTORY_TOKEN_BUDGET
+        with conversation.lock:
+            summary = conversation.summary
+            messages = conversation.messages[-limit:] if limit else []
+
         formatted_history = "PREVIOUS CHAT HISTORY:\n"
-        for msg in messages:
-            formatted_history += f"{msg['role'].upper()}: {msg['content']}\n"
-        
-        return formatted_history
+        if summary:
+            formatted_history += f"SUMMARY OF EARLIER CONVERSATION: {truncate_to_tokens(summary, budget // 2)}\n"
+        remaining = budget - estimate_tokens(formatted_history)
+
+        # Newest first, until the budget is spent; long messages are cut
+        lines: List[str] = []
+        for msg in reversed(messages):
+            cap = min(remaining - 8, settings.HISTORY_MESSAGE_MAX_TOKENS)
+            if cap <= 16:
+                break
+            line = f"{msg['role'].upper()}: {truncate_to_tokens(msg['content'], cap)}\n"
+            remaining -= estimate_tokens(line)
+            lines.append(line)
+        return formatted_history + "".join(reversed(lines))
 
     def clear_history(self, conversation_id: str):
         if conversation_id in self._history:
-            del self._history[conversation_id]
\ No newline at end of file
+            del self._history[conversation_id]
+
+    # --- Summarization ---
+
+    def _messages_to_fold(self, conversation: _Conversation) -> int:
+        """How many of the oldest messages to fold so the rest fits half the budget (0 if under budget)."""
+        budget = settings.HISTORY_TOKEN_BUDGET
+        total = estimate_tokens(conversation.summary) + sum(m["tokens"] for m in conversation.messages)
+        if total <= budget:
+            return 0
+        kept, keep_tokens = 0, 0
+        for msg in reversed(conversation.messages):
+            if kept >= settings.HISTORY_KEEP_RECENT_MESSAGES and keep_tokens + msg["tokens"] > budget // 2:
+                break
+            kept += 1
+            keep_tokens += msg["tokens"]
+        return len(conversation.messages) - kept
+
+    def _fold(self, conversation: _Conversation, count: int):
+        with conversation.lock:
+            summary, folded = conversation.summary, list(conversation.messages[:count])
+        try:
+            new_summary = self._summarize(summary, folded)
+        except Exception as e:
+            logger.warning(f"History summary failed, keeping a truncated transcript: {e}")
+            new_summary = self._fallback_summary(summary, folded)
+        new_summary = truncate_to_tokens(new_summary.strip(), settings.HISTORY_SUMMARY_MAX_TOKENS)
+
+        with conversation.lock:
+            # Only appends happen meanwhile, so the folded turns are still the oldest ones
+            conversation.summary = new_summary
+            del conversation.messages[:count]
+            conversation.summarizing = False
+            more = self._messages_to_fold(conversation)
+            if more:
+                conversation.summarizing = True
+        if more:
+            self._fold(conversation, more)
+
+    def _summarize_with_llm(self, summary: str, messages: List[Dict[str, Any]]) -> str:
+        transcript = "\n".join(
+            f"{m['role'].upper()}: {truncate_to_tokens(m['content'], settings.HISTORY_MESSAGE_MAX_TOKENS)}" for m in messages
+        )
+        prompt = f"""
+        You maintain a running summary of a remittance chat between a user and an assistant.
+        Current summary: "{summary or 'None yet'}"
+        New messages:
+        {transcript}
+        Write the updated summary in at most {settings.HISTORY_SUMMARY_MAX_TOKENS * 3 // 4} words. Keep names,
+        payees, amounts, currencies and any decisions. Return ONLY the summary text.
+        """
+        return str(self.llm.call(messages=[{"role": "user", "content": prompt}]))
+
+    @staticmethod
+    def _fallback_summary(summary: str, messages: List[Dict[str, Any]]) -> str:
+        parts = [summary] if summary else []
+        parts += [f"{m['role']}: {truncate_to_tokens(m['content'], 40)}" for m in messages]
+        text = " | ".join(parts)
+        # Over the limit, drop the oldest part rather than the newest
+        limit = settings.HISTORY_SUMMARY_MAX_TOKENS * 4 - 8
+        return text if len(text) <= limit else "…" + text[-(limit - 1):]
@@ -0,0 +1,129 @@
+"""
+Cross-Rate Service
+Keeps an NxN matrix of implied rates between every supported currency, derived
+from the ADA price legs: rate(a -> b) = price(ADA in b) / price(ADA in a).
+ADA itself and iUSD (from the Minswap 1 ADA quote) are part of the matrix.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.core.constant import current_support_for_ada_conversation
+from src.services.market_snapshot import market_snapshot
+from src.tools.market_data import market_data
+
+CURRENCIES = ["ada", "iusd"] + list(current_support_for_ada_conversation)
+
+
+class CrossRateService:
+    """
+    `matrix[i, j]` is how many units of currency j one unit of currency i buys.
+    A single leg update rewrites one row and one column (O(N)); lookups are
+    O(1) and `get_rates` resolves many pairs in one vectorized gather.
+    """
+
+    def __init__(self, currencies: Sequence[str] = CURRENCIES):
+        self.currencies = [c.lower() for c in currencies]
+        self._index = {c: i for i, c in enumerate(self.currencies)}
+        n = len(self.currencies)
+        self._legs = np.full(n, np.nan)  # price of 1 ADA in each currency
+        self._legs[self._index["ada"]] = 1.0
+        self._matrix = np.full((n, n), np.nan)
+        self._matrix[self._index["ada"], self._index["ada"]] = 1.0
+        self._lock = threading.Lock()
+        self.version = 0
+        self.updated_at = 0.0
+
+    # --- Updates ---
+
+    def update_leg(self, currency: str, ada_price: float):
+        """Reprices one currency against all others."""
+        self.update_legs({currency: ada_price})
+
+    def update_legs(self, prices: Dict[str, float]):
+        """Applies changed legs only; rebuilds the matrix if most of them moved."""
+        with self._lock:
+            changed = []
+            for currency, price in prices.items():
+                i = self._index.get(currency.lower())
+                if i is None or price is None or price <= 0 or self._legs[i] == price:
+                    continue
+                self._legs[i] = price
+                changed.append(i)
+            if not changed:
+                return
+
+            legs = self._legs
+            if len(changed) > len(legs) // 4:
+                self._matrix = legs[np.newaxis, :] / legs[:, np.newaxis]
+            else:
+                for i in changed:
+                    self._matrix[i, :] = legs / legs[i]
+                    self._matrix[:, i] = legs[i] / legs
+            self.version += 1
+            self.updated_at = time.time()
+
+    def sync(self) -> bool:
+        """
+        Pulls the latest cached prices (no network). False unless fresh fiat
+        prices were available, so callers refetch instead of serving old legs.
+        """
+        fiat = market_data.get_all_prices()  # empty once the cache is stale
+        prices = dict(fiat)
+        quote = market_snapshot.get_minswap_quote(1.0)
+        if quote:
+            prices["iusd"] = quote["amount_out"]
+        if prices:
+            self.update_legs(prices)
+        return bool(fiat)
+
+    async def ensure_fresh_async(self):
+        """`sync`, fetching every fiat leg in one CoinGecko call if nothing is cached."""
+        if self.sync():
+            return
+        try:
+            self.update_legs(await market_data.fetch_all_prices_async())
+        except Exception as e:
+            logger.warning(f"Cross rates unavailable: {e}")
+
+    def ensure_fresh(self):
+        """Blocking variant of `ensure_fresh_async` (for agent tools)."""
+        if self.sync():
+            return
+        try:
+            self.update_legs(market_data.fetch_all_prices())
+        except Exception as e:
+            logger.warning(f"Cross rates unavailable: {e}")
+
+    # --- Lookups ---
+
+    def get_rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+        """Units of `to_currency` per 1 `from_currency`, or None if a leg is unknown."""
+        i = self._index.get(from_currency.lower())
+        j = self._index.get(to_currency.lower())
+        if i is None or j is None:
+            return None
+        rate = self._matrix[i, j]
+        return None if np.isnan(rate) else float(rate)
+
+    def get_rates(self, pairs: List[Tuple[str, str]]) -> List[Optional[float]]:
+        """Vectorized `get_rate` for many pairs."""
+        if not pairs:
+            return []
+        rows = np.array([self._index.get(a.lower(), -1) for a, _ in pairs])
+        cols = np.array([self._index.get(b.lower(), -1) for _, b in pairs])
+        known = (rows >= 0) & (cols >= 0)
+        rates = np.full(len(pairs), np.nan)
+        rates[known] = self._matrix[rows[known], cols[known]]
+        return [None if np.isnan(r) else float(r) for r in rates]
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Copies of (legs, matrix) and the version they belong to."""
+        with self._lock:
+            return self._legs.copy(), self._matrix.copy(), self.version
+
+    def supports(self, currency: str) -> bool:
+        return currency.lower() in self._index
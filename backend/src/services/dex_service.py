@@ -1,8 +1,13 @@
+import httpx
 import requests
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from src.core.settings import settings
+from src.core.metrics import track_upstream
+from src.services.market_snapshot import market_snapshot
+from src.services.last_known_good import last_known_good
 
 class DexService:
-    BASE_URL = "https://agg-api.minswap.org/aggregator"
+    BASE_URL = settings.MINSWAP_AGGREGATOR_URL
     
     # Token Constants (Mainnet Policy IDs for Pricing)
     TOKEN_ADA = "lovelace"
@@ -12,60 +17,113 @@ class DexService:
         """
         Gets a real liquidity quote from Minswap Aggregator.
         """
+        shared = self._shared_quote(amount_ada)
+        if shared is not None:
+            return shared
+
         try:
-            # Convert ADA to Lovelace
-            amount_lovelace = int(amount_ada * 1_000_000)
-            
-            payload = {
-                "amount": str(amount_lovelace),
-                "token_in": self.TOKEN_ADA,
-                "token_out": self.TOKEN_IUSD,
-                "slippage": 1.0, # 1% slippage tolerance
-                "amount_in_decimal": False 
-            }
-            
-            headers = {"Content-Type": "application/json"}
-            
             # Timeout set to 5s to prevent hanging your agent
-            response = requests.post(
-                f"{self.BASE_URL}/estimate", 
-                json=payload, 
-                headers=headers,
-                timeout=5
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Parse Math (iUSD has 6 decimals)
-            amount_out_raw = int(data.get("amount_out", 0))
-            amount_out_decimal = amount_out_raw / 1_000_000
-            
-            min_amount_raw = int(data.get("min_amount_out", 0))
-            min_amount_decimal = min_amount_raw / 1_000_000
+            with track_upstream("minswap", "estimate"):
+                response = requests.post(
+                    f"{self.BASE_URL}/estimate", 
+                    json=self._payload(amount_ada), 
+                    headers={"Content-Type": "application/json"},
+                    timeout=5
+                )
+                response.raise_for_status()
+            return self._parse(amount_ada, response.json())
+        except Exception as e:
+            return self._fallback(amount_ada, e)
+
+    async def get_ada_to_stable_quote_async(self, amount_ada: float) -> Dict[str, Any]:
+        """Non-blocking variant of `get_ada_to_stable_quote` (for async agent tools)."""
+        shared = self._shared_quote(amount_ada)
+        if shared is not None:
+            return shared
+
+        try:
+            with track_upstream("minswap", "estimate"):
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(f"{self.BASE_URL}/estimate", json=self._payload(amount_ada), timeout=5.0)
+                response.raise_for_status()
+            return self._parse(amount_ada, response.json())
+        except Exception as e:
+            return self._fallback(amount_ada, e)
+
+    def _shared_quote(self, amount_ada: float) -> Optional[Dict[str, Any]]:
+        shared = market_snapshot.get_minswap_quote(amount_ada)
+        if shared is None:
+            return None
+        return {
+            "success": True,
+            "input_ada": amount_ada,
+            "estimated_iusd": shared["amount_out"],
+            "minimum_iusd": shared["min_amount_out"],
+            "price_impact_percent": shared["avg_price_impact"],
+            "protocols_used": [],
+            "fees_ada": "Included in quote"
+        }
+
+    def _payload(self, amount_ada: float) -> Dict[str, Any]:
+        # Convert ADA to Lovelace
+        amount_lovelace = int(amount_ada * 1_000_000)
+        return {
+            "amount": str(amount_lovelace),
+            "token_in": self.TOKEN_ADA,
+            "token_out": self.TOKEN_IUSD,
+            "slippage": 1.0, # 1% slippage tolerance
+            "amount_in_decimal": False 
+        }
+
+    def _parse(self, amount_ada: float, data: Dict[str, Any]) -> Dict[str, Any]:
+        # Parse Math (iUSD has 6 decimals)
+        amount_out_raw = int(data.get("amount_out", 0))
+        amount_out_decimal = amount_out_raw / 1_000_000
+        
+        min_amount_raw = int(data.get("min_amount_out", 0))
+        min_amount_decimal = min_amount_raw / 1_000_000
 
-            # Extract routing info for transparency
-            protocols = set()
-            for path in data.get("paths", []):
-                for hop in path:
-                    protocols.add(hop.get("protocol", "Unknown"))
+        last_known_good.update_minswap(amount_ada, {
+            "amount_out": amount_out_decimal,
+            "min_amount_out": min_amount_decimal,
+            "avg_price_impact": data.get("avg_price_impact", 0),
+        })
 
+        # Extract routing info for transparency
+        protocols = set()
+        for path in data.get("paths", []):
+            for hop in path:
+                protocols.add(hop.get("protocol", "Unknown"))
+
+        return {
+            "success": True,
+            "input_ada": amount_ada,
+            "estimated_iusd": amount_out_decimal,
+            "minimum_iusd": min_amount_decimal,
+            "price_impact_percent": data.get("avg_price_impact", 0),
+            "protocols_used": list(protocols), # e.g. ["MinswapV2", "WingRiders"]
+            "fees_ada": "Included in quote"
+        }
+
+    def _fallback(self, amount_ada: float, error: Exception) -> Dict[str, Any]:
+        last_good = last_known_good.get_minswap_quote(amount_ada)
+        if last_good is not None:
             return {
                 "success": True,
+                "stale": True,  # last known good quote; the live call failed
                 "input_ada": amount_ada,
-                "estimated_iusd": amount_out_decimal,
-                "minimum_iusd": min_amount_decimal,
-                "price_impact_percent": data.get("avg_price_impact", 0),
-                "protocols_used": list(protocols), # e.g. ["MinswapV2", "WingRiders"]
+                "estimated_iusd": last_good["amount_out"],
+                "minimum_iusd": last_good["min_amount_out"],
+                "price_impact_percent": last_good["avg_price_impact"],
+                "protocols_used": [],
                 "fees_ada": "Included in quote"
             }
-
-        except Exception as e:
-            # Graceful error handling so the Agent doesn't crash
-            return {
-                "success": False,
-                "error": str(e),
-                "fallback_rate": 0.35 # Conservative fallback
-            }
+        # Graceful error handling so the Agent doesn't crash
+        return {
+            "success": False,
+            "error": str(error),
+            "fallback_rate": last_known_good.get_binance_price() or 0.35 # Conservative fallback
+        }
 
     def get_market_rate(self) -> float:
         """
@@ -74,4 +132,10 @@ class DexService:
         quote = self.get_ada_to_stable_quote(1.0)
         if quote["success"]:
             return quote["estimated_iusd"]
-        return 0.35
\ No newline at end of file
+        return quote["fallback_rate"]
+
+    async def get_market_rate_async(self) -> float:
+        quote = await self.get_ada_to_stable_quote_async(1.0)
+        if quote["success"]:
+            return quote["estimated_iusd"]
+        return quote["fallback_rate"]
@@ -0,0 +1,182 @@
+"""
+Last-Known-Good Market State
+The latest successful value from each upstream, persisted to a small JSON file
+(replaced atomically, at most every MARKET_LKG_WRITE_SECONDS) and loaded at
+startup. After a restart the first requests are answered from it while live
+data warms up in the background, and it replaces the hard-coded fallbacks
+when an upstream is down.
+
+Every value served from here is noted on the current request, which reports
+it in the X-Data-Stale-Seconds / X-Data-Stale-Sources response headers.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from src.core.settings import settings
+
+SOURCES = ("coingecko", "binance", "minswap")
+MAX_QUOTES = 64  # distinct Minswap amounts kept (oldest dropped first)
+
+# {source: age_s} of stale data used by the current request (shared with its child tasks)
+_stale_sources: ContextVar[Optional[Dict[str, float]]] = ContextVar("stale_sources", default=None)
+
+
+def start_staleness_tracking() -> Tuple[Dict[str, float], object]:
+    """Called per request; returns the dict stale reads are noted in, and a reset token."""
+    stale: Dict[str, float] = {}
+    return stale, _stale_sources.set(stale)
+
+
+def stop_staleness_tracking(token):
+    _stale_sources.reset(token)
+
+
+class LastKnownGood:
+    def __init__(self, path: str, write_interval: float = 10.0):
+        self.path = path
+        self.write_interval = write_interval
+        self._prices: Dict[str, float] = {}
+        self._volume_usd: Optional[float] = None
+        self._binance: Optional[float] = None
+        self._quotes: Dict[str, Dict[str, float]] = {}  # str(amount) -> quote
+        self._updated: Dict[str, float] = {}  # source -> unix time
+        self._live: set = set()  # sources fetched successfully by this process
+        self._written_at = 0.0
+        self._snapshots = 0  # payloads serialized so far
+        self._persisted = 0  # the newest one written to disk
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    # --- Persistence ---
+
+    def load(self) -> bool:
+        """Reads the file written by a previous run. False if there is none."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable last-known-good file {self.path}: {e}")
+            return False
+        with self._lock:
+            self._prices = {k: float(v) for k, v in (data.get("prices") or {}).items()}
+            self._volume_usd = data.get("volume_usd")
+            self._binance = data.get("binance")
+            self._quotes = data.get("minswap") or {}
+            self._updated = {k: float(v) for k, v in (data.get("updated") or {}).items() if k in SOURCES}
+        logger.info(f"Loaded last-known-good market data (ages: {self.status()})")
+        return True
+
+    def _persist(self):
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            if now - self._written_at < self.write_interval:
+                return
+            self._written_at = now
+            self._snapshots += 1
+            snapshot = self._snapshots
+            # Serialized under the lock: the dicts keep changing once it's released
+            payload = json.dumps({"prices": self._prices, "volume_usd": self._volume_usd, "binance": self._binance,
+                                  "minswap": self._quotes, "updated": self._updated}, separators=(",", ":"))
+        with self._write_lock:
+            if snapshot < self._persisted:
+                return  # a newer snapshot is already on disk
+            directory = os.path.dirname(self.path) or "."
+            tmp = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    f.write(payload)
+                os.replace(tmp, self.path)  # readers never see a half-written file
+                self._persisted = snapshot
+            except OSError as e:
+                logger.warning(f"Could not persist last-known-good market data: {e}")
+                if tmp and os.path.exists(tmp):
+                    os.remove(tmp)
+
+    # --- Updates (after every successful upstream call) ---
+
+    def update_prices(self, prices: Dict[str, float], volume_usd: Optional[float] = None):
+        with self._lock:
+            self._prices.update(prices)
+            if volume_usd is not None:
+                self._volume_usd = float(volume_usd)
+            self._updated["coingecko"] = time.time()
+            self._live.add("coingecko")
+        self._persist()
+
+    def update_binance(self, price: float):
+        with self._lock:
+            self._binance = float(price)
+            self._updated["binance"] = time.time()
+            self._live.add("binance")
+        self._persist()
+
+    def update_minswap(self, amount_ada: float, quote: Dict[str, float]):
+        key = repr(float(amount_ada))
+        with self._lock:
+            self._quotes.pop(key, None)
+            if len(self._quotes) >= MAX_QUOTES:
+                self._quotes.pop(next(iter(self._quotes)))
+            self._quotes[key] = {
+                "amount_out": float(quote.get("amount_out") or 0),
+                "min_amount_out": float(quote.get("min_amount_out") or 0),
+                "avg_price_impact": float(quote.get("avg_price_impact") or 0),
+            }
+            self._updated["minswap"] = time.time()
+            self._live.add("minswap")
+        self._persist()
+
+    # --- Reads (each noted as stale on the current request) ---
+
+    def warming(self, source: str) -> bool:
+        """True until this process has fetched `source` live; until then, recent
+        last-known-good data is served first (and refreshed in the background)."""
+        return source not in self._live
+
+    def age(self, source: str) -> Optional[float]:
+        updated = self._updated.get(source)
+        return None if updated is None else max(0.0, time.time() - updated)
+
+    def _serve(self, source: str, value, max_age: Optional[float]):
+        age = self.age(source)
+        if value is None or age is None or (max_age is not None and age > max_age):
+            return None
+        stale = _stale_sources.get()
+        if stale is not None:
+            stale[source] = max(stale.get(source, 0.0), age)
+        return value
+
+    def get_ada_price(self, currency: str, max_age: Optional[float] = None) -> Optional[float]:
+        return self._serve("coingecko", self._prices.get(currency.lower()), max_age)
+
+    def get_binance_price(self, max_age: Optional[float] = None) -> Optional[float]:
+        return self._serve("binance", self._binance, max_age)
+
+    def get_minswap_quote(self, amount_ada: float, max_age: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """Only for an amount that was actually quoted (price impact doesn't scale)."""
+        quote = self._quotes.get(repr(float(amount_ada)))
+        return self._serve("minswap", dict(quote) if quote else None, max_age)
+
+    def clear(self):
+        with self._lock:
+            self._prices, self._volume_usd, self._binance, self._quotes = {}, None, None, {}
+            self._updated, self._live = {}, set()
+
+    def status(self) -> Dict[str, Optional[float]]:
+        return {source: (None if self.age(source) is None else round(self.age(source), 1)) for source in SOURCES}
+
+
+# Singleton instance (loaded in the app lifespan)
+last_known_good = LastKnownGood(settings.MARKET_LKG_FILE, settings.MARKET_LKG_WRITE_SECONDS)
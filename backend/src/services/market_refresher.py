@@ -0,0 +1,91 @@
+"""
+Market Snapshot Refresher
+Polls CoinGecko, Binance and Minswap and publishes the results to the shared
+market snapshot. Runs inside the worker that wins the snapshot lock, or
+standalone as a sidecar:
+
+    python -m src.services.market_refresher
+"""
+import asyncio
+from typing import Dict, Optional
+
+from loguru import logger
+
+from src.core.settings import settings
+from src.services.market_snapshot import LADDER_AMOUNTS, MarketSnapshotStore, market_snapshot
+from src.services.price_history import PriceHistoryStore, price_history
+from src.services.rater_service import RaterService
+from src.tools.market_data import market_data
+
+
+async def _fetch_coingecko_prices() -> Optional[Dict[str, float]]:
+    try:
+        return await market_data.fetch_all_prices_async()
+    except Exception as e:
+        logger.warning(f"Snapshot refresh: CoinGecko failed: {e}")
+        return None
+
+
+def _history_samples(prices: Optional[Dict[str, float]], volume_usd: Optional[float],
+                     binance: Optional[float], ladder: Dict[float, Dict[str, float]]) -> Dict[str, float]:
+    """Price history series names for one poll's results."""
+    samples = {f"ada_{currency}": price for currency, price in (prices or {}).items()}
+    if volume_usd is not None:
+        samples["ada_volume_usd"] = volume_usd
+    if binance is not None:
+        samples["binance_ada_usdt"] = binance
+    for amount, quote in ladder.items():
+        samples[f"minswap_ada_iusd_{amount:g}"] = quote["amount_out"] / amount
+        samples[f"minswap_impact_{amount:g}"] = quote["avg_price_impact"]
+    return samples
+
+
+async def refresh_once(store: MarketSnapshotStore = market_snapshot, rater: Optional[RaterService] = None,
+                       history: PriceHistoryStore = price_history):
+    """One poll of every upstream; sources that fail keep their previous values."""
+    rater = rater or RaterService()
+    prices, binance, *quotes = await asyncio.gather(
+        _fetch_coingecko_prices(),
+        rater._fetch_binance_price_live(),
+        *(rater._fetch_minswap_estimate_live(amount) for amount in LADDER_AMOUNTS),
+    )
+    ladder = {}
+    for amount, quote in zip(LADDER_AMOUNTS, quotes):
+        if quote and quote.get("amount_out") is not None:
+            ladder[amount] = {
+                "amount_out": float(quote["amount_out"]),
+                "min_amount_out": float(quote.get("min_amount_out") or 0),
+                "avg_price_impact": float(quote.get("avg_price_impact") or 0),
+            }
+    volume_usd = market_data.get_volume_usd() if prices else None
+    store.publish(ada_prices=prices, ada_volume_usd=volume_usd, binance_price=binance, minswap_ladder=ladder)
+    try:
+        history.append_many(_history_samples(prices, volume_usd, binance, ladder))
+    except OSError as e:
+        logger.warning(f"Price history append failed: {e}")
+
+
+async def run_refresher(store: MarketSnapshotStore = market_snapshot, role: str = settings.MARKET_SNAPSHOT_ROLE):
+    """
+    Runs forever. Every interval the process tries to become (or stay) the
+    host's single writer; only the writer polls. If the writer dies, its lock
+    is released and another worker takes over on its next attempt.
+    """
+    if not store.path or role == "reader":
+        return
+    rater = RaterService()
+    leading = False
+    while True:
+        if store.try_acquire_writer():
+            if not leading:
+                logger.info(f"Refreshing shared market snapshot at {store.path}")
+                leading = True
+            try:
+                await refresh_once(store, rater)
+            except Exception as e:
+                logger.error(f"Market snapshot refresh failed: {e}")
+        await asyncio.sleep(settings.MARKET_SNAPSHOT_REFRESH_SECONDS)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_refresher(role="writer"))
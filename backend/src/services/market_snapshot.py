@@ -0,0 +1,239 @@
+"""
+Shared Market Snapshot
+A fixed-layout binary snapshot of market data in a memory-mapped file, so
+every gunicorn worker on the host reads the same prices without each one
+polling the upstreams.
+
+One process (the first worker to win a file lock, or a sidecar started with
+`python -m src.services.market_refresher`) writes; all others only read.
+Consistency uses a seqlock: the writer makes the sequence odd while writing
+and even when done; readers retry if it changed under them.
+"""
+import fcntl
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Optional
+
+from src.core.constant import current_support_for_ada_conversation
+from src.core.settings import settings
+
+MAGIC = b"RMSN"
+VERSION = 2
+
+SOURCES = ("coingecko", "binance", "minswap")
+CURRENCIES = tuple(current_support_for_ada_conversation)
+LADDER_AMOUNTS = (1.0, 10.0, 100.0, 1_000.0, 10_000.0)  # ADA
+LADDER_FIELDS = 4  # amount_out, min_amount_out, avg_price_impact, (reserved)
+
+_HEADER = struct.Struct("<4sIQ")  # magic, version, sequence
+_SOURCE_TS = struct.Struct(f"<{len(SOURCES)}d")
+_FIAT = struct.Struct(f"<{len(CURRENCIES)}d")
+_BINANCE = struct.Struct("<d")
+_VOLUME = struct.Struct("<d")  # ADA 24h volume (USD), from CoinGecko
+_LADDER = struct.Struct(f"<{len(LADDER_AMOUNTS) * LADDER_FIELDS}d")
+
+_SEQ_OFFSET = 8
+_TS_OFFSET = _HEADER.size
+_FIAT_OFFSET = _TS_OFFSET + _SOURCE_TS.size
+_BINANCE_OFFSET = _FIAT_OFFSET + _FIAT.size
+_VOLUME_OFFSET = _BINANCE_OFFSET + _BINANCE.size
+_LADDER_OFFSET = _VOLUME_OFFSET + _VOLUME.size
+SNAPSHOT_SIZE = _LADDER_OFFSET + _LADDER.size
+
+_CURRENCY_INDEX = {c: i for i, c in enumerate(CURRENCIES)}
+_LADDER_INDEX = {a: i for i, a in enumerate(LADDER_AMOUNTS)}
+_NAN = float("nan")
+
+
+class MarketSnapshotStore:
+    """Reader/writer for the snapshot file. Readers never copy the whole file."""
+
+    def __init__(self, path: str, max_age_seconds: float = 60.0):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._map: Optional[mmap.mmap] = None
+        self._writable = False
+        self._lock_fd: Optional[int] = None
+
+    # --- Mapping ---
+
+    def _open(self, writable: bool) -> Optional[mmap.mmap]:
+        if self._map is not None and (self._writable or not writable):
+            return self._map
+        if not self.path:
+            return None
+        if writable:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size != SNAPSHOT_SIZE:
+                    os.ftruncate(fd, SNAPSHOT_SIZE)
+                mapped = mmap.mmap(fd, SNAPSHOT_SIZE)
+                if _HEADER.unpack_from(mapped, 0)[:2] != (MAGIC, VERSION):
+                    self._init_layout(mapped)
+            finally:
+                os.close(fd)
+        else:
+            try:
+                fd = os.open(self.path, os.O_RDONLY)
+            except FileNotFoundError:
+                return None
+            try:
+                if os.fstat(fd).st_size != SNAPSHOT_SIZE:
+                    return None
+                mapped = mmap.mmap(fd, SNAPSHOT_SIZE, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+            if _HEADER.unpack_from(mapped, 0)[:2] != (MAGIC, VERSION):
+                return None
+        if self._map is not None:
+            self._map.close()
+        self._map, self._writable = mapped, writable
+        return mapped
+
+    @staticmethod
+    def _init_layout(mapped: mmap.mmap):
+        _HEADER.pack_into(mapped, 0, MAGIC, VERSION, 0)
+        _SOURCE_TS.pack_into(mapped, _TS_OFFSET, *([0.0] * len(SOURCES)))
+        _FIAT.pack_into(mapped, _FIAT_OFFSET, *([_NAN] * len(CURRENCIES)))
+        _BINANCE.pack_into(mapped, _BINANCE_OFFSET, _NAN)
+        _VOLUME.pack_into(mapped, _VOLUME_OFFSET, _NAN)
+        _LADDER.pack_into(mapped, _LADDER_OFFSET, *([_NAN] * (len(LADDER_AMOUNTS) * LADDER_FIELDS)))
+
+    # --- Leader election (one writer per host) ---
+
+    def try_acquire_writer(self) -> bool:
+        """Non-blocking; the lock is held until the process exits."""
+        if self._lock_fd is not None:
+            return True
+        if not self.path:
+            return False
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    # --- Reads ---
+
+    def _read(self, offset: int, layout: struct.Struct, index: Optional[int] = None):
+        mapped = self._open(writable=False) if not self._writable else self._map
+        if mapped is None:
+            return None
+        for _ in range(100):
+            seq_before = struct.unpack_from("<Q", mapped, _SEQ_OFFSET)[0]
+            if seq_before % 2:
+                continue  # write in progress
+            if index is None:
+                values = layout.unpack_from(mapped, offset)
+            else:
+                values = struct.unpack_from("<d", mapped, offset + index * 8)
+            if struct.unpack_from("<Q", mapped, _SEQ_OFFSET)[0] == seq_before:
+                return values
+        return None
+
+    def source_age(self, source: str) -> Optional[float]:
+        ts = self._read(_TS_OFFSET, _SOURCE_TS, SOURCES.index(source))
+        if not ts or not ts[0]:
+            return None
+        return time.time() - ts[0]
+
+    def _fresh(self, source: str) -> bool:
+        age = self.source_age(source)
+        return age is not None and age < self.max_age_seconds
+
+    def get_ada_price(self, currency: str) -> Optional[float]:
+        index = _CURRENCY_INDEX.get(currency.lower())
+        if index is None or not self._fresh("coingecko"):
+            return None
+        value = self._read(_FIAT_OFFSET, _FIAT, index)
+        return None if not value or math.isnan(value[0]) else value[0]
+
+    def get_all_ada_prices(self) -> Dict[str, float]:
+        if not self._fresh("coingecko"):
+            return {}
+        values = self._read(_FIAT_OFFSET, _FIAT) or ()
+        return {c: v for c, v in zip(CURRENCIES, values) if not math.isnan(v)}
+
+    def get_ada_volume_usd(self) -> Optional[float]:
+        if not self._fresh("coingecko"):
+            return None
+        value = self._read(_VOLUME_OFFSET, _VOLUME)
+        return None if not value or math.isnan(value[0]) else value[0]
+
+    def get_binance_price(self) -> Optional[float]:
+        if not self._fresh("binance"):
+            return None
+        value = self._read(_BINANCE_OFFSET, _BINANCE)
+        return None if not value or math.isnan(value[0]) else value[0]
+
+    def get_minswap_quote(self, amount_ada: float) -> Optional[Dict[str, float]]:
+        """A quote for one of LADDER_AMOUNTS, or None."""
+        index = _LADDER_INDEX.get(float(amount_ada))
+        if index is None or not self._fresh("minswap"):
+            return None
+        values = self._read(_LADDER_OFFSET, _LADDER)
+        if not values:
+            return None
+        amount_out, min_out, impact, _ = values[index * LADDER_FIELDS:(index + 1) * LADDER_FIELDS]
+        if math.isnan(amount_out):
+            return None
+        return {"amount_out": amount_out, "min_amount_out": min_out, "avg_price_impact": impact}
+
+    # --- Writes ---
+
+    def publish(
+        self,
+        ada_prices: Optional[Dict[str, float]] = None,
+        ada_volume_usd: Optional[float] = None,
+        binance_price: Optional[float] = None,
+        minswap_ladder: Optional[Dict[float, Dict[str, float]]] = None,
+    ):
+        """Writes whichever sources are given; the others keep their last values."""
+        mapped = self._open(writable=True)
+        now = time.time()
+        timestamps = list(_SOURCE_TS.unpack_from(mapped, _TS_OFFSET))
+        seq = struct.unpack_from("<Q", mapped, _SEQ_OFFSET)[0]
+
+        struct.pack_into("<Q", mapped, _SEQ_OFFSET, seq + 1)  # odd: writing
+        try:
+            if ada_prices:
+                current = list(_FIAT.unpack_from(mapped, _FIAT_OFFSET))
+                for currency, price in ada_prices.items():
+                    index = _CURRENCY_INDEX.get(currency.lower())
+                    if index is not None and price is not None:
+                        current[index] = float(price)
+                _FIAT.pack_into(mapped, _FIAT_OFFSET, *current)
+                _VOLUME.pack_into(mapped, _VOLUME_OFFSET, _NAN if ada_volume_usd is None else float(ada_volume_usd))
+                timestamps[SOURCES.index("coingecko")] = now
+            if binance_price is not None:
+                _BINANCE.pack_into(mapped, _BINANCE_OFFSET, float(binance_price))
+                timestamps[SOURCES.index("binance")] = now
+            if minswap_ladder:
+                current = list(_LADDER.unpack_from(mapped, _LADDER_OFFSET))
+                for amount, quote in minswap_ladder.items():
+                    index = _LADDER_INDEX.get(float(amount))
+                    if index is None or not quote:
+                        continue
+                    base = index * LADDER_FIELDS
+                    current[base] = float(quote["amount_out"])
+                    current[base + 1] = float(quote.get("min_amount_out", _NAN))
+                    current[base + 2] = float(quote.get("avg_price_impact", 0.0))
+                _LADDER.pack_into(mapped, _LADDER_OFFSET, *current)
+                timestamps[SOURCES.index("minswap")] = now
+            _SOURCE_TS.pack_into(mapped, _TS_OFFSET, *timestamps)
+        finally:
+            struct.pack_into("<Q", mapped, _SEQ_OFFSET, seq + 2)  # even: done
+
+    def status(self) -> Dict[str, Optional[float]]:
+        """Per-source age in seconds (None = never published)."""
+        return {s: (round(a, 1) if (a := self.source_age(s)) is not None else None) for s in SOURCES}
+
+
+# Singleton instance
+market_snapshot = MarketSnapshotStore(settings.MARKET_SNAPSHOT_FILE, settings.MARKET_SNAPSHOT_MAX_AGE_SECONDS)
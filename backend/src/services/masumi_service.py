@@ -3,6 +3,7 @@
 import asyncio
 from masumi import Config, Payment
 from src.core.settings import settings
+from src.core.metrics import track_upstream
 from loguru import logger
 
 class MasumiService:
@@ -39,7 +40,8 @@ class MasumiService:
             )
             
             logger.info(f"Checking payment status for tx: {blockchain_identifier}")
-            status_result = await payment.check_payment_status()
+            with track_upstream("masumi", "payment_status"):
+                status_result = await payment.check_payment_status()
             logger.debug(f"Masumi payment status response: {status_result}")
 
             if status_result.get("data", {}).get("status") == "PAID_AND_CONFIRMED":
@@ -52,6 +54,3 @@ class MasumiService:
         except Exception as e:
             logger.error(f"Error during Masumi payment verification for tx {blockchain_identifier}: {e}")
             return False
-
-# Singleton instance for dependency injection
-masumi_service = MasumiService()
\ No newline at end of file
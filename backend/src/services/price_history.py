@@ -0,0 +1,198 @@
+"""
+Price History Store
+Append-only time series of every sampled price and quote, one memory-mapped
+file per series holding fixed-width (timestamp, value) float64 records.
+
+The market snapshot refresher is the only writer on a host. Readers map the
+same files and see a record once the header count covers it, so range queries
+are a binary search over a NumPy view of the file.
+
+When a full file's records older than the retention window make up at least
+half of it, the writer rewrites the file without them instead of doubling it.
+The old file is marked retired so readers reopen the new one.
+"""
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import mmap
+import numpy as np
+from loguru import logger
+
+from src.core.settings import settings
+
+MAGIC = b"RMTS"
+VERSION = 1
+_HEADER = struct.Struct("<4sIQ")  # magic, version, record count
+RETIRED_OFFSET = 16  # header byte set once the file was replaced by a compacted copy
+HEADER_SIZE = 32
+RECORD_SIZE = 16  # timestamp, value
+INITIAL_CAPACITY = 4096  # records; files double when full
+
+_SERIES_NAME = re.compile(r"^[a-z0-9_]{1,64}$")
+
+
+class _Series:
+    def __init__(self, path: str, writable: bool, retention_seconds: float = 0.0):
+        self.path = path
+        self.writable = writable
+        self.retention_seconds = retention_seconds
+        self._map: Optional[mmap.mmap] = None
+        self._open()
+
+    def _open(self):
+        if self.writable:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < HEADER_SIZE:
+                    os.ftruncate(fd, HEADER_SIZE + INITIAL_CAPACITY * RECORD_SIZE)
+                    mapped = mmap.mmap(fd, 0)
+                    _HEADER.pack_into(mapped, 0, MAGIC, VERSION, 0)
+                else:
+                    mapped = mmap.mmap(fd, 0)
+            finally:
+                os.close(fd)
+        else:
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                if os.fstat(fd).st_size < HEADER_SIZE:
+                    raise ValueError(f"{self.path} is not initialized yet")
+                mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            finally:
+                os.close(fd)
+        if _HEADER.unpack_from(mapped, 0)[:2] != (MAGIC, VERSION):
+            raise ValueError(f"{self.path} is not a price history file")
+        # The previous mapping is left to the GC: NumPy views may still point into it
+        self._map = mapped
+
+    @property
+    def count(self) -> int:
+        return _HEADER.unpack_from(self._map, 0)[2]
+
+    def _capacity(self) -> int:
+        return (len(self._map) - HEADER_SIZE) // RECORD_SIZE
+
+    def append(self, timestamp: float, value: float):
+        count = self.count
+        if count >= self._capacity():
+            self._make_room()
+            count = self.count
+        struct.pack_into("<dd", self._map, HEADER_SIZE + count * RECORD_SIZE, timestamp, value)
+        struct.pack_into("<Q", self._map, 8, count + 1)  # publish after the record is written
+
+    def _make_room(self):
+        """Drops samples past retention if that frees half the file, else doubles it."""
+        capacity = self._capacity()
+        if self.retention_seconds > 0:
+            records = self.records()
+            expired = int(np.searchsorted(records[:, 0], time.time() - self.retention_seconds, side="left"))
+            if expired >= capacity // 2:
+                self._rewrite(records[expired:], capacity)
+                return
+        with open(self.path, "r+b") as f:
+            f.truncate(HEADER_SIZE + capacity * 2 * RECORD_SIZE)
+        self._open()
+
+    def _rewrite(self, keep: np.ndarray, capacity: int):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, len(keep)).ljust(HEADER_SIZE, b"\0"))
+                f.write(np.ascontiguousarray(keep).tobytes())
+                f.truncate(HEADER_SIZE + capacity * RECORD_SIZE)
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._map[RETIRED_OFFSET] = 1
+        self._open()
+
+    def records(self) -> np.ndarray:
+        """(count, 2) view of [timestamp, value] rows; no copy."""
+        if self._map[RETIRED_OFFSET]:
+            self._open()  # the writer compacted into a new file
+        count = self.count
+        if HEADER_SIZE + count * RECORD_SIZE > len(self._map):
+            self._open()  # the writer grew the file
+        return np.frombuffer(self._map, dtype=np.float64, count=count * 2, offset=HEADER_SIZE).reshape(count, 2)
+
+
+class PriceHistoryStore:
+    def __init__(self, directory: str, retention_days: float = 0.0):
+        self.directory = directory
+        self.retention_seconds = retention_days * 86400
+        self._series: Dict[Tuple[str, bool], _Series] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str, writable: bool) -> Optional[_Series]:
+        if not self.directory or not _SERIES_NAME.match(name):
+            return None
+        key = (name, writable)
+        with self._lock:
+            if key not in self._series:
+                path = os.path.join(self.directory, f"{name}.ts")
+                if writable:
+                    os.makedirs(self.directory, exist_ok=True)
+                elif not os.path.exists(path):
+                    return None
+                try:
+                    self._series[key] = _Series(path, writable, self.retention_seconds if writable else 0.0)
+                except ValueError as e:
+                    logger.warning(f"Price history: {e}")
+                    return None
+            return self._series[key]
+
+    # --- Writes ---
+
+    def append(self, name: str, value: float, timestamp: Optional[float] = None):
+        series = self._get(name, writable=True)
+        if series is not None and value is not None:
+            series.append(time.time() if timestamp is None else timestamp, float(value))
+
+    def append_many(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        for name, value in values.items():
+            self.append(name, value, timestamp)
+
+    # --- Reads ---
+
+    def series(self) -> List[str]:
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        return sorted(f[:-3] for f in os.listdir(self.directory) if f.endswith(".ts"))
+
+    def range(self, name: str, start: Optional[float] = None, end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Timestamps and values with start <= ts < end (views, not copies)."""
+        series = self._get(name, writable=False)
+        if series is None:
+            return np.empty(0), np.empty(0)
+        records = series.records()
+        ts = records[:, 0]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return ts[lo:hi], records[lo:hi, 1]
+
+    def ohlc(self, name: str, interval_seconds: float, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, float]]:
+        """Open/high/low/close per `interval_seconds` bucket, for buckets with samples."""
+        ts, values = self.range(name, start, end)
+        if not len(ts):
+            return []
+        buckets = np.floor(ts / interval_seconds).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        ends = np.r_[starts[1:], len(ts)] - 1
+        highs = np.maximum.reduceat(values, starts)
+        lows = np.minimum.reduceat(values, starts)
+        return [
+            {"timestamp": float(b * interval_seconds), "open": float(o), "high": float(h), "low": float(low), "close": float(c), "samples": int(n)}
+            for b, o, h, low, c, n in zip(buckets[starts], values[starts], highs, lows, values[ends], ends - starts + 1)
+        ]
+
+
+# Singleton instance
+price_history = PriceHistoryStore(settings.PRICE_HISTORY_DIR, settings.PRICE_HISTORY_RETENTION_DAYS)
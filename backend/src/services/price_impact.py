@@ -0,0 +1,63 @@
+"""
+Price-Impact Curve
+Piecewise-linear fit (in log-amount space) of a DEX quote ladder, so amounts
+inside the quoted range can be priced locally instead of asking the aggregator.
+Amounts outside it are only clamped to the end points and flagged as such.
+"""
+import time
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+DEFAULT_LADDER = (10.0, 100.0, 1_000.0, 5_000.0, 10_000.0, 50_000.0, 100_000.0)  # ADA
+
+
+class PriceImpactCurve:
+    def __init__(self, pair: str, amounts: Sequence[float], amounts_out: Sequence[float], impacts: Sequence[float]):
+        order = np.argsort(amounts)
+        self.pair = pair
+        self.amounts = np.asarray(amounts, dtype=float)[order]
+        self.rates = np.asarray(amounts_out, dtype=float)[order] / self.amounts
+        self.impacts = np.asarray(impacts, dtype=float)[order]
+        self._log_amounts = np.log10(self.amounts)
+        self.fitted_at = time.time()
+
+    @property
+    def min_amount(self) -> float:
+        return float(self.amounts[0])
+
+    @property
+    def max_amount(self) -> float:
+        return float(self.amounts[-1])
+
+    def covers(self, amount: float) -> bool:
+        return self.min_amount <= amount <= self.max_amount
+
+    def age(self) -> float:
+        return time.time() - self.fitted_at
+
+    def output(self, amounts: np.ndarray) -> np.ndarray:
+        """Expected amount out for each amount in (vectorized; 0 for non-positive amounts)."""
+        amounts = np.asarray(amounts, dtype=float)
+        x = np.log10(np.maximum(amounts, 1e-9))
+        return np.where(amounts > 0, amounts * np.interp(x, self._log_amounts, self.rates), 0.0)
+
+    def evaluate(self, amounts: Sequence[float]) -> List[Dict[str, Any]]:
+        """
+        Interpolated output, effective rate and price impact for each amount.
+        Amounts outside the quoted range get the nearest end point's rate and
+        impact and are flagged `extrapolated`; above the range that understates
+        the real impact.
+        """
+        x = np.log10(np.asarray(amounts, dtype=float))
+        rates = np.interp(x, self._log_amounts, self.rates)
+        impacts = np.interp(x, self._log_amounts, self.impacts)
+        return [
+            {
+                "amount_out": float(a * r),
+                "effective_rate": float(r),
+                "price_impact_percent": float(i),
+                "extrapolated": not self.covers(a),
+            }
+            for a, r, i in zip(amounts, rates, impacts)
+        ]
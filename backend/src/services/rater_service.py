@@ -1,16 +1,41 @@
+import asyncio
+import hashlib
+import time
+import weakref
 import httpx
+import numpy as np
 import sys
-from typing import Dict, Any, List, Optional
+from typing import AsyncIterator, Dict, Any, Iterable, List, Optional
 from datetime import datetime, timezone
 from pydantic import BaseModel
 from loguru import logger
 
+from src.core.settings import settings
+from src.core.metrics import track_upstream
+from src.core.tracing import span, traced
+from src.services.market_snapshot import market_snapshot
+from src.services.last_known_good import last_known_good
+from src.services.price_history import PriceHistoryStore, price_history
+from src.services.cross_rate_service import CrossRateService
+from src.services.price_impact import DEFAULT_LADDER, PriceImpactCurve
+from src.services.scoring_engine import ScoringEngine
+from src.services.route_table import RouteRatingTable
+from src.services.split_optimizer import CostCurve, optimize
+from src.tools.market_data import market_data
 from src.models.schemas import (
     RateRequest,
     RateResponse,
+    RateBatchItem,
     ProviderRating,
     RouteRating,
-    TransactionRating
+    TransactionRating,
+    PriceImpactPoint,
+    PriceImpactCurveResponse,
+    SplitOrderLeg,
+    SplitOrderPlan,
+    PricePoint,
+    PriceCandle,
+    PriceHistoryResponse
 )
 
 # --- Loguru Configuration ---
@@ -28,89 +53,345 @@ class TransactionMetrics(BaseModel):
     reliability: float
 
 class RaterService:
-    MINSWAP_BASE_URL = "https://agg-api.minswap.org/aggregator"
-    BINANCE_API_URL = "https://api.binance.com/api/v3/ticker/price"
+    MINSWAP_BASE_URL = settings.MINSWAP_AGGREGATOR_URL
+    BINANCE_API_URL = settings.BINANCE_API_URL
+    IUSD_TOKEN = "f66d78b4a3cb3d37afa0ec36461e51ecbde00f26c8f0a68f94b6988069555344"
 
-    def __init__(self):
+    def __init__(self, cross_rates: Optional[CrossRateService] = None, history: PriceHistoryStore = price_history):
+        self.cross_rates = cross_rates or CrossRateService()
+        self.history = history
+        self.scoring = ScoringEngine()
+        self.route_table = RouteRatingTable(self.cross_rates, self.scoring)
+        self._curves: Dict[str, PriceImpactCurve] = {}
+        # Provider metrics at ROUTE_REFERENCE_AMOUNT_ADA from the last route table
+        # refresh; `reference_version` is a digest of them, so it matches across workers
+        self._reference_metrics: List[TransactionMetrics] = []
+        self.reference_version = ""
+        self.reference_checked_at = 0.0
+        # Agent tools drive this service from their own event loop, so asyncio
+        # primitives are kept per loop: {loop: (minswap semaphore, {pair: lock})}
+        self._loop_primitives = weakref.WeakKeyDictionary()
+        self._refreshing: Dict[str, asyncio.Future] = {}  # background refreshes of warm-start data
         logger.info("RaterService initialized.")
 
-    # --- Scoring Algorithms (Unchanged) ---
-    def _calculate_relative_score(self, value: float, best_value: float, lower_is_better: bool = True) -> float:
-        if best_value == 0: return 1.0
-        ratio = value / best_value
-        if lower_is_better:
-            if ratio <= 1.05: return 5.0;
-            if ratio <= 1.20: return 4.0;
-            if ratio <= 1.50: return 3.0;
-            if ratio <= 2.00: return 2.0;
-            return 1.0
-        else:
-            if ratio >= 0.98: return 5.0;
-            if ratio >= 0.95: return 4.0;
-            if ratio >= 0.90: return 3.0;
-            return 2.0
-
-    def _calculate_overall_score(self, cost: float, speed: float, reliability: float) -> float:
-        return round((cost * 0.4) + (speed * 0.3) + (reliability * 0.3), 1)
-
-    # --- Data Fetching (Unchanged) ---
+    # --- Data Fetching ---
+    # Reads go to the host-wide market snapshot first; the `_live` variants
+    # hit the upstreams directly (used by the snapshot refresher itself).
+    # After a restart, recent last-known-good data is served first while the
+    # live call runs in the background; it is also the fallback when live fails.
     async def _fetch_binance_price(self, symbol: str = "ADAUSDT") -> float:
-        try:
-            async with httpx.AsyncClient() as c:
-                r = await c.get(f"{self.BINANCE_API_URL}?symbol={symbol}", timeout=3.0)
-                if r.status_code == 200: return float(r.json().get("price", 0.0))
-        except Exception: pass
+        if symbol == "ADAUSDT":
+            shared = market_snapshot.get_binance_price()
+            if shared is not None: return shared
+            if last_known_good.warming("binance"):
+                warm = last_known_good.get_binance_price(max_age=settings.MARKET_LKG_SERVE_MAX_AGE_SECONDS)
+                if warm is not None:
+                    self._refresh_in_background("binance", self._fetch_binance_price_live)
+                    return warm
+        price = await self._fetch_binance_price_live(symbol)
+        if price is not None: return price
+        last_good = last_known_good.get_binance_price() if symbol == "ADAUSDT" else None
+        if last_good is not None:
+            logger.warning("Could not fetch Binance price, using last known good.")
+            return last_good
         logger.warning("Could not fetch Binance price, using fallback.")
         return 0.35
 
-    async def _fetch_minswap_estimate(self, amount_ada: float) -> Optional[Dict[str, Any]]:
-        payload = { "amount": str(amount_ada), "token_in": "lovelace", "token_out": "f66d78b4a3cb3d37afa0ec36461e51ecbde00f26c8f0a68f94b6988069555344", "slippage": 1.0, "amount_in_decimal": True }
+    async def _fetch_binance_price_live(self, symbol: str = "ADAUSDT") -> Optional[float]:
         try:
-            async with httpx.AsyncClient() as c:
-                r = await c.post(f"{self.MINSWAP_BASE_URL}/estimate", json=payload, timeout=5.0)
-                if r.status_code == 200: return r.json()
+            with track_upstream("binance", "ticker"):
+                async with httpx.AsyncClient() as c:
+                    r = await c.get(f"{self.BINANCE_API_URL}?symbol={symbol}", timeout=3.0)
+                r.raise_for_status()  # inside, so the status counts towards the circuit breaker
+            price = float(r.json().get("price", 0.0))
+            if symbol == "ADAUSDT" and price > 0: last_known_good.update_binance(price)
+            return price
         except Exception: pass
-        logger.warning("Could not fetch Minswap estimate.")
         return None
 
-    # --- CORE RATING ENGINE (Unchanged) ---
-    async def get_all_providers(self, reference_amount_ada: float = 1000.0) -> List[ProviderRating]:
-        logger.info(f"🏁 Starting provider race for {reference_amount_ada} ADA")
+    async def _fetch_minswap_estimate(self, amount_ada: float, token_out: str = IUSD_TOKEN) -> Optional[Dict[str, Any]]:
+        iusd = token_out == self.IUSD_TOKEN
+        if iusd:
+            shared = market_snapshot.get_minswap_quote(amount_ada)
+            if shared is not None: return shared
+            if last_known_good.warming("minswap"):
+                warm = last_known_good.get_minswap_quote(amount_ada, max_age=settings.MARKET_LKG_SERVE_MAX_AGE_SECONDS)
+                if warm is not None:
+                    self._refresh_in_background(f"minswap:{amount_ada}", lambda: self._fetch_minswap_estimate_live(amount_ada))
+                    return warm
+        data = await self._fetch_minswap_estimate_live(amount_ada, token_out)
+        if data is None and iusd:
+            data = last_known_good.get_minswap_quote(amount_ada)
+        if data is None: logger.warning("Could not fetch Minswap estimate.")
+        return data
+
+    async def _fetch_minswap_estimate_live(self, amount_ada: float, token_out: str = IUSD_TOKEN) -> Optional[Dict[str, Any]]:
+        payload = { "amount": str(amount_ada), "token_in": "lovelace", "token_out": token_out, "slippage": 1.0, "amount_in_decimal": True }
+        try:
+            with track_upstream("minswap", "estimate"):
+                async with httpx.AsyncClient() as c:
+                    r = await c.post(f"{self.MINSWAP_BASE_URL}/estimate", json=payload, timeout=5.0)
+                r.raise_for_status()
+            data = r.json()
+            if token_out == self.IUSD_TOKEN: last_known_good.update_minswap(amount_ada, data)
+            return data
+        except Exception: pass
+        return None
+
+    def _refresh_in_background(self, key: str, fetch):
+        """Starts `fetch()` unless one for `key` is already running on this loop."""
+        task = self._refreshing.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            if len(self._refreshing) > 64:
+                self._refreshing = {k: t for k, t in self._refreshing.items() if not t.done()}
+            self._refreshing[key] = asyncio.ensure_future(fetch())
+
+    # --- Price-Impact Curve ---
+
+    def _primitives(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self._loop_primitives:
+            self._loop_primitives[loop] = (asyncio.Semaphore(settings.MINSWAP_MAX_CONCURRENCY), {})
+        return self._loop_primitives[loop]
+
+    async def _quote_ladder(self, amounts: List[float], token_out: str) -> Dict[float, Dict[str, Any]]:
+        """Quotes every amount concurrently, at most MINSWAP_MAX_CONCURRENCY at a time."""
+        async def quote(amount: float):
+            async with self._primitives()[0]:
+                return amount, await self._fetch_minswap_estimate(amount, token_out)
+
+        results = await asyncio.gather(*(quote(a) for a in amounts))
+        return {a: q for a, q in results if q and float(q.get("amount_out") or 0) > 0}
+
+    async def _fit_curve(self, token_out: str, amounts: List[float]) -> PriceImpactCurve:
+        quotes = await self._quote_ladder(amounts, token_out)
+        if len(quotes) < 2:
+            raise ValueError("Could not get enough Minswap quotes to build a price-impact curve.")
+        curve = PriceImpactCurve(
+            pair=f"ADA/{token_out}",
+            amounts=list(quotes),
+            amounts_out=[float(q["amount_out"]) for q in quotes.values()],
+            impacts=[float(q.get("avg_price_impact") or 0) for q in quotes.values()],
+        )
+        self._curves[token_out] = curve
+        return curve
+
+    @traced("rater.get_price_impact_curve")
+    async def get_price_impact_curve(self, amounts: Optional[List[float]] = None, token_out: str = IUSD_TOKEN) -> PriceImpactCurveResponse:
+        """
+        Output, effective rate and price impact for each amount. Amounts inside a
+        fresh cached curve are interpolated locally; otherwise the ladder (plus
+        the requested amounts) is re-quoted and the curve refitted.
+        """
+        amounts = sorted({float(a) for a in (amounts or DEFAULT_LADDER) if a > 0})
+        if not amounts:
+            raise ValueError("At least one positive amount is required.")
+
+        def cached() -> Optional[PriceImpactCurve]:
+            curve = self._curves.get(token_out)
+            if curve and curve.age() < settings.PRICE_CURVE_TTL_SECONDS and all(curve.covers(a) for a in amounts):
+                return curve
+            return None
+
+        curve, source = cached(), "cache"
+        if curve is None:
+            lock = self._primitives()[1].setdefault(token_out, asyncio.Lock())
+            async with lock:
+                # A concurrent request may have just refitted it
+                curve = cached()
+                if curve is None:
+                    curve, source = await self._fit_curve(token_out, sorted(set(DEFAULT_LADDER) | set(amounts))), "live"
+
+        quoted = set(curve.amounts.tolist())
+        return PriceImpactCurveResponse(
+            pair=curve.pair,
+            source=source,
+            fitted_at=datetime.fromtimestamp(curve.fitted_at, timezone.utc),
+            min_amount_ada=curve.min_amount,
+            max_amount_ada=curve.max_amount,
+            points=[
+                PriceImpactPoint(amount_ada=a, interpolated=a not in quoted and not point["extrapolated"], **point)
+                for a, point in zip(amounts, curve.evaluate(amounts))
+            ],
+        )
+
+    # --- Split-Order Planning ---
+
+    @traced("rater.plan_split_order")
+    async def plan_split_order(self, amount_ada: float, max_slices: int = 8) -> SplitOrderPlan:
+        """
+        Splits `amount_ada` across providers, and the DEX part across up to
+        `max_slices` sequential orders, to maximize the USD received.
+        """
+        price, _ = await asyncio.gather(self._fetch_binance_price(), self.get_price_impact_curve([amount_ada]))
+        curve = self._curves[self.IUSD_TOKEN]
+        if amount_ada > curve.max_amount:
+            # Its quote failed; the curve would price it at a smaller order's rate
+            raise ValueError(f"No Minswap quote for {amount_ada:g} ADA; can't plan the split.")
+
+        start = time.perf_counter()
+        interval_hours = settings.SPLIT_SLICE_INTERVAL_MINUTES / 60
+        dex = CostCurve("MinswapDEX", curve.output, fixed_fee_usd=settings.MINSWAP_ORDER_FEE_ADA * price, time_hours=0.08)
+        options = {
+            "MinswapDEX": [dex.sliced(n, interval_hours) for n in (1, 2, 4, 8, 16, 32) if n <= max(1, max_slices)],
+            "Binance": [CostCurve("Binance", lambda x: x * price * (1 - self.BINANCE_TRADING_FEE),
+                                  fixed_fee_usd=self.BINANCE_WITHDRAWAL_FEE_ADA * price, time_hours=0.5)],
+        }
+        for name, (fee, hours, _) in self.BASELINE_PROVIDERS.items():
+            options[name] = [CostCurve(name, lambda x, fee=fee: x * price * (1 - fee), time_hours=hours)]
+
+        plan = optimize(options, amount_ada)
+        singles = {name: float(curves[0].output_usd(np.array([amount_ada]))[0]) - curves[0].fixed_fee_usd
+                   for name, curves in options.items()}
+        best_single = max(singles, key=singles.get)
+        compute_ms = (time.perf_counter() - start) * 1000
+
+        return SplitOrderPlan(
+            amount_ada=amount_ada,
+            expected_output_usd=round(plan["total"], 6),
+            legs=[
+                SplitOrderLeg(
+                    provider=leg["curve"].provider, amount_ada=round(leg["amount"], 6), slices=leg["curve"].slices,
+                    expected_output_usd=round(leg["received"], 6),
+                    effective_rate=round(leg["received"] / leg["amount"], 8),
+                    estimated_time_hours=leg["curve"].time_hours,
+                )
+                for leg in sorted(plan["legs"], key=lambda leg: -leg["amount"])
+            ],
+            best_single_provider=best_single,
+            best_single_output_usd=round(singles[best_single], 6),
+            savings_usd=round(plan["total"] - singles[best_single], 6),
+            compute_ms=round(compute_ms, 3),
+        )
+
+    # --- Price History ---
+    HISTORY_INTERVALS = {"raw": None, "1m": 60.0, "1h": 3600.0}
+    MAX_HISTORY_POINTS = 5000
+
+    @traced("rater.price_history")
+    async def get_price_history(self, series: str, interval: str = "raw",
+                                start: Optional[float] = None, end: Optional[float] = None) -> Optional[PriceHistoryResponse]:
+        """
+        Samples (or OHLC candles) of one series between two Unix timestamps. Only
+        the most recent MAX_HISTORY_POINTS points/candles are returned.
+        """
+        if interval not in self.HISTORY_INTERVALS:
+            raise ValueError(f"Unknown interval '{interval}'. Use one of {list(self.HISTORY_INTERVALS)}.")
+        if series not in self.history.series():
+            return None
+
+        ts, values = self.history.range(series, start, end)
+        volatility = None
+        if len(values) > 2 and (values > 0).all():
+            volatility = round(float(np.diff(np.log(values)).std()), 8)
+
+        response = PriceHistoryResponse(series=series, interval=interval, volatility=volatility)
+        if interval == "raw":
+            ts, values = ts[-self.MAX_HISTORY_POINTS:], values[-self.MAX_HISTORY_POINTS:]
+            response.points = [
+                PricePoint(timestamp=datetime.fromtimestamp(t, timezone.utc), value=v)
+                for t, v in zip(ts.tolist(), values.tolist())
+            ]
+        else:
+            candles = self.history.ohlc(series, self.HISTORY_INTERVALS[interval], start, end)
+            response.candles = [
+                PriceCandle(**{**c, "timestamp": datetime.fromtimestamp(c["timestamp"], timezone.utc)})
+                for c in candles[-self.MAX_HISTORY_POINTS:]
+            ]
+        return response
+
+    # --- CORE RATING ENGINE ---
+    # Off-chain baselines: (fee as a fraction of the amount, hours, reliability)
+    BASELINE_PROVIDERS = {
+        "Wise": (0.015, 24, 4.5),
+        "MoonPay (Card)": (0.039, 0.2, 4.2),
+    }
+    BINANCE_WITHDRAWAL_FEE_ADA = 1.0
+    BINANCE_TRADING_FEE = 0.001  # spot taker fee
+
+    async def _provider_metrics(self, reference_amount_ada: float) -> List[TransactionMetrics]:
+        """True cost (USD), time and reliability of every tracked provider for one amount."""
         market_price_ada_usd = await self._fetch_binance_price()
+        minswap_data = await self._fetch_minswap_estimate(reference_amount_ada)
+        return self._metrics_for(reference_amount_ada, market_price_ada_usd, minswap_data)
+
+    def _metrics_for(self, reference_amount_ada: float, market_price_ada_usd: float,
+                     minswap_data: Optional[Dict[str, Any]]) -> List[TransactionMetrics]:
         input_value_usd = reference_amount_ada * market_price_ada_usd
         metrics: List[TransactionMetrics] = []
 
-        # ... (Provider logic remains the same)
-        minswap_data = await self._fetch_minswap_estimate(reference_amount_ada)
         if minswap_data:
             output_usd = float(minswap_data.get("amount_out", 0))
             metrics.append(TransactionMetrics(provider_name="MinswapDEX", true_cost_usd=input_value_usd - output_usd, estimated_time_hours=0.08, reliability=5.0))
         
-        binance_output_usd = (reference_amount_ada - 1.0) * market_price_ada_usd
+        binance_output_usd = (reference_amount_ada - self.BINANCE_WITHDRAWAL_FEE_ADA) * market_price_ada_usd * (1 - self.BINANCE_TRADING_FEE)
         metrics.append(TransactionMetrics(provider_name="Binance", true_cost_usd=input_value_usd - binance_output_usd, estimated_time_hours=0.5, reliability=4.8))
 
-        metrics.append(TransactionMetrics(provider_name="Wise", true_cost_usd=input_value_usd * 0.015, estimated_time_hours=24, reliability=4.5))
-        metrics.append(TransactionMetrics(provider_name="MoonPay (Card)", true_cost_usd=input_value_usd * 0.039, estimated_time_hours=0.2, reliability=4.2))
+        for name, (fee, hours, reliability) in self.BASELINE_PROVIDERS.items():
+            metrics.append(TransactionMetrics(provider_name=name, true_cost_usd=input_value_usd * fee, estimated_time_hours=hours, reliability=reliability))
+        return metrics
+
+    @traced("rater.get_all_providers")
+    async def get_all_providers(
+        self,
+        reference_amount_ada: float = 1000.0,
+        preferred_speed: Optional[str] = None,
+        weights: Optional[Dict[str, float]] = None,
+        top_k: Optional[int] = None,
+    ) -> List[ProviderRating]:
+        logger.info(f"🏁 Starting provider race for {reference_amount_ada} ADA")
+        metrics = await self._provider_metrics(reference_amount_ada)
 
         if not metrics: return []
-        best_cost = min(m.true_cost_usd for m in metrics)
-        best_speed = min(m.estimated_time_hours for m in metrics)
-        
-        provider_ratings = []
-        for m in metrics:
-            cost_score = self._calculate_relative_score(m.true_cost_usd, best_cost)
-            speed_score = self._calculate_relative_score(m.estimated_time_hours, best_speed)
-            provider_ratings.append(ProviderRating(
-                provider_name=m.provider_name, reliability_score=m.reliability, speed_score=speed_score, cost_score=cost_score,
-                overall_rating=self._calculate_overall_score(cost_score, speed_score, m.reliability),
-                reviews_count=1000, average_time_hours=m.estimated_time_hours
-            ))
+        with span("rater.scoring"):
+            ranked = self._rank_providers([metrics], self.scoring.weights_for(preferred_speed, weights)[np.newaxis], top_k)[0]
         
         logger.success("🏆 Provider race complete.")
-        return sorted(provider_ratings, key=lambda p: p.overall_rating, reverse=True)
+        return ranked
+
+    def _rank_providers(self, races: List[List[TransactionMetrics]], weights: np.ndarray,
+                        top_k: Optional[int] = None) -> List[List[ProviderRating]]:
+        """
+        Scores many provider races in one vectorized pass. `weights` holds one
+        row per race; a provider missing from a race is left out of its ranking.
+        """
+        names = list(dict.fromkeys(m.provider_name for race in races for m in race))
+        column = {name: j for j, name in enumerate(names)}
+        cost, time_hours, reliability = (np.full((len(races), len(names)), np.nan) for _ in range(3))
+        for i, race in enumerate(races):
+            for m in race:
+                j = column[m.provider_name]
+                cost[i, j], time_hours[i, j], reliability[i, j] = m.true_cost_usd, m.estimated_time_hours, m.reliability
+
+        scores = self.scoring.score(cost=cost, time_hours=time_hours, reliability=reliability, weights=weights)
+        order = self.scoring.top_k(scores["overall"], top_k)
+        return [
+            [
+                ProviderRating(
+                    provider_name=names[j], reliability_score=float(reliability[i, j]),
+                    speed_score=float(scores["speed"][i, j]), cost_score=float(scores["cost"][i, j]),
+                    overall_rating=float(scores["overall"][i, j]),
+                    reviews_count=1000, average_time_hours=float(time_hours[i, j])
+                )
+                for j in order[i] if not np.isnan(cost[i, j])
+            ]
+            for i in range(len(races))
+        ]
+
+    def reference_providers(self, preferred_speed: Optional[str] = None, top_k: Optional[int] = None) -> List[ProviderRating]:
+        """Provider ratings at ROUTE_REFERENCE_AMOUNT_ADA from the last route table refresh (no upstream calls)."""
+        if not self._reference_metrics:
+            return []
+        weights = self.scoring.weights_for(preferred_speed)[np.newaxis]
+        return self._rank_providers([self._reference_metrics], weights, top_k)[0]
+
+    def reference_max_age(self) -> int:
+        """Seconds until the next refresh may change `reference_providers`."""
+        return max(0, int(settings.ROUTE_TABLE_REFRESH_SECONDS - (time.time() - self.reference_checked_at)))
 
     # --- RESTORED PUBLIC METHODS ---
 
+    @traced("rater.get_provider_by_name")
     async def get_provider_by_name(self, name: str, reference_amount_ada: float = 1000.0) -> Optional[ProviderRating]:
         """
         RESTORED: Gets a single provider's rating by running the race and finding it.
@@ -124,21 +405,26 @@ class RaterService:
         logger.warning(f"Provider '{name}' not found after running the rating engine.")
         return None
 
+    @traced("rater.rate_transaction")
     async def rate_transaction(self, amount: float, from_currency: str, to_currency: str, provider: str) -> Optional[TransactionRating]:
         """
         RESTORED: Calculates a specific transaction for ONE provider.
         """
         logger.info(f"Calculating single transaction for {amount} {from_currency} via {provider}")
         market_price = await self._fetch_binance_price()
+        minswap_data = await self._fetch_minswap_estimate(amount) if "minswap" in provider.lower() else None
+        return self._transaction_for(amount, from_currency, to_currency, provider, market_price, minswap_data)
+
+    def _transaction_for(self, amount: float, from_currency: str, to_currency: str, provider: str,
+                         market_price: float, minswap_data: Optional[Dict[str, Any]]) -> Optional[TransactionRating]:
         input_value = amount * market_price
         output_value = 0.0
 
         provider_key = provider.lower()
         if "minswap" in provider_key:
-            data = await self._fetch_minswap_estimate(amount)
-            if data: output_value = float(data.get("amount_out", 0))
+            if minswap_data: output_value = float(minswap_data.get("amount_out", 0))
         elif "binance" in provider_key:
-            output_value = (amount - 1.0) * market_price
+            output_value = (amount - self.BINANCE_WITHDRAWAL_FEE_ADA) * market_price * (1 - self.BINANCE_TRADING_FEE)
         
         if output_value == 0:
             logger.error(f"Could not calculate output for provider {provider}")
@@ -155,34 +441,147 @@ class RaterService:
             recommended=True
         )
 
-    async def rate_route(self, from_currency: str, to_currency: str, from_country: str, to_country: str) -> RouteRating:
+    # --- Route Ratings ---
+    ROUTE_REFERENCE_AMOUNT_ADA = 1000.0
+
+    @traced("rater.refresh_route_table")
+    async def refresh_route_table(self) -> bool:
+        """Feeds the latest market data into the route table (snapshot-first, so cheap)."""
+        await self.cross_rates.ensure_fresh_async()
+        one_ada = await self._fetch_minswap_estimate(1.0)
+        if one_ada:
+            self.cross_rates.update_leg("iusd", float(one_ada["amount_out"]))
+
+        amount = self.ROUTE_REFERENCE_AMOUNT_ADA
+        price, quote = await asyncio.gather(self._fetch_binance_price(), self._fetch_minswap_estimate(amount))
+        metrics = self._metrics_for(amount, price, quote)
+        impact = float(quote.get("avg_price_impact") or 0) if quote else None
+        if metrics != self._reference_metrics:
+            self._reference_metrics = metrics
+            self.reference_version = hashlib.blake2b(
+                "|".join(m.model_dump_json() for m in metrics).encode(), digest_size=8
+            ).hexdigest()
+        self.reference_checked_at = time.time()
+        return self.route_table.rebuild(metrics, amount * price, impact, market_data.get_volume_usd())
+
+    async def run_route_table_refresher(self):
+        """Runs forever, rebuilding the route table every ROUTE_TABLE_REFRESH_SECONDS."""
+        while True:
+            try:
+                await self.refresh_route_table()
+            except Exception as e:
+                logger.error(f"Route table refresh failed: {e}")
+            await asyncio.sleep(settings.ROUTE_TABLE_REFRESH_SECONDS)
+
+    @traced("rater.rate_route")
+    async def rate_route(self, from_currency: str, to_currency: str, from_country: str, to_country: str) -> Optional[RouteRating]:
         """
-        RESTORED: Returns a static rating for the general corridor.
+        Served from the materialized route table; `average_rate` is the live
+        implied cross rate (units of `to_currency` per 1 `from_currency`).
+        None for an unsupported pair; ValueError while there is no data for it.
         """
         logger.info(f"Rating route for {from_currency} -> {to_currency}")
-        return RouteRating(
-            route_id=f"{from_currency}-{to_currency}",
-            from_currency=from_currency, to_currency=to_currency,
-            from_country=from_country, to_country=to_country,
-            liquidity_score=4.5, speed_rating=4.5, cost_rating=4.2, reliability_rating=4.8,
-            total_volume_24h=500000.0, average_rate=0.35, best_providers=["MinswapDEX", "Binance"]
-        )
+        if not self.route_table.version:
+            await self.refresh_route_table()  # first request before the background build
+        return self._lookup_route(from_currency, to_currency, from_country, to_country)
+
+    def _lookup_route(self, from_currency: str, to_currency: str, from_country: str, to_country: str) -> Optional[RouteRating]:
+        if from_currency.lower() == to_currency.lower() or not (
+            self.cross_rates.supports(from_currency) and self.cross_rates.supports(to_currency)
+        ):
+            return None
+        route = self.route_table.get(from_currency, to_currency, from_country, to_country)
+        if route is None:
+            raise ValueError(f"No market data to rate {from_currency.upper()}->{to_currency.upper()} yet.")
+        return route
+
+    def _request_route(self, request: RateRequest) -> Optional[RouteRating]:
+        """The route rating for a rate request, or None if the corridor has none."""
+        try:
+            return self._lookup_route(request.from_currency, request.to_currency, request.from_country, request.to_country)
+        except ValueError:
+            return None
 
+    @traced("rater.get_comprehensive_rating")
     async def get_comprehensive_rating(self, request: RateRequest) -> RateResponse:
         """
         ORCHESTRATOR: Now uses the restored methods correctly.
         """
         logger.info("Handling comprehensive rating request...")
-        providers = await self.get_all_providers(request.amount)
+        providers = await self.get_all_providers(request.amount, request.preferred_speed, request.scoring_weights)
         if not providers: raise ValueError("Could not get provider ratings.")
 
         best_tx = await self.rate_transaction(request.amount, request.from_currency, request.to_currency, providers[0].provider_name)
-        route = await self.rate_route(request.from_currency, request.to_currency, request.from_country, request.to_country)
+        if not self.route_table.version:
+            await self.refresh_route_table()
+        route = self._request_route(request)
 
         return RateResponse(
             route_rating=route,
             recommended_providers=providers,
-            alternative_routes=[],
+            alternative_routes=self.route_table.alternatives(request.from_currency, request.to_currency, request.from_country, request.to_country),
             best_transaction=best_tx,
             timestamp=datetime.now(timezone.utc)
-        )
\ No newline at end of file
+        )
+    # --- Batch Rating ---
+    # Every request in a batch shares one Binance price and one Minswap quote
+    # per distinct amount, and requests are scored together in one pass.
+
+    async def _batch_price(self) -> float:
+        if not self.route_table.version:
+            await self.refresh_route_table()
+        return await self._fetch_binance_price()
+
+    def _rate_group(self, requests: List[RateRequest], indexes: Iterable[int], price: float,
+                    quotes: Dict[float, Optional[Dict[str, Any]]]) -> List[RateBatchItem]:
+        """Rates `requests[i]` for each i in `indexes`; quotes are keyed by amount."""
+        indexes = list(indexes)
+        metrics: Dict[float, List[TransactionMetrics]] = {}
+        for i in indexes:
+            amount = requests[i].amount
+            if amount not in metrics:
+                metrics[amount] = self._metrics_for(amount, price, quotes.get(amount))
+        weights = np.stack([self.scoring.weights_for(requests[i].preferred_speed, requests[i].scoring_weights) for i in indexes])
+        with span("rater.scoring"):
+            rankings = self._rank_providers([metrics[requests[i].amount] for i in indexes], weights)
+
+        items = []
+        for i, providers in zip(indexes, rankings):
+            request = requests[i]
+            try:
+                best_tx = self._transaction_for(request.amount, request.from_currency, request.to_currency,
+                                                providers[0].provider_name, price, quotes.get(request.amount))
+                result = RateResponse(
+                    route_rating=self._request_route(request),
+                    recommended_providers=providers,
+                    alternative_routes=self.route_table.alternatives(request.from_currency, request.to_currency, request.from_country, request.to_country),
+                    best_transaction=best_tx,
+                    timestamp=datetime.now(timezone.utc)
+                )
+                items.append(RateBatchItem(index=i, result=result))
+            except Exception as e:
+                items.append(RateBatchItem(index=i, error=f"Rating engine error: {e}"))
+        return items
+
+    @traced("rater.rate_batch")
+    async def rate_batch(self, requests: List[RateRequest]) -> List[RateBatchItem]:
+        """Rates every request; results come back in request order."""
+        amounts = list(dict.fromkeys(r.amount for r in requests))
+        price, quotes = await asyncio.gather(self._batch_price(), self._quote_ladder(amounts, self.IUSD_TOKEN))
+        return self._rate_group(requests, range(len(requests)), price, quotes)
+
+    async def rate_batch_stream(self, requests: List[RateRequest]) -> AsyncIterator[RateBatchItem]:
+        """Like `rate_batch`, but yields each amount's requests as soon as its quote arrives."""
+        groups: Dict[float, List[int]] = {}
+        for i, request in enumerate(requests):
+            groups.setdefault(request.amount, []).append(i)
+
+        async def quote(amount: float):
+            async with self._primitives()[0]:
+                return amount, await self._fetch_minswap_estimate(amount)
+
+        price = await self._batch_price()
+        for next_quote in asyncio.as_completed([quote(a) for a in groups]):
+            amount, data = await next_quote
+            for item in self._rate_group(requests, groups[amount], price, {amount: data}):
+                yield item
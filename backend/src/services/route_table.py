@@ -0,0 +1,174 @@
+"""
+Route Rating Table
+Ratings for every supported currency pair, materialized in memory and rebuilt
+in the background, so /api/rater/route/{from}/{to} is a lookup.
+
+Ratings depend on the corridor kind (crypto or fiat on each side), which
+decides which providers can serve it, and on the live provider metrics. They
+are scored once per kind and gathered into the NxN table. A price change only
+swaps in the new cross-rate matrix; kinds are rescored only when the provider
+metrics change.
+"""
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models.schemas import RouteRating
+from src.services.cross_rate_service import CrossRateService
+from src.services.scoring_engine import ScoringEngine
+
+CRYPTO = ("ada", "iusd")
+
+# Corridor kinds, indexed as from_is_fiat * 2 + to_is_fiat
+KINDS = ("crypto->crypto", "crypto->fiat", "fiat->crypto", "fiat->fiat")
+
+# Which kinds each provider can serve
+PROVIDER_COVERAGE: Dict[str, tuple] = {
+    "MinswapDEX": (0, 1),          # on-chain swap out of ADA/iUSD (iUSD as the dollar leg)
+    "Binance": (0, 1, 2, 3),       # exchange with fiat rails both ways
+    "Wise": (3,),                  # bank-to-bank fiat
+    "MoonPay (Card)": (2,),        # card on-ramp into crypto
+}
+
+# Minswap price impact (%) at the reference amount -> liquidity score
+LIQUIDITY_BANDS = (0.1, 0.5, 1.0, 3.0)
+LIQUIDITY_SCORES = (5.0, 4.0, 3.0, 2.0, 1.0)
+OFF_CHAIN_LIQUIDITY = 4.0  # corridors only served by exchange/bank rails
+
+
+class RouteRatingTable:
+    def __init__(self, cross_rates: CrossRateService, scoring: ScoringEngine):
+        self.cross_rates = cross_rates
+        self.scoring = scoring
+        self.currencies = cross_rates.currencies
+        self._index = {c: i for i, c in enumerate(self.currencies)}
+        is_fiat = np.array([c not in CRYPTO for c in self.currencies], dtype=int)
+        self._kind = is_fiat[:, np.newaxis] * 2 + is_fiat[np.newaxis, :]  # (N, N) corridor kind
+
+        n, k = len(self.currencies), len(KINDS)
+        self._rates = np.full((n, n), np.nan)
+        self._known = np.zeros(n, dtype=bool)
+        self._ratings = np.full((k, 4), np.nan)  # liquidity, speed, cost, reliability per kind
+        self._route_score = np.full(k, np.nan)
+        self._best_providers: List[List[str]] = [[] for _ in KINDS]
+        self._volume_usd = 0.0
+        self._inputs_key = None
+        self._rates_version = -1
+
+        self.version = 0
+        self.built_at = 0.0
+
+    # --- Build ---
+
+    def rebuild(self, metrics: list, input_value_usd: float, minswap_impact: Optional[float], volume_usd: Optional[float]):
+        """
+        Applies new inputs, recomputing only what they affect. `metrics` are the
+        rater's TransactionMetrics for a reference amount worth `input_value_usd`.
+        """
+        changed = False
+
+        inputs_key = (tuple((m.provider_name, round(m.true_cost_usd, 6), m.estimated_time_hours, m.reliability) for m in metrics),
+                      round(input_value_usd, 6), minswap_impact)
+        if inputs_key != self._inputs_key:
+            self._score_kinds(metrics, input_value_usd, minswap_impact)
+            self._inputs_key = inputs_key
+            changed = True
+
+        legs, rates, rates_version = self.cross_rates.snapshot()
+        if rates_version != self._rates_version:
+            self._rates, self._known, self._rates_version = rates, ~np.isnan(legs), rates_version
+            changed = True
+
+        if volume_usd is not None and volume_usd != self._volume_usd:
+            self._volume_usd = float(volume_usd)
+            changed = True
+
+        if changed:
+            self.version += 1
+            self.built_at = time.time()
+        return changed
+
+    def _score_kinds(self, metrics: list, input_value_usd: float, minswap_impact: Optional[float]):
+        names = [m.provider_name for m in metrics]
+        coverage = np.array([[k in PROVIDER_COVERAGE.get(name, ()) for name in names] for k in range(len(KINDS))])
+
+        # Cost as a fraction of the amount sent, so kinds are comparable
+        cost = np.where(coverage, np.array([m.true_cost_usd for m in metrics]) / (input_value_usd or 1.0), np.nan)
+        hours = np.where(coverage, np.array([m.estimated_time_hours for m in metrics]), np.nan)
+        reliability = np.where(coverage, np.array([m.reliability for m in metrics]), np.nan)
+
+        weights = self.scoring.weights_for("normal")
+        overall = self.scoring.score(cost, hours, reliability, weights)["overall"]
+        served = coverage.any(axis=1)
+
+        best_cost = np.where(served, np.where(coverage, cost, np.inf).min(axis=1), np.nan)
+        best_hours = np.where(served, np.where(coverage, hours, np.inf).min(axis=1), np.nan)
+        best_reliability = np.where(served, np.where(coverage, reliability, -np.inf).max(axis=1), np.nan)
+        cost_rating = self.scoring.relative_scores(best_cost)
+        speed_rating = self.scoring.relative_scores(best_hours)
+
+        on_chain = coverage[:, names.index("MinswapDEX")] if "MinswapDEX" in names else np.zeros(len(KINDS), dtype=bool)
+        if minswap_impact is None:
+            chain_liquidity = OFF_CHAIN_LIQUIDITY
+        else:
+            chain_liquidity = LIQUIDITY_SCORES[int(np.searchsorted(LIQUIDITY_BANDS, abs(minswap_impact)))]
+        liquidity = np.where(on_chain, chain_liquidity, OFF_CHAIN_LIQUIDITY)
+
+        ratings = np.stack([liquidity, speed_rating, cost_rating, best_reliability], axis=1)
+        self._ratings = np.where(served[:, None], ratings, np.nan)
+        self._route_score = self._ratings.mean(axis=1)
+
+        top = self.scoring.top_k(overall, 2)
+        self._best_providers = [
+            [names[i] for i in top[k] if not np.isnan(overall[k, i])] for k in range(len(KINDS))
+        ]
+
+    # --- Lookups ---
+
+    def _valid(self, i: int, j: int) -> bool:
+        return i != j and self._known[i] and self._known[j] and not np.isnan(self._route_score[self._kind[i, j]])
+
+    def _route(self, path: List[int], from_country: str, to_country: str) -> RouteRating:
+        legs = list(zip(path, path[1:]))
+        kinds = [self._kind[i, j] for i, j in legs]
+        ratings = self._ratings[kinds].min(axis=0)  # a route is as good as its weakest leg
+        providers: List[str] = []
+        for k in kinds:
+            providers += [p for p in self._best_providers[k] if p not in providers]
+        rate = float(np.prod([self._rates[i, j] for i, j in legs]))
+        codes = [self.currencies[i].upper() for i in path]
+        return RouteRating(
+            route_id="-".join(codes),
+            from_currency=codes[0], to_currency=codes[-1],
+            from_country=from_country or "", to_country=to_country or "",
+            liquidity_score=float(ratings[0]), speed_rating=float(ratings[1]),
+            cost_rating=float(ratings[2]), reliability_rating=float(ratings[3]),
+            total_volume_24h=self._volume_usd, average_rate=rate, best_providers=providers,
+        )
+
+    def get(self, from_currency: str, to_currency: str, from_country: str = "", to_country: str = "") -> Optional[RouteRating]:
+        i, j = self._index.get(from_currency.lower()), self._index.get(to_currency.lower())
+        if i is None or j is None or not self._valid(i, j):
+            return None
+        return self._route([i, j], from_country, to_country)
+
+    def alternatives(self, from_currency: str, to_currency: str, from_country: str = "", to_country: str = "", k: int = 3) -> List[RouteRating]:
+        """Best two-hop routes (via ADA, iUSD or another currency), by their weakest leg."""
+        i, j = self._index.get(from_currency.lower()), self._index.get(to_currency.lower())
+        if i is None or j is None or not self._known.any():
+            return []
+        via = np.arange(len(self.currencies))
+        scores = np.minimum(self._route_score[self._kind[i, via]], self._route_score[self._kind[via, j]])
+        usable = self._known & self._known[i] & self._known[j] & (via != i) & (via != j)
+        scores = np.where(usable, scores, np.nan)
+        return [
+            self._route([i, int(m), j], from_country, to_country)
+            for m in self.scoring.top_k(scores, k) if not np.isnan(scores[m])
+        ]
+
+    def status(self) -> Dict[str, float]:
+        valid = self._known[:, None] & self._known[None, :] & ~np.isnan(self._route_score[self._kind])
+        np.fill_diagonal(valid, False)
+        pairs = int(valid.sum())
+        return {"version": self.version, "built_at": self.built_at, "pairs": pairs}
@@ -0,0 +1,81 @@
+"""
+Scoring Engine
+Vectorized provider scoring. Metrics come in as arrays whose last axis is the
+provider, so one call can score a single provider race or dozens of providers
+across every corridor (shape: corridors x providers).
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+METRICS = ("cost", "speed", "reliability")
+
+# Relative-score bands: value / best value among providers
+LOWER_IS_BETTER_BANDS = (1.05, 1.20, 1.50, 2.00)   # ratio <= band -> 5, 4, 3, 2; else 1
+LOWER_IS_BETTER_SCORES = (5.0, 4.0, 3.0, 2.0, 1.0)
+HIGHER_IS_BETTER_BANDS = (0.90, 0.95, 0.98)         # ratio >= band -> 3, 4, 5; else 2
+HIGHER_IS_BETTER_SCORES = (2.0, 3.0, 4.0, 5.0)
+
+# Weights (cost, speed, reliability) per RateRequest.preferred_speed
+SPEED_PROFILES: Dict[str, tuple] = {
+    "fast": (0.25, 0.50, 0.25),
+    "normal": (0.40, 0.30, 0.30),
+    "cheap": (0.60, 0.15, 0.25),
+}
+
+
+class ScoringEngine:
+    def __init__(self, profiles: Optional[Dict[str, tuple]] = None, default_profile: str = "normal"):
+        self.profiles = {k: np.asarray(v, dtype=float) for k, v in (profiles or SPEED_PROFILES).items()}
+        self.default_profile = default_profile
+
+    def weights_for(self, preferred_speed: Optional[str] = None, overrides: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Profile weights, optionally overridden per metric, normalised to sum to 1."""
+        weights = self.profiles.get((preferred_speed or "").lower(), self.profiles[self.default_profile]).copy()
+        for name, value in (overrides or {}).items():
+            if name in METRICS and value >= 0:
+                weights[METRICS.index(name)] = value
+        total = weights.sum()
+        return weights / total if total > 0 else self.profiles[self.default_profile]
+
+    @staticmethod
+    def relative_scores(values: np.ndarray, lower_is_better: bool = True) -> np.ndarray:
+        """1-5 score of each value against the best along the last axis. NaN = provider absent."""
+        values = np.asarray(values, dtype=float)
+        best = np.nanmin(values, axis=-1, keepdims=True) if lower_is_better else np.nanmax(values, axis=-1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = values / best
+        if lower_is_better:
+            scores = np.asarray(LOWER_IS_BETTER_SCORES)[np.searchsorted(LOWER_IS_BETTER_BANDS, ratio, side="left")]
+        else:
+            scores = np.asarray(HIGHER_IS_BETTER_SCORES)[np.searchsorted(HIGHER_IS_BETTER_BANDS, ratio, side="right")]
+        scores = np.where(best == 0, 1.0, scores)
+        return np.where(np.isnan(values), np.nan, scores)
+
+    def score(self, cost: np.ndarray, time_hours: np.ndarray, reliability: np.ndarray, weights: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Cost, speed and overall (rounded to 0.1) scores, all shaped like `cost`.
+        `weights` is one (cost, speed, reliability) triple, or one per row of `cost`.
+        """
+        cost_scores = self.relative_scores(cost)
+        speed_scores = self.relative_scores(time_hours)
+        reliability = np.broadcast_to(np.asarray(reliability, dtype=float), cost_scores.shape)
+        stacked = np.stack([cost_scores, speed_scores, reliability], axis=-1)
+        overall = np.round((stacked * np.asarray(weights)[..., np.newaxis, :]).sum(axis=-1), 1)
+        return {"cost": cost_scores, "speed": speed_scores, "overall": overall}
+
+    @staticmethod
+    def top_k(overall: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Indexes of the k best providers along the last axis, best first; ties
+        keep input order (at the k-th place, which of the tied ones makes the
+        cut is unspecified). Absent (NaN) providers rank last.
+        """
+        keys = np.where(np.isnan(overall), -np.inf, overall)
+        n = keys.shape[-1]
+        if k is None or k >= n:
+            return np.argsort(-keys, axis=-1, kind="stable")
+        # Select the k best without sorting everything, then order just those
+        candidates = np.sort(np.argpartition(-keys, k - 1, axis=-1)[..., :k], axis=-1)
+        order = np.argsort(-np.take_along_axis(keys, candidates, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(candidates, order, axis=-1)
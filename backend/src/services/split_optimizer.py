@@ -0,0 +1,87 @@
+"""
+Split-Order Optimizer
+Splits one remittance across providers (and across time-sliced DEX swaps) to
+maximize the total received, given each provider's output curve.
+
+Each amount is discretized into `steps` equal chunks. With diminishing returns
+(price impact only grows with size) the best split is simply the `steps`
+largest marginal gains across all providers, so one call is a vectorized
+selection over a (providers x steps) array. Fixed fees break that property,
+so every combination of fee-paying variants (a handful) is solved separately
+and the best kept.
+"""
+import itertools
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+OutputFn = Callable[[np.ndarray], np.ndarray]  # ADA amounts -> USD received (before fixed fees)
+
+
+class CostCurve:
+    """One way to use a provider: its output curve, fixed fee and duration."""
+
+    def __init__(self, provider: str, output_usd: OutputFn, fixed_fee_usd: float = 0.0,
+                 time_hours: float = 0.0, slices: int = 1):
+        self.provider = provider
+        self.output_usd = output_usd
+        self.fixed_fee_usd = fixed_fee_usd
+        self.time_hours = time_hours
+        self.slices = slices
+
+    def sliced(self, slices: int, slice_interval_hours: float) -> "CostCurve":
+        """The same swap split into equal orders executed one after another."""
+        return CostCurve(
+            self.provider,
+            lambda x: slices * self.output_usd(x / slices),
+            fixed_fee_usd=self.fixed_fee_usd * slices,
+            time_hours=self.time_hours + (slices - 1) * slice_interval_hours,
+            slices=slices,
+        )
+
+
+def _solve(curves: List[CostCurve], amount: float, steps: int) -> Dict:
+    grid = np.linspace(0.0, amount, steps + 1)
+    outputs = np.stack([np.nan_to_num(c.output_usd(grid), nan=0.0) for c in curves])
+    outputs[:, 0] = 0.0
+    # Enforce diminishing returns so a chunk count always maps to a prefix
+    gains = np.minimum.accumulate(np.diff(outputs, axis=1), axis=1)
+
+    flat = gains.ravel()
+    chosen = np.argpartition(-flat, steps - 1)[:steps]
+    counts = np.bincount(chosen // steps, minlength=len(curves))
+
+    received = outputs[np.arange(len(curves)), counts]
+    fees = np.where(counts > 0, [c.fixed_fee_usd for c in curves], 0.0)
+    return {"counts": counts, "received": received - fees, "total": float((received - fees).sum()), "grid": grid}
+
+
+def optimize(options: Dict[str, List[CostCurve]], amount: float, steps: int = 200) -> Optional[Dict]:
+    """
+    `options` maps each provider to its alternative curves (e.g. a DEX swap in
+    1, 2, 4 or 8 slices). Returns the best allocation as
+    {"total": usd, "legs": [{"curve", "amount", "received"}, ...]}.
+    """
+    if amount <= 0 or not options:
+        return None
+    # Providers with fixed fees may also be left out entirely
+    choices = [
+        curves + ([None] if any(c.fixed_fee_usd for c in curves) else [])
+        for curves in options.values()
+    ]
+    best = None
+    for combo in itertools.product(*choices):
+        curves = [c for c in combo if c is not None]
+        if not curves:
+            continue
+        solution = _solve(curves, amount, steps)
+        if best is None or solution["total"] > best[1]["total"]:
+            best = (curves, solution)
+
+    curves, solution = best
+    step = amount / steps
+    legs = [
+        {"curve": c, "amount": float(n * step), "received": float(r)}
+        for c, n, r in zip(curves, solution["counts"], solution["received"]) if n > 0
+    ]
+    return {"total": solution["total"], "legs": legs}
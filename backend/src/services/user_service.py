@@ -1,26 +1,37 @@
+import asyncio
 import json
 import os
 import uuid
 import ast
-from typing import List, Optional
+import heapq
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 from src.models.schemas import User, Payee, PayeeCreate
-from src.core.llm_factory import LLMFactory
-import httpx 
+from src.core.llm_scheduler import Priority
+from src.core.settings import settings
+from src.core.tracing import span, traced
 from thefuzz import fuzz
 
-DATA_FILE = "src/data/users.json"
+DATA_FILE = settings.USERS_DATA_FILE
+READ_CHUNK_SIZE = 64 * 1024
 
 class UserService:
     """
     User operation in our platform
     """
-    BASE_URL = "https://agg-api.minswap.org/aggregator/"
-
     def __init__(self):
-        self.llm = LLMFactory.create_llm()
+        self._llm = None
         self._ensure_data_file()
 
+    @property
+    def llm(self):
+        """Built on first tag generation; importing crewai is slow."""
+        if self._llm is None:
+            from src.core.llm_factory import LLMFactory
+            # Tag generation is bulk work; it must never starve live chats
+            self._llm = LLMFactory.create_llm(Priority.BULK).with_call_site("payee_tags")
+        return self._llm
+
     def _ensure_data_file(self):
         """Ensures the local JSON storage exists and has a default admin user."""
         os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
@@ -43,20 +54,91 @@ class UserService:
         if not os.path.exists(DATA_FILE):
             return []
         try:
-            with open(DATA_FILE, 'r') as f:
+            with span("users_json.read"), open(DATA_FILE, 'r') as f:
                 return json.load(f)
         except json.JSONDecodeError:
             return []
 
     def _save_users(self, users: List[dict]):
         """Persists the user list (and their payees) to the JSON file."""
-        with open(DATA_FILE, 'w') as f:
+        with span("users_json.write"), open(DATA_FILE, 'w') as f:
             json.dump(users, f, indent=4, default=str)
 
+    def data_version(self) -> str:
+        """Changes whenever users.json is rewritten (used for HTTP ETags)."""
+        try:
+            st = os.stat(DATA_FILE)
+        except FileNotFoundError:
+            return "missing"
+        return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
     def get_all(self) -> List[User]:
         users = self._load_users()
         return [User(**u) for u in users]
 
+    def get_all_records(self) -> List[dict]:
+        """Users as stored, without building models (for the fast serialization path)."""
+        return self._load_users()
+
+    def get_payee_records(self, user_id: int) -> List[dict]:
+        user = next((u for u in self.iter_records() if u["id"] == user_id), None)
+        return (user or {}).get("payees") or []
+
+    def iter_records(self) -> Iterator[dict]:
+        """
+        Users one at a time, parsed incrementally from the users.json array, so
+        only one record (plus a read chunk) is in memory at once.
+        """
+        if not os.path.exists(DATA_FILE):
+            return
+        decoder = json.JSONDecoder()
+        with span("users_json.stream"), open(DATA_FILE, 'r') as f:
+            buffer, pos, eof, started = "", 0, False, False
+            while True:
+                # Skip the array syntax between records
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,[":
+                    started = started or buffer[pos] == "["
+                    pos += 1
+                if pos < len(buffer) and buffer[pos] == "]" and started:
+                    return
+                try:
+                    if pos >= len(buffer):
+                        raise json.JSONDecodeError("need more data", buffer, pos)
+                    record, pos = decoder.raw_decode(buffer, pos)
+                    yield record
+                except json.JSONDecodeError:
+                    if eof:
+                        return  # truncated or malformed file: stop, like _load_users
+                    chunk = f.read(READ_CHUNK_SIZE)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+
+    def page_users(self, after_id: Optional[int], limit: int) -> Tuple[List[dict], bool]:
+        """
+        The `limit` users with the smallest ids greater than `after_id`, in id
+        order, and whether more follow. Holds at most `limit + 1` records.
+        """
+        heap: List[tuple] = []  # max-heap on id: (-id, -seq, record)
+        for seq, record in enumerate(self.iter_records()):
+            if after_id is not None and record["id"] <= after_id:
+                continue
+            item = (-record["id"], -seq, record)
+            if len(heap) <= limit:
+                heapq.heappush(heap, item)
+            elif item[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, item)
+        page = [record for _, _, record in sorted(heap, key=lambda i: i[:2], reverse=True)]
+        return page[:limit], len(page) > limit
+
+    def page_payees(self, user_id: int, after: Optional[Tuple[str, str]], limit: int) -> Tuple[List[dict], bool]:
+        """A user's payees ordered by (created_at, id), after the `after` key."""
+        def key(p: dict) -> Tuple[str, str]:
+            return p.get("created_at") or "", p.get("id") or ""
+
+        payees = (p for p in self.get_payee_records(user_id) if after is None or key(p) > tuple(after))
+        page = heapq.nsmallest(limit + 1, payees, key=key)
+        return page[:limit], len(page) > limit
+
     def get_by_id(self, user_id: int) -> Optional[User]:
         users = self._load_users()
         user = next((u for u in users if u["id"] == user_id), None)
@@ -69,6 +151,7 @@ class UserService:
 
     # --- Payee Logic ---
 
+    @traced("users.generate_tags")
     def generate_tags(self, description: str) -> List[str]:
         """
         AI Helper: Reads a description and returns a list of semantic tags.
@@ -140,6 +223,7 @@ class UserService:
         return Payee(**new_payee)
     
 
+    @traced("users.search_payees")
     def search_payees(self, user_id: int, query: str) -> List[Payee]:
         """
         Search a user's payee list by Name or Tags using fuzzy matching.
@@ -175,6 +259,10 @@ class UserService:
         return [payee for payee, score in sorted_results]
     
 
+    async def search_payees_async(self, user_id: int, query: str) -> List[Payee]:
+        """`search_payees` off the event loop (file read and fuzzy matching)."""
+        return await asyncio.to_thread(self.search_payees, user_id, query)
+
     def get_payees(self, user_id: int) -> List[Payee]:
         """
         Get all payees for a user.
@@ -196,12 +284,5 @@ class UserService:
         """
         Query wallet balances and token information.
         """
-        url = f"{self.BASE_URL}wallet"
-        payload = {
-            "wallet": wallet_address,
-            "amount_in_decimal": amount_in_decimal
-        }
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            return response.json()
\ No newline at end of file
+        from src.dependencies import get_wallet_service  # dependencies imports this module
+        return await get_wallet_service().get_balance(wallet_address, amount_in_decimal)
@@ -0,0 +1,115 @@
+"""
+Wallet Balances
+Balances from the Minswap aggregator's /wallet endpoint. Client connections
+are pooled per event loop, successful lookups are cached per address for
+WALLET_BALANCE_TTL_SECONDS, and concurrent lookups of the same address share
+one upstream call. Batches are fetched concurrently, at most
+WALLET_MAX_CONCURRENCY calls at a time.
+"""
+import asyncio
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple
+
+import httpx
+
+from src.core.metrics import track_upstream
+from src.core.settings import settings
+from src.core.tracing import traced
+from src.models.schemas import WalletBalanceItem
+
+CACHE_MAX_ENTRIES = 2048
+
+
+class WalletService:
+    BASE_URL = settings.MINSWAP_AGGREGATOR_URL
+
+    def __init__(self):
+        self._cache: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Per event loop: pooled client, concurrency cap, in-flight fetches
+        self._loop_state: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = weakref.WeakKeyDictionary()
+
+    def _state(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore, Dict[Hashable, asyncio.Task]]:
+        loop = asyncio.get_running_loop()
+        state = self._loop_state.get(loop)
+        if state is None:
+            client = httpx.AsyncClient(
+                timeout=settings.WALLET_TIMEOUT_SECONDS,
+                limits=httpx.Limits(max_connections=settings.WALLET_MAX_CONCURRENCY,
+                                    max_keepalive_connections=settings.WALLET_MAX_CONCURRENCY),
+            )
+            state = self._loop_state[loop] = (client, asyncio.Semaphore(settings.WALLET_MAX_CONCURRENCY), {})
+        return state
+
+    # --- Cache ---
+
+    def _cached(self, key: Hashable):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def _store(self, key: Hashable, balance: Dict[str, Any]):
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + settings.WALLET_BALANCE_TTL_SECONDS, balance)
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._cache.clear()
+
+    # --- Lookups ---
+
+    async def _fetch(self, key: Tuple[str, bool]) -> Dict[str, Any]:
+        client, semaphore, _ = self._state()
+        wallet, amount_in_decimal = key
+        async with semaphore:
+            with track_upstream("minswap", "wallet"):
+                response = await client.post(
+                    f"{self.BASE_URL}/wallet",
+                    json={"wallet": wallet, "amount_in_decimal": amount_in_decimal},
+                )
+                response.raise_for_status()
+        balance = response.json()
+        if settings.WALLET_BALANCE_TTL_SECONDS > 0:
+            self._store(key, balance)
+        return balance
+
+    async def get_balance(self, wallet_address: str, amount_in_decimal: bool = True) -> Dict[str, Any]:
+        """Balances and tokens held by `wallet_address`. Raises on upstream errors."""
+        key = (wallet_address, amount_in_decimal)
+        balance = self._cached(key)
+        if balance is not None:
+            return balance
+
+        inflight = self._state()[2]
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = asyncio.ensure_future(self._fetch(key))
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # Shielded: one caller going away doesn't cancel the fetch the others wait on
+        return await asyncio.shield(task)
+
+    @traced("wallet.get_balances")
+    async def get_balances(self, wallet_addresses: List[str], amount_in_decimal: bool = True) -> List[WalletBalanceItem]:
+        """One item per address, in order; a failed lookup only fails its own item."""
+
+        async def lookup(wallet: str) -> WalletBalanceItem:
+            try:
+                return WalletBalanceItem(wallet=wallet, balance=await self.get_balance(wallet, amount_in_decimal))
+            except Exception as e:
+                return WalletBalanceItem(wallet=wallet, error=str(e) or type(e).__name__)
+
+        return list(await asyncio.gather(*(lookup(w) for w in wallet_addresses)))
+
+    async def aclose(self):
+        """Closes the pooled client of the running loop (app shutdown)."""
+        state = self._loop_state.pop(asyncio.get_running_loop(), None)
+        if state is not None:
+            await state[0].aclose()
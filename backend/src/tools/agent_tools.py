@@ -1,13 +1,77 @@
+import asyncio
+import threading
 from crewai.tools import tool
-from src.dependencies import get_user_service, get_dex_service
+from src.dependencies import get_user_service, get_dex_service, get_cross_rate_service, get_rater_service
+from src.tools.tool_cache import memoize
+from src.tools.tool_format import tool_format
+
+# Crews run synchronously, so the async tool implementations are driven on one
+# long-lived event loop in a helper thread. A single loop keeps per-loop service
+# state (rater semaphores and caches) between calls, and the caller's context
+# (request trace, stale-data tracking) carries over to the coroutine.
+_tool_loop = None
+_tool_loop_lock = threading.Lock()
+
+
+def _run_async(coro):
+    global _tool_loop
+    with _tool_loop_lock:
+        if _tool_loop is None:
+            _tool_loop = asyncio.new_event_loop()
+            threading.Thread(target=_tool_loop.run_forever, name="agent-tools", daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coro, _tool_loop).result()
+
+
+class AsyncRemitTools:
+    """Async implementations of the remit tools, backed by the async service layer."""
+
+    @staticmethod
+    async def search_my_payees(query: str, user_id: int) -> str:
+        try:
+            # We explicitly pass the user_id here. The agent will get this from its task context.
+            payees = await get_user_service().search_payees_async(user_id, query)
+        except Exception as e:
+            return f"An error occurred while searching for payees: {e}"
+        return tool_format().payees(query, payees)
+
+    @staticmethod
+    async def get_ada_to_stable_rate(pair: str = "ADA/iUSD") -> str:
+        rate = await get_dex_service().get_market_rate_async()
+        return tool_format().dex_rate(pair, rate)
+
+    @staticmethod
+    async def get_corridor_rate(from_currency: str, to_currency: str) -> str:
+        cross_rates = get_cross_rate_service()
+        await cross_rates.ensure_fresh_async()
+        return tool_format().corridor_rate(from_currency, to_currency, cross_rates.get_rate(from_currency, to_currency))
+
+    @staticmethod
+    async def plan_split_remittance(amount_ada: float) -> str:
+        try:
+            plan = await get_rater_service().plan_split_order(amount_ada)
+        except Exception as e:
+            return f"Could not plan a split for {amount_ada} ADA: {e}"
+        return tool_format().split_plan(amount_ada, plan)
+
+    @staticmethod
+    async def swap_ada_to_stable(amount_ada: float) -> str:
+        quote = await get_dex_service().get_ada_to_stable_quote_async(amount_ada)
+        return tool_format().quote(amount_ada, quote)
+
+    @staticmethod
+    async def prepare_transfer(query: str, user_id: int, amount_ada: float) -> str:
+        # Independent lookups: resolve the recipient while the quote is fetched
+        payees, quote = await asyncio.gather(
+            AsyncRemitTools.search_my_payees(query, user_id),
+            AsyncRemitTools.swap_ada_to_stable(amount_ada),
+        )
+        return f"{payees}\n{quote}"
 
-# We get the service instances once to be used by the tool functions
-_user_service = get_user_service()
-_dex_service = get_dex_service()
 
 class RemitTools:
 
     @tool("Search My Payees")
+    @memoize(unless=("An error occurred",))
     def search_my_payees(query: str, user_id: int) -> str:
         """
         CRITICAL: Use this tool to find one of your saved personal contacts.
@@ -19,43 +83,57 @@ class RemitTools:
         Args:
             query (str): The search term for the payee (e.g., 'sister', 'rent', 'Dipisha').
             user_id (int): The ID of the current user running the search.
+
+        Each match is one line: `#id name | tags | country/currency | wallet`.
+        Refer to a payee by its `#id` in your answer. The wallet is the full
+        destination address; copy it exactly when preparing a transfer.
         """
-        try:
-            # We explicitly pass the user_id here. The agent will get this from its task context.
-            payees = _user_service.search_payees(user_id, query)
-            if not payees:
-                return f"No payee found matching '{query}'. Please check the name or tag."
-            # Return a formatted string for the agent to easily understand.
-            return f"Found payees: {[p.model_dump_json() for p in payees]}"
-        except Exception as e:
-            return f"An error occurred while searching for payees: {e}"
+        return _run_async(AsyncRemitTools.search_my_payees(query, user_id))
 
     @tool("Get Real DEX Rate")
+    @memoize(shared=True)
     def get_ada_to_stable_rate(pair: str = "ADA/iUSD") -> str:
         """
         Fetches the REAL-TIME exchange rate from ADA to iUSD from a Decentralized Exchange (DEX).
         This tells you the current market price for 1 ADA.
         """
-        rate = _dex_service.get_market_rate()
-        return f"The current rate for {pair} is {rate} based on live DEX data."
+        return _run_async(AsyncRemitTools.get_ada_to_stable_rate(pair))
+
+    @tool("Get Corridor Exchange Rate")
+    @memoize(shared=True, unless=("No rate is available",))
+    def get_corridor_rate(from_currency: str, to_currency: str) -> str:
+        """
+        Returns the live implied exchange rate between two currencies (e.g. 'USD' to 'PHP',
+        or 'ADA' to 'INR'), derived from current ADA market prices.
+        """
+        return _run_async(AsyncRemitTools.get_corridor_rate(from_currency, to_currency))
+
+    @tool("Plan Split Remittance")
+    @memoize(shared=True, unless=("Could not plan",))
+    def plan_split_remittance(amount_ada: float) -> str:
+        """
+        For LARGE amounts: plans how to split a remittance of `amount_ada` ADA across providers
+        (DEX, exchange, bank, card) and across several smaller DEX orders to reduce price impact,
+        and compares it with sending everything through the single best provider.
+        """
+        return _run_async(AsyncRemitTools.plan_split_remittance(amount_ada))
 
     @tool("Swap ADA to Stablecoin")
+    @memoize(shared=True, unless=("Error getting quote",))
     def swap_ada_to_stable(amount_ada: float) -> str:
         """
         Calculates a specific swap quote from ADA to iUSD using a Decentralized Exchange (DEX).
         Use this to find out exactly how much Stablecoin the user will receive for a specific amount of ADA.
         """
-        quote = _dex_service.get_ada_to_stable_quote(amount_ada)
-        
-        if quote.get("success"):
-            return (
-                f"Quote successful: For {quote['input_ada']} ADA, you will receive an estimated "
-                f"{quote['estimated_iusd']:.6f} iUSD. The minimum you are guaranteed to receive is "
-                f"{quote['minimum_iusd']:.6f} iUSD. This transaction will be routed through the following protocols: "
-                f"{quote['protocols_used']}."
-            )
-        else:
-            return (
-                f"Error getting quote: {quote.get('error')}. A fallback estimate suggests you would get "
-                f"around {amount_ada * quote.get('fallback_rate')} iUSD."
-            )
\ No newline at end of file
+        return _run_async(AsyncRemitTools.swap_ada_to_stable(amount_ada))
+
+    @tool("Prepare Transfer")
+    @memoize(unless=("An error occurred", "Error getting quote"))
+    def prepare_transfer(query: str, user_id: int, amount_ada: float) -> str:
+        """
+        Use this when you know BOTH the recipient and the amount: finds the saved payee
+        matching `query` (e.g. 'sister', 'rent') for the user `user_id` AND gets the swap
+        quote for `amount_ada` ADA to iUSD at the same time. Faster than calling
+        Search My Payees and Swap ADA to Stablecoin one after the other.
+        """
+        return _run_async(AsyncRemitTools.prepare_transfer(query, user_id, amount_ada))
@@ -3,67 +3,183 @@ Market Data Service (The Truth Source)
 Fetches real-time crypto and fiat exchange rates.
 """
 
-import requests
+import asyncio
+import threading
 import time
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
+
+import httpx
+import requests
+from loguru import logger
+
+from src.core.constant import current_support_for_ada_conversation
+from src.core.settings import settings
+from src.core.metrics import track_upstream
+from src.services.market_snapshot import market_snapshot
+from src.services.last_known_good import last_known_good
+
+# Cache lookup result for a currency CoinGecko didn't price in a fresh fetch
+_MISSING = object()
+
 
 class MarketDataService:
     def __init__(self):
-        self.base_url = "https://api.coingecko.com/api/v3"
-        # Simple cache: { "currency_pair": { "rate": 1.23, "timestamp": 1234567890 } }
-        self._cache = {}
+        self.base_url = settings.COINGECKO_API_URL
+        # One snapshot of every supported fiat price: { "usd": 0.35, "php": 20.5, ... }
+        # Replaced as a whole on refresh, so readers never see a half-filled cache.
+        self._prices: Dict[str, float] = {}
+        self._volume_usd: Optional[float] = None  # ADA 24h traded volume, in USD
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()  # one sync fetch at a time
+        self._async_fetch: Optional[asyncio.Future] = None
         self.CACHE_DURATION = 60  # Cache rates for 60 seconds
 
+    # --- Bulk fetch ---
+
+    def _params(self) -> Dict[str, str]:
+        return {
+            "ids": "cardano",
+            "vs_currencies": ",".join(current_support_for_ada_conversation),
+            "include_24hr_vol": "true",
+        }
+
+    def _store(self, data: Dict) -> Dict[str, float]:
+        values = data.get("cardano") or {}
+        prices = {k: float(v) for k, v in values.items() if v is not None and not k.endswith("_24h_vol")}
+        if not prices:
+            raise ValueError("CoinGecko returned no prices")
+        volume = values.get("usd_24h_vol")
+        with self._lock:
+            self._prices = prices
+            self._volume_usd = float(volume) if volume is not None else None
+            self._fetched_at = time.time()
+        last_known_good.update_prices(prices, volume)
+        return prices
+
+    def fetch_all_prices(self) -> Dict[str, float]:
+        """Every supported ADA/fiat price in a single CoinGecko call."""
+        logger.info(f"[MarketData] Fetching live ADA rates for {len(current_support_for_ada_conversation)} currencies")
+        with track_upstream("coingecko", "simple_price"):
+            response = requests.get(f"{self.base_url}/simple/price", params=self._params(), timeout=5)
+            response.raise_for_status()
+        return self._store(response.json())
+
+    async def fetch_all_prices_async(self) -> Dict[str, float]:
+        """Async variant of `fetch_all_prices`."""
+        logger.info(f"[MarketData] Fetching live ADA rates for {len(current_support_for_ada_conversation)} currencies")
+        with track_upstream("coingecko", "simple_price"):
+            async with httpx.AsyncClient() as c:
+                response = await c.get(f"{self.base_url}/simple/price", params=self._params(), timeout=5.0)
+            response.raise_for_status()
+        return self._store(response.json())
+
+    # --- Lookups ---
+
+    def _cached(self, target: str) -> Union[float, None, object]:
+        """None if the cache is stale, `_MISSING` if it is fresh but has no `target` price."""
+        with self._lock:
+            if time.time() - self._fetched_at >= self.CACHE_DURATION:
+                return None
+            return self._prices.get(target, _MISSING)
+
+    def _cached_or_shared(self, target: str) -> Union[float, None, object]:
+        # Host-wide snapshot (kept fresh by one refresher per host), then our own cache
+        shared = market_snapshot.get_ada_price(target)
+        return shared if shared is not None else self._cached(target)
+
     def get_ada_price(self, target_currency: str = "usd") -> float:
         """
         Get the current price of Cardano (ADA) in the target fiat currency.
         """
         target = target_currency.lower()
-        cache_key = f"ada_{target}"
+        rate = self._cached_or_shared(target)
+        if rate is _MISSING:
+            return self._get_fallback_rate(target)  # refetching won't add the currency
+        if rate is not None:
+            return rate
+
+        rate = self._warm_start_rate(target)
+        if rate is not None:
+            if self._fetch_lock.acquire(blocking=False):
+                threading.Thread(target=self._refresh_in_background, daemon=True).start()
+            return rate
 
-        # Check Cache
-        if self._is_cache_valid(cache_key):
-            print(f"[MarketData] Returning cached rate for {cache_key}")
-            return self._cache[cache_key]["rate"]
+        with self._fetch_lock:
+            # Another thread may have refreshed while we waited
+            rate = self._cached(target)
+            if rate is _MISSING:
+                return self._get_fallback_rate(target)
+            if rate is not None:
+                return rate
+            try:
+                rate = self.fetch_all_prices().get(target)
+            except Exception as e:
+                logger.warning(f"[MarketData] Error fetching rates: {e}")
+        # Fallback logic if API fails (Crucial for reliability)
+        return rate if rate is not None else self._get_fallback_rate(target)
 
-        try:
-            # Fetch from CoinGecko
-            print(f"[MarketData] Fetching live rate for ADA/{target.upper()}...")
-            url = f"{self.base_url}/simple/price"
-            params = {
-                "ids": "cardano",
-                "vs_currencies": target
-            }
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
-            
-            data = response.json()
-            rate = data.get("cardano", {}).get(target)
-            
-            if not rate:
-                raise ValueError(f"Rate not found for {target}")
-
-            # Update Cache
-            self._cache[cache_key] = {
-                "rate": rate,
-                "timestamp": time.time()
-            }
-            
+    async def get_ada_price_async(self, target_currency: str = "usd") -> float:
+        """Async variant of `get_ada_price`; concurrent misses share one fetch."""
+        target = target_currency.lower()
+        rate = self._cached_or_shared(target)
+        if rate is _MISSING:
+            return self._get_fallback_rate(target)  # refetching won't add the currency
+        if rate is not None:
             return rate
 
+        fetch = self._async_fetch
+        if fetch is None or fetch.done() or fetch.get_loop() is not asyncio.get_running_loop():
+            self._async_fetch = asyncio.ensure_future(self.fetch_all_prices_async())
+            self._async_fetch.add_done_callback(lambda f: f.cancelled() or f.exception())  # don't warn if unawaited
+
+        rate = self._warm_start_rate(target)
+        if rate is not None:
+            return rate  # the fetch above finishes in the background
+        try:
+            rate = (await asyncio.shield(self._async_fetch)).get(target)
         except Exception as e:
-            print(f"[MarketData] Error fetching rate: {e}")
-            # Fallback logic if API fails (Crucial for reliability)
-            return self._get_fallback_rate(target)
+            logger.warning(f"[MarketData] Error fetching rates: {e}")
+        return rate if rate is not None else self._get_fallback_rate(target)
+
+    def _warm_start_rate(self, target: str) -> Optional[float]:
+        """Recent last-known-good price, until this process has fetched live once."""
+        if not last_known_good.warming("coingecko"):
+            return None
+        return last_known_good.get_ada_price(target, max_age=settings.MARKET_LKG_SERVE_MAX_AGE_SECONDS)
+
+    def _refresh_in_background(self):
+        """Runs in a thread holding `_fetch_lock`."""
+        try:
+            self.fetch_all_prices()
+        except Exception as e:
+            logger.warning(f"[MarketData] Background refresh failed: {e}")
+        finally:
+            self._fetch_lock.release()
+
+    def get_all_prices(self) -> Dict[str, float]:
+        """Every cached price (shared snapshot first); may be empty."""
+        shared = market_snapshot.get_all_ada_prices()
+        if shared:
+            return shared
+        with self._lock:
+            if time.time() - self._fetched_at < self.CACHE_DURATION:
+                return dict(self._prices)
+        return {}
 
-    def _is_cache_valid(self, key: str) -> bool:
-        if key not in self._cache:
-            return False
-        age = time.time() - self._cache[key]["timestamp"]
-        return age < self.CACHE_DURATION
+    def get_volume_usd(self) -> Optional[float]:
+        """ADA's 24h traded volume in USD, if known."""
+        shared = market_snapshot.get_ada_volume_usd()
+        if shared is not None:
+            return shared
+        with self._lock:
+            return self._volume_usd
 
     def _get_fallback_rate(self, currency: str) -> float:
-        """Static fallbacks so the app never crashes during a demo"""
+        """Last known good price, else static fallbacks so the app never crashes during a demo"""
+        last_good = last_known_good.get_ada_price(currency)
+        if last_good is not None:
+            return last_good
         fallbacks = {
             "usd": 0.35,
             "php": 20.50,
@@ -75,4 +191,4 @@ class MarketDataService:
         return fallbacks.get(currency, 1.0)
 
 # Singleton instance
-market_data = MarketDataService()
\ No newline at end of file
+market_data = MarketDataService()
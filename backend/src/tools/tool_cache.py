@@ -0,0 +1,135 @@
+"""
+Agent Tool Memoization
+Within one crew run, an identical tool call (same tool, same arguments) is
+answered from the run's memo instead of going upstream again. Market quotes are
+also shared across runs for AGENT_TOOL_CACHE_TTL_SECONDS.
+
+Each call is recorded on the request trace as a `tool.<name>` span (or
+`tool.<name>.hit` when it came from a memo), and each run logs a summary.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Hashable, Optional, Tuple
+
+from loguru import logger
+
+from src.core.settings import settings
+from src.core.tracing import current_trace
+
+SHARED_MAX_ENTRIES = 256
+
+
+class ToolRun:
+    """Memo and per-tool stats for one crew run."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.memo: Dict[Hashable, str] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}  # tool -> calls, hits, duration_ms
+
+    def record(self, tool: str, hit: bool, duration: float):
+        entry = self.stats.setdefault(tool, {"calls": 0, "hits": 0, "duration_ms": 0.0})
+        entry["calls"] += 1
+        entry["hits"] += int(hit)
+        entry["duration_ms"] += duration * 1000
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{tool} {int(s['calls'])} calls/{int(s['hits'])} hits/{s['duration_ms']:.0f}ms"
+            for tool, s in self.stats.items()
+        ) or "no tool calls"
+
+
+_current_run: ContextVar[Optional[ToolRun]] = ContextVar("tool_run", default=None)
+
+# Cross-run results: key -> (expires_at, result)
+_shared: "OrderedDict[Hashable, Tuple[float, str]]" = OrderedDict()
+_shared_lock = threading.Lock()
+
+
+@contextmanager
+def tool_run(name: str):
+    """Scopes tool memoization to one crew run (tools called outside one only use the shared cache)."""
+    run = ToolRun(name)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        logger.info(f"[Tools] {name}: {run.summary()}")
+
+
+def _shared_get(key: Hashable) -> Optional[str]:
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _shared[key]
+            return None
+        return entry[1]
+
+
+def _shared_put(key: Hashable, result: str, ttl: float):
+    with _shared_lock:
+        _shared[key] = (time.monotonic() + ttl, result)
+        _shared.move_to_end(key)
+        while len(_shared) > SHARED_MAX_ENTRIES:
+            _shared.popitem(last=False)
+
+
+def clear_shared():
+    with _shared_lock:
+        _shared.clear()
+
+
+def memoize(shared: bool = False, unless: Tuple[str, ...] = ()):
+    """
+    Applied beneath `@tool`. `shared` results are also reused across runs for
+    AGENT_TOOL_CACHE_TTL_SECONDS. Results containing one of `unless` (error
+    messages) are never memoized, so the agent can retry.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        name = func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name, tuple(sorted(bound.arguments.items())))
+            run = _current_run.get()
+            ttl = settings.AGENT_TOOL_CACHE_TTL_SECONDS if shared else 0.0
+
+            start = time.perf_counter()
+            result = run.memo.get(key) if run is not None else None
+            if result is None and ttl > 0:
+                result = _shared_get(key)
+            hit = result is not None
+            if not hit:
+                result = func(*args, **kwargs)
+                if not any(marker in str(result) for marker in unless):
+                    if run is not None:
+                        run.memo[key] = result
+                    if ttl > 0:
+                        _shared_put(key, result, ttl)
+            elif run is not None:
+                run.memo.setdefault(key, result)
+            duration = time.perf_counter() - start
+
+            if run is not None:
+                run.record(name, hit, duration)
+            trace = current_trace()
+            if trace is not None:
+                trace.add(f"tool.{name}.hit" if hit else f"tool.{name}", start, duration)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,116 @@
+"""
+Agent Tool Output Formats
+What the remit tools return is fed back into the LLM context on every later
+step of the run, so its size is prompt tokens paid again and again.
+
+`compact` (the default, AGENT_TOOL_OUTPUT) keeps only what the agent needs.
+Payees are capped at AGENT_TOOL_TOP_K matches and referred to by their id
+(`#de7e9967`, stable across calls). Their wallet address is always kept in
+full: it is the payment destination and must be copied exactly.
+`verbose` is the original full-JSON output. `benchmarks/tool_tokens.py`
+compares the two.
+
+Error results start with the same text in both formats (tool memoization
+relies on it).
+"""
+from typing import List, Optional
+
+from src.core.settings import settings
+from src.models.schemas import Payee, SplitOrderPlan
+
+
+class VerboseFormat:
+    """The original tool outputs: full sentences and full payee JSON."""
+
+    def payees(self, query: str, payees: List[Payee]) -> str:
+        if not payees:
+            return f"No payee found matching '{query}'. Please check the name or tag."
+        # Return a formatted string for the agent to easily understand.
+        return f"Found payees: {[p.model_dump_json() for p in payees]}"
+
+    def quote(self, amount_ada: float, quote: dict) -> str:
+        if quote.get("success"):
+            return (
+                f"Quote successful: For {quote['input_ada']} ADA, you will receive an estimated "
+                f"{quote['estimated_iusd']:.6f} iUSD. The minimum you are guaranteed to receive is "
+                f"{quote['minimum_iusd']:.6f} iUSD. This transaction will be routed through the following protocols: "
+                f"{quote['protocols_used']}."
+            )
+        return (
+            f"Error getting quote: {quote.get('error')}. A fallback estimate suggests you would get "
+            f"around {amount_ada * quote.get('fallback_rate')} iUSD."
+        )
+
+    def dex_rate(self, pair: str, rate: float) -> str:
+        return f"The current rate for {pair} is {rate} based on live DEX data."
+
+    def corridor_rate(self, from_currency: str, to_currency: str, rate: Optional[float]) -> str:
+        if rate is None:
+            return f"No rate is available for {from_currency.upper()} to {to_currency.upper()}."
+        return f"1 {from_currency.upper()} = {rate:.6g} {to_currency.upper()} at current market prices."
+
+    def split_plan(self, amount_ada: float, plan: SplitOrderPlan) -> str:
+        legs = "; ".join(
+            f"{leg.amount_ada:.2f} ADA via {leg.provider}"
+            + (f" in {leg.slices} orders" if leg.slices > 1 else "")
+            + f" -> ~{leg.expected_output_usd:.2f} USD"
+            for leg in plan.legs
+        )
+        return (
+            f"Split plan for {amount_ada} ADA: {legs}. Total expected: {plan.expected_output_usd:.2f} USD, "
+            f"vs {plan.best_single_output_usd:.2f} USD using only {plan.best_single_provider} "
+            f"(saves {plan.savings_usd:.2f} USD)."
+        )
+
+
+class CompactFormat(VerboseFormat):
+    """Only the fields the agent reasons about; one short line per item."""
+
+    def __init__(self, top_k: Optional[int] = None):
+        self.top_k = top_k
+
+    def payees(self, query: str, payees: List[Payee]) -> str:
+        if not payees:
+            return f"No payee found matching '{query}'. Please check the name or tag."
+        top_k = self.top_k or settings.AGENT_TOOL_TOP_K
+        lines = [
+            f"#{p.id} {p.name} | {','.join(p.tags) or '-'} | {p.country}/{p.currency} | {p.wallet_address}"
+            for p in payees[:top_k]
+        ]
+        more = f" (best {top_k} of {len(payees)})" if len(payees) > top_k else ""
+        return f"Payees matching '{query}'{more}:\n" + "\n".join(lines)
+
+    def quote(self, amount_ada: float, quote: dict) -> str:
+        if not quote.get("success"):
+            return f"Error getting quote: {quote.get('error')}. Fallback ~{amount_ada * quote.get('fallback_rate'):.6g} iUSD."
+        via = ",".join(quote.get("protocols_used") or []) or "DEX"
+        stale = "; stale" if quote.get("stale") else ""
+        return (
+            f"{quote['input_ada']:g} ADA -> {quote['estimated_iusd']:.6g} iUSD "
+            f"(min {quote['minimum_iusd']:.6g}; impact {quote.get('price_impact_percent', 0):g}%; via {via}{stale})"
+        )
+
+    def dex_rate(self, pair: str, rate: float) -> str:
+        return f"{pair} {rate:.6g} (live DEX)"
+
+    def corridor_rate(self, from_currency: str, to_currency: str, rate: Optional[float]) -> str:
+        if rate is None:
+            return super().corridor_rate(from_currency, to_currency, rate)
+        return f"1 {from_currency.upper()} = {rate:.6g} {to_currency.upper()}"
+
+    def split_plan(self, amount_ada: float, plan: SplitOrderPlan) -> str:
+        legs = "; ".join(
+            f"{leg.amount_ada:.2f} via {leg.provider}" + (f" x{leg.slices}" if leg.slices > 1 else "")
+            for leg in plan.legs
+        )
+        return (
+            f"Split {amount_ada:g} ADA: {legs} -> {plan.expected_output_usd:.2f} USD "
+            f"(single {plan.best_single_provider} {plan.best_single_output_usd:.2f}; saves {plan.savings_usd:.2f})"
+        )
+
+
+FORMATS = {"compact": CompactFormat(), "verbose": VerboseFormat()}
+
+
+def tool_format():
+    return FORMATS.get(settings.AGENT_TOOL_OUTPUT, FORMATS["compact"])
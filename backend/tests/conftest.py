@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+# Settings without defaults; tests never talk to the real services.
+for key in [
+    "CARDANO_BLOCKFROST_API_KEY", "BLOCKFROST_API_KEY_PREPROD", "MASUMI_API_KEY",
+    "MASUMI_PAYMENT_SERVICE_URL", "MASUMI_REGISTRY_SERVICE_URL", "ENCRYPTION_KEY", "ADMIN_KEY",
+    "AGENT_WALLET_ADDRESS", "AGENT_WALLET_SIGNING_KEY", "SELLER_VKEY", "PAYMENT_SERVICE_URL", "PAYMENT_API_KEY",
+]:
+    os.environ.setdefault(key, "test")
+
+# Don't share a market snapshot with a locally running backend
+os.environ.setdefault("MARKET_SNAPSHOT_FILE", "")
+os.environ.setdefault("PRICE_HISTORY_DIR", "")
+os.environ.setdefault("MARKET_LKG_FILE", "")
+
+
+@pytest.fixture(autouse=True)
+def _no_last_known_good():
+    """Market data remembered by one test mustn't stand in for a failed fetch in the next."""
+    from src.services.last_known_good import last_known_good
+    last_known_good.clear()
+    yield
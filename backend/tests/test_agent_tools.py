@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from src.core.tracing import end_trace, span, start_trace
+from src.models.schemas import Payee
+from src.tools import agent_tools
+from src.tools.agent_tools import RemitTools
+
+DELAY = 0.2
+
+
+class SlowUsers:
+    async def search_payees_async(self, user_id, query):
+        with span("users.search_payees"):
+            await asyncio.sleep(DELAY)
+        return [Payee(id="p1", name="Rosa", wallet_address="addr1", country="PH", currency="PHP",
+                      created_at="2025-01-01T00:00:00")]
+
+
+class SlowDex:
+    async def get_ada_to_stable_quote_async(self, amount_ada):
+        await asyncio.sleep(DELAY)
+        return {"success": True, "input_ada": amount_ada, "estimated_iusd": amount_ada * 0.7,
+                "minimum_iusd": amount_ada * 0.69, "protocols_used": []}
+
+
+def test_prepare_transfer_runs_lookups_concurrently(monkeypatch):
+    monkeypatch.setattr(agent_tools, "get_user_service", lambda: SlowUsers())
+    monkeypatch.setattr(agent_tools, "get_dex_service", lambda: SlowDex())
+
+    trace, token = start_trace("chat")
+    try:
+        start = time.perf_counter()
+        result = RemitTools.prepare_transfer.run(query="rosa", user_id=1, amount_ada=100)
+        elapsed = time.perf_counter() - start
+    finally:
+        end_trace(token)
+
+    assert "Rosa" in result and "70 iUSD" in result
+    assert elapsed < DELAY * 1.75
+    # The tool loop runs the coroutines in the caller's context
+    assert "users.search_payees" in [name for name, _, _ in trace.spans]
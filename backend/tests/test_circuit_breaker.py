@@ -0,0 +1,57 @@
+import httpx
+import pytest
+
+from src.core import circuit_breaker as cb
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.metrics import track_upstream
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _fail(upstream, error=TimeoutError("timed out")):
+    with pytest.raises(type(error)):
+        with track_upstream(upstream, "test"):
+            raise error
+
+
+def test_opens_fails_fast_and_recovers_through_a_probe(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cb.time, "monotonic", clock)
+    breaker = CircuitBreaker("binance", failure_threshold=2, reset_timeout=30)
+    monkeypatch.setitem(cb.breakers, "binance", breaker)
+
+    _fail("binance")
+    assert breaker.state == cb.CLOSED
+    _fail("binance")
+    assert breaker.state == cb.OPEN
+    with pytest.raises(CircuitOpenError):
+        with track_upstream("binance", "test"):
+            pytest.fail("must not call an open upstream")
+
+    clock.now += 30
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # only one at a time
+    breaker.record_failure()
+    assert breaker.state == cb.OPEN and breaker.status()["retry_in_s"] == 30
+
+    clock.now += 30
+    with track_upstream("binance", "test"):
+        pass
+    assert breaker.status() == {"state": cb.CLOSED, "consecutive_failures": 0, "retry_in_s": 0.0}
+
+
+def test_client_errors_do_not_trip_the_breaker(monkeypatch):
+    breaker = CircuitBreaker("minswap", failure_threshold=1)
+    monkeypatch.setitem(cb.breakers, "minswap", breaker)
+    request = httpx.Request("POST", "http://minswap/estimate")
+
+    _fail("minswap", httpx.HTTPStatusError("bad", request=request, response=httpx.Response(400, request=request)))
+    assert breaker.state == cb.CLOSED
+    _fail("minswap", httpx.HTTPStatusError("down", request=request, response=httpx.Response(503, request=request)))
+    assert breaker.state == cb.OPEN
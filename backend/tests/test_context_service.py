@@ -0,0 +1,66 @@
+import threading
+import time
+
+from src.core.llm_scheduler import estimate_tokens
+from src.core.settings import settings
+from src.services.context_service import ContextService
+
+BUDGET = settings.HISTORY_TOKEN_BUDGET
+
+
+def _wait_for_summary(service, conversation_id, timeout=5.0):
+    conversation = service._history[conversation_id]
+    deadline = time.monotonic() + timeout
+    while conversation.summarizing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not conversation.summarizing
+
+
+def test_short_conversations_are_kept_verbatim():
+    service = ContextService(summarize=lambda summary, messages: 1 / 0)
+    service.add_message("c1", "user", "Send 100 ADA to my sister")
+    service.add_message("c1", "assistant", "You'd receive about 35 iUSD.")
+    history = service.get_history("c1")
+    assert "USER: Send 100 ADA to my sister" in history and "ASSISTANT: You'd receive" in history
+    assert "SUMMARY" not in history and service.get_history("other") == ""
+
+
+def test_older_turns_fold_into_a_rolling_summary_in_the_background():
+    calls = []
+    release = threading.Event()
+
+    def summarize(summary, messages):
+        release.wait(5)
+        calls.append((summary, [m["content"][:6] for m in messages]))
+        return f"summary#{len(calls)}"
+
+    service = ContextService(summarize=summarize)
+    pasted = "x" * (BUDGET * 8)  # ~2x the token budget in one pasted message
+    service.add_message("c1", "user", "msg-1 " + pasted)
+    service.add_message("c1", "assistant", "msg-2 ok")
+    service.add_message("c1", "user", "msg-3 thanks")
+
+    # The request path neither waits for the summary nor goes over budget
+    assert estimate_tokens(service.get_history("c1")) <= BUDGET
+    release.set()
+    _wait_for_summary(service, "c1")
+    assert calls == [("", ["msg-1 "])]
+
+    for i in range(4, 9):
+        service.add_message("c1", "user", f"msg-{i} " + "y" * (BUDGET // 3 * 4))
+        _wait_for_summary(service, "c1")
+    assert calls[1][0] == "summary#1"  # incremental: the previous summary plus new turns only
+    history = service.get_history("c1")
+    assert history.startswith(f"PREVIOUS CHAT HISTORY:\nSUMMARY OF EARLIER CONVERSATION: summary#{len(calls)}")
+    assert estimate_tokens(history) <= BUDGET
+
+
+def test_summary_falls_back_to_a_truncated_transcript():
+    service = ContextService(summarize=lambda summary, messages: 1 / 0)
+    service.add_message("c1", "user", "Pay rent to Dipisha " + "z" * (BUDGET * 4))
+    service.add_message("c1", "assistant", "Done")
+    service.add_message("c1", "user", "And my sister?")
+    _wait_for_summary(service, "c1")
+    summary = service._history["c1"].summary
+    assert summary.startswith("user: Pay rent to Dipisha")
+    assert estimate_tokens(summary) <= settings.HISTORY_SUMMARY_MAX_TOKENS
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from src.services.cross_rate_service import CrossRateService
+from src.tools.market_data import market_data
+
+
+def test_implied_rates_and_incremental_update():
+    rates = CrossRateService(["ada", "iusd", "usd", "php", "inr"])
+    rates.update_legs({"usd": 0.5, "php": 28.0, "inr": 41.0})
+
+    assert rates.get_rate("USD", "PHP") == pytest.approx(56.0)
+    assert rates.get_rate("php", "usd") == pytest.approx(1 / 56.0)
+    assert rates.get_rate("ada", "inr") == pytest.approx(41.0)
+    assert rates.get_rate("usd", "iusd") is None  # iUSD leg unknown
+    assert rates.get_rate("usd", "xyz") is None
+
+    version = rates.version
+    rates.update_leg("php", 30.0)
+    assert rates.version == version + 1
+    assert rates.get_rate("usd", "php") == pytest.approx(60.0)
+    assert rates.get_rate("php", "inr") == pytest.approx(41.0 / 30.0)
+    assert rates.get_rate("usd", "inr") == pytest.approx(82.0)  # other legs untouched
+
+    rates.update_leg("php", 30.0)
+    assert rates.version == version + 1  # unchanged price is a no-op
+
+
+def test_vectorized_lookup_matches_single_lookups():
+    rates = CrossRateService(["ada", "iusd", "usd", "php", "inr"])
+    rates.update_legs({"usd": 0.5, "php": 28.0, "inr": 41.0, "iusd": 0.49})
+    pairs = [("usd", "php"), ("inr", "usd"), ("iusd", "php"), ("usd", "nope")]
+    assert rates.get_rates(pairs) == [rates.get_rate(a, b) for a, b in pairs]
+
+
+def test_ensure_fresh_refetches_once_the_price_cache_expires(monkeypatch):
+    prices = {"usd": 0.4, "php": 23.0}
+    fetches = []
+
+    def fetch_all_prices():
+        fetches.append(dict(prices))
+        market_data._store({"cardano": prices})
+        return dict(prices)
+
+    monkeypatch.setattr(market_data, "fetch_all_prices", fetch_all_prices)
+    for attr, value in (("_prices", {}), ("_volume_usd", None), ("_fetched_at", 0.0)):
+        monkeypatch.setattr(market_data, attr, value)  # restored after the test
+    rates = CrossRateService(["ada", "iusd", "usd", "php"])
+
+    rates.ensure_fresh()
+    rates.ensure_fresh()  # served from the fresh cache
+    assert rates.get_rate("ada", "usd") == pytest.approx(0.4)
+    assert len(fetches) == 1
+
+    prices["usd"] = 0.2
+    monkeypatch.setattr(market_data, "_fetched_at", time.time() - market_data.CACHE_DURATION)
+    rates.ensure_fresh()
+    assert rates.get_rate("ada", "usd") == pytest.approx(0.2)
+    assert len(fetches) == 2
@@ -0,0 +1,59 @@
+import gzip
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.core.http_cache import ResponseCache, negotiate_encoding
+
+
+def _client():
+    cache, state = ResponseCache(), {"version": 1, "builds": 0}
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(request: Request):
+        def build():
+            state["builds"] += 1
+            return {"items": ["x" * 40] * 100, "version": state["version"]}
+        return cache.respond(request, "items", state["version"], build, "public, max-age=30")
+
+    return TestClient(app), state
+
+
+def test_conditional_get_and_versioning():
+    client, state = _client()
+    first = client.get("/items", headers={"Accept-Encoding": "identity"})
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "public, max-age=30"
+
+    assert client.get("/items", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/items", headers={"Accept-Encoding": "identity"}).headers["etag"] == etag
+    assert state["builds"] == 1  # served from the serialized body
+
+    state["version"] = 2
+    changed = client.get("/items", headers={"If-None-Match": etag, "Accept-Encoding": "identity"})
+    assert changed.status_code == 200 and changed.json()["version"] == 2
+    assert changed.headers["etag"] != etag
+
+
+def test_gzip_variant_has_its_own_etag():
+    client, _ = _client()
+    plain = client.get("/items", headers={"Accept-Encoding": "identity"})
+    zipped = client.get("/items", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == plain.json()  # the test client decodes it
+    assert zipped.headers["etag"] != plain.headers["etag"]
+
+    not_modified = client.get("/items", headers={"If-None-Match": zipped.headers["etag"], "Accept-Encoding": "gzip"})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == zipped.headers["etag"]  # the variant's tag, not the base one
+    # A client that no longer accepts gzip doesn't hold the representation it would get.
+    assert client.get("/items", headers={"If-None-Match": zipped.headers["etag"], "Accept-Encoding": "identity"}).status_code == 200
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0, deflate") is None
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("*") in ("gzip", "br")
+    assert gzip.decompress(gzip.compress(b"ok")) == b"ok"
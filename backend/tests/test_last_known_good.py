@@ -0,0 +1,81 @@
+import threading
+import time
+
+from loguru import logger
+
+from src.services import last_known_good as lkg_module
+from src.services.last_known_good import LastKnownGood, start_staleness_tracking, stop_staleness_tracking
+
+
+def test_round_trip_and_warming(tmp_path):
+    path = str(tmp_path / "lkg.json")
+    store = LastKnownGood(path, write_interval=0)
+    store.update_prices({"php": 41.2, "usd": 0.7}, volume_usd=1e8)
+    store.update_binance(0.71)
+    store.update_minswap(100, {"amount_out": 70.5, "min_amount_out": 70.1, "avg_price_impact": 0.2})
+    assert not store.warming("binance")
+
+    restarted = LastKnownGood(path)
+    assert restarted.load()
+    assert restarted.warming("binance") and restarted.warming("coingecko")
+    assert restarted.get_ada_price("PHP") == 41.2
+    assert restarted.get_binance_price() == 0.71
+    assert restarted.get_minswap_quote(100.0)["amount_out"] == 70.5
+    assert restarted.get_minswap_quote(250) is None  # never quoted
+
+    assert not LastKnownGood(str(tmp_path / "missing.json")).load()
+
+
+def test_max_age_and_staleness_noting(tmp_path, monkeypatch):
+    store = LastKnownGood("", write_interval=0)
+    store.update_binance(0.7)
+    store._updated["binance"] = time.time() - 120
+
+    stale, token = start_staleness_tracking()
+    try:
+        assert store.get_binance_price(max_age=60) is None
+        assert stale == {}
+        assert store.get_binance_price(max_age=300) == 0.7
+    finally:
+        stop_staleness_tracking(token)
+    assert list(stale) == ["binance"] and 119 <= stale["binance"] <= 125
+
+
+def test_quote_cap():
+    store = LastKnownGood("", write_interval=0)
+    for amount in range(lkg_module.MAX_QUOTES + 5):
+        store.update_minswap(amount + 1, {"amount_out": amount})
+    assert len(store._quotes) == lkg_module.MAX_QUOTES
+    assert store.get_minswap_quote(1) is None
+    assert store.get_minswap_quote(lkg_module.MAX_QUOTES + 5) is not None
+
+
+def test_concurrent_updates_persist_cleanly(tmp_path):
+    path = str(tmp_path / "lkg.json")
+    store = LastKnownGood(path, write_interval=0)
+    errors = []
+
+    def update(worker):
+        try:
+            for i in range(50):
+                store.update_minswap(worker * 1000 + i, {"amount_out": i})
+                store.update_prices({f"c{worker}": float(i)})
+        except Exception as e:
+            errors.append(e)
+
+    warnings = []
+    sink = logger.add(warnings.append, level="WARNING")
+    threads = [threading.Thread(target=update, args=(w,)) for w in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+    finally:
+        logger.remove(sink)
+
+    assert errors == [] and warnings == []  # failed writes are only logged
+    assert [p.name for p in tmp_path.iterdir()] == ["lkg.json"]  # no temp files left behind
+    restarted = LastKnownGood(path)
+    assert restarted.load()
+    assert restarted.get_ada_price("c0") == 49.0  # the last snapshot won
@@ -0,0 +1,101 @@
+import time
+import pytest
+from src.core.llm_router import RoutingLLM
+
+
+class StubBackend:
+    """Local stand-in for a provider LLM with fixed latency."""
+
+    def __init__(self, model: str, latency: float = 0.0, fail: bool = False):
+        self.model = model
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+
+    def call(self, messages, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.model} is down")
+        return f"answer from {self.model}"
+
+
+def test_routes_to_fastest_backend_after_warmup():
+    slow = StubBackend("slow", latency=0.05)
+    fast = StubBackend("fast", latency=0.0)
+    llm = RoutingLLM(model="router/test", backends=[slow, fast])
+
+    # Both backends get sampled, then the fast one wins every time.
+    llm.call("hi")
+    llm.call("hi")
+    results = [llm.call("hi") for _ in range(3)]
+
+    assert results == ["answer from fast"] * 3
+    assert llm.stats()[0]["backend"] == "fast"
+
+
+def test_fails_over_on_error():
+    broken = StubBackend("broken", fail=True)
+    healthy = StubBackend("healthy")
+    llm = RoutingLLM(model="router/test", backends=[broken, healthy])
+
+    assert llm.call("hi") == "answer from healthy"
+    assert broken.calls == 1
+
+
+def test_unhealthy_backend_is_skipped():
+    broken = StubBackend("broken", fail=True)
+    healthy = StubBackend("healthy", latency=0.01)
+    llm = RoutingLLM(model="router/test", backends=[broken, healthy], min_samples=1)
+
+    llm.call("hi")
+    llm.call("hi")
+
+    assert broken.calls == 1
+    assert llm.stats()[-1]["healthy"] is False
+
+
+def test_failed_only_backend_ranks_after_measured_one():
+    flaky = StubBackend("flaky", fail=True)
+    healthy = StubBackend("healthy", latency=0.01)
+    llm = RoutingLLM(model="router/test", backends=[flaky, healthy], min_samples=5)
+
+    # One failure is below min_samples, so "flaky" stays healthy but unmeasured.
+    llm.call("hi")
+    llm.call("hi")
+
+    assert flaky.calls == 1
+    assert healthy.calls == 2
+
+
+def test_hedged_request_returns_first_answer():
+    stuck = StubBackend("stuck", latency=0.5)
+    quick = StubBackend("quick", latency=0.0)
+    llm = RoutingLLM(model="router/test", backends=[stuck, quick], hedge_after_seconds=0.05)
+
+    start = time.perf_counter()
+    assert llm.call("hi") == "answer from quick"
+    assert time.perf_counter() - start < 0.4
+
+
+def test_all_backends_failing_raises():
+    llm = RoutingLLM(model="router/test", backends=[StubBackend("a", fail=True), StubBackend("b", fail=True)])
+    with pytest.raises(RuntimeError):
+        llm.call("hi")
+
+
+def test_stop_words_are_passed_per_call_without_touching_shared_backends():
+    seen = []
+
+    class StopAwareBackend(StubBackend):
+        def call(self, messages, **kwargs):
+            seen.append(getattr(self, "stop", None))
+            return super().call(messages, **kwargs)
+
+    backend = StopAwareBackend("shared")
+    llm = RoutingLLM(model="router/test", backends=[backend])
+    llm.stop = ["Observation:"]
+
+    assert llm.call("hi") == "answer from shared"
+    assert seen == [["Observation:"]]
+    assert getattr(backend, "stop", None) is None
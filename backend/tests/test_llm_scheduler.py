@@ -0,0 +1,102 @@
+import threading
+import time
+
+from src.core.llm_scheduler import LLMScheduler, Priority
+from src.core.scheduled_llm import ScheduledLLM
+
+
+def _wait_queued(scheduler: LLMScheduler, priority: Priority, count: int = 1):
+    deadline = time.monotonic() + 2
+    while scheduler.metrics()["classes"][priority.value]["queued"] < count:
+        assert time.monotonic() < deadline, f"{priority.value} call never queued"
+        time.sleep(0.005)
+
+
+def _start(scheduler: LLMScheduler, priority: Priority, done: list, tokens: int = 0) -> threading.Thread:
+    def run():
+        with scheduler.slot(priority, tokens=tokens):
+            done.append(priority)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_waiters_are_served_in_priority_order():
+    scheduler = LLMScheduler(max_concurrency=1)
+    done = []
+
+    with scheduler.slot(Priority.INTERACTIVE):
+        # Queue lowest priority first so arrival order can't explain the result.
+        threads = []
+        for priority in (Priority.BULK, Priority.JOB, Priority.INTERACTIVE):
+            threads.append(_start(scheduler, priority, done))
+            _wait_queued(scheduler, priority)
+
+    for thread in threads:
+        thread.join(timeout=2)
+    assert done == [Priority.INTERACTIVE, Priority.JOB, Priority.BULK]
+
+
+def test_class_limit_queues_only_that_class():
+    scheduler = LLMScheduler(max_concurrency=4, class_limits={Priority.INTERACTIVE: 4, Priority.JOB: 4, Priority.BULK: 1})
+    done = []
+
+    with scheduler.slot(Priority.BULK):
+        bulk = _start(scheduler, Priority.BULK, done)
+        _wait_queued(scheduler, Priority.BULK)
+        # A full bulk class doesn't hold up other classes.
+        _start(scheduler, Priority.INTERACTIVE, done).join(timeout=2)
+        assert done == [Priority.INTERACTIVE]
+
+    bulk.join(timeout=2)
+    assert done == [Priority.INTERACTIVE, Priority.BULK]
+
+
+def test_tokens_per_minute_budget_delays_calls():
+    scheduler = LLMScheduler(tokens_per_minute=100, interactive_reserve=0.0)
+    # The whole budget was spent almost a minute ago and frees up shortly.
+    scheduler._token_log.append((time.monotonic() - 59.7, 100))
+
+    start = time.monotonic()
+    with scheduler.slot(Priority.INTERACTIVE, tokens=10):
+        waited = time.monotonic() - start
+
+    assert 0.2 < waited < 2
+    assert scheduler.metrics()["tokens_last_minute"] == 10
+
+
+def test_interactive_reserve_is_kept_from_background_calls():
+    scheduler = LLMScheduler(tokens_per_minute=100, interactive_reserve=0.5)
+    scheduler._token_log.append((time.monotonic() - 59.7, 60))
+
+    # 60 + 30 fits the full budget, so a chat turn runs at once...
+    start = time.monotonic()
+    with scheduler.slot(Priority.INTERACTIVE, tokens=30):
+        assert time.monotonic() - start < 0.1
+
+    # ...but a bulk call only gets half of it and waits for the old tokens to expire.
+    start = time.monotonic()
+    with scheduler.slot(Priority.BULK, tokens=10):
+        waited = time.monotonic() - start
+    assert 0.1 < waited < 2
+
+
+def test_scheduled_llm_passes_stop_words_without_mutating_the_inner_llm():
+    seen = []
+
+    class Inner:
+        model = "fake"
+        stop = None
+
+        def call(self, messages, **kwargs):
+            seen.append(self.stop)
+            return "ok"
+
+    inner = Inner()
+    llm = ScheduledLLM(inner, Priority.BULK, scheduler=LLMScheduler())
+    llm.stop = ["Observation:"]
+
+    assert llm.call("hi") == "ok"
+    assert seen == [["Observation:"]]
+    assert inner.stop is None
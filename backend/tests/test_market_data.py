@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import requests
+
+from src.tools.market_data import MarketDataService
+
+
+class _Response:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"cardano": {"usd": 0.4, "php": 23.0, "inr": 33.5}}
+
+
+def test_one_call_serves_every_currency(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(params)
+        return _Response()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    service = MarketDataService()
+
+    assert service.get_ada_price("USD") == 0.4
+    assert service.get_ada_price("php") == 23.0
+    assert service.get_ada_price("inr") == 33.5
+    assert len(calls) == 1
+    assert "php" in calls[0]["vs_currencies"].split(",")
+
+
+def test_falls_back_when_coingecko_is_down(monkeypatch):
+    def failing_get(*args, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(requests, "get", failing_get)
+    assert MarketDataService().get_ada_price("usd") == 0.35
+
+
+def test_missing_currency_in_fresh_cache_does_not_refetch(monkeypatch):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append(params)
+        return _Response()
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    service = MarketDataService()
+
+    assert service.get_ada_price("usd") == 0.4
+    assert service.get_ada_price("kes") == 45.0  # not in the response: static fallback
+    assert service.get_ada_price("xyz") == 1.0
+    assert len(calls) == 1
+
+
+def test_async_lookups_share_one_fetch_and_skip_missing_currencies(monkeypatch):
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["vs_currencies"])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=_Response().json())
+
+    client = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda: client(transport=httpx.MockTransport(handler)))
+    service = MarketDataService()
+
+    async def lookups():
+        first = await asyncio.gather(*(service.get_ada_price_async(c) for c in ("usd", "php", "inr")))
+        return first, await service.get_ada_price_async("kes")
+
+    assert asyncio.run(lookups()) == ([0.4, 23.0, 33.5], 45.0)
+    assert len(calls) == 1
@@ -0,0 +1,34 @@
+from src.services.market_snapshot import MarketSnapshotStore
+
+
+def test_publish_and_read_back(tmp_path):
+    path = str(tmp_path / "market.snapshot")
+    writer = MarketSnapshotStore(path)
+    reader = MarketSnapshotStore(path)
+
+    assert reader.get_ada_price("usd") is None  # no file yet
+
+    writer.publish(ada_prices={"usd": 0.42, "PHP": 24.1}, binance_price=0.41)
+    assert reader.get_ada_price("usd") == 0.42
+    assert reader.get_ada_price("php") == 24.1
+    assert reader.get_ada_price("eur") is None
+    assert reader.get_binance_price() == 0.41
+    assert reader.get_minswap_quote(1000) is None  # never published
+
+    writer.publish(minswap_ladder={1000.0: {"amount_out": 405.5, "min_amount_out": 401.4, "avg_price_impact": 0.12}})
+    assert reader.get_minswap_quote(1000)["amount_out"] == 405.5
+    assert reader.get_minswap_quote(123) is None  # not on the ladder
+    assert reader.get_binance_price() == 0.41  # untouched by the partial publish
+
+
+def test_stale_sources_are_ignored(tmp_path):
+    path = str(tmp_path / "market.snapshot")
+    MarketSnapshotStore(path).publish(ada_prices={"usd": 0.42})
+    assert MarketSnapshotStore(path, max_age_seconds=0).get_ada_price("usd") is None
+
+
+def test_single_writer_per_host(tmp_path):
+    path = str(tmp_path / "market.snapshot")
+    first, second = MarketSnapshotStore(path), MarketSnapshotStore(path)
+    assert first.try_acquire_writer()
+    assert not second.try_acquire_writer()
@@ -0,0 +1,61 @@
+import pytest
+
+from src.core.metrics import Counter, Gauge, Histogram, Registry, UPSTREAM_ERRORS, track_upstream
+
+
+def _samples(metric) -> dict:
+    """Sample lines of a rendered metric as {name_and_labels: value}."""
+    lines = [line for line in metric.render().splitlines() if not line.startswith("#")]
+    return dict(line.rsplit(" ", 1) for line in lines)
+
+
+def test_counter_renders_help_type_and_labelled_samples():
+    counter = Counter("test_calls_total", "Calls", ("site",))
+    counter.inc(site="chat")
+    counter.inc(2, site="chat")
+    counter.inc(site="jobs")
+
+    rendered = counter.render().splitlines()
+    assert rendered[:2] == ["# HELP test_calls_total Calls", "# TYPE test_calls_total counter"]
+    assert _samples(counter) == {'test_calls_total{site="chat"}': "3", 'test_calls_total{site="jobs"}': "1"}
+
+
+def test_label_values_are_escaped():
+    counter = Counter("test_escape_total", "Escaping", ("path",))
+    counter.inc(path='C:\\tmp\n"x"')
+
+    assert _samples(counter) == {'test_escape_total{path="C:\\\\tmp\\n\\"x\\""}': "1"}
+
+
+def test_histogram_buckets_are_cumulative_and_end_with_inf():
+    histogram = Histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route="/x")
+
+    assert _samples(histogram) == {
+        'test_latency_seconds_bucket{route="/x",le="0.1"}': "1",
+        'test_latency_seconds_bucket{route="/x",le="1"}': "3",
+        'test_latency_seconds_bucket{route="/x",le="+Inf"}': "4",
+        'test_latency_seconds_sum{route="/x"}': "4.25",
+        'test_latency_seconds_count{route="/x"}': "4",
+    }
+
+
+def test_gauge_function_and_registry_render():
+    registry = Registry()
+    gauge = registry.register(Gauge("test_depth", "Depth"))
+    gauge.set_function(lambda: 7)
+    registry.register(Counter("test_unused_total", "Never incremented"))
+
+    text = registry.render()
+    assert "test_depth 7\n" in text
+    assert "# TYPE test_unused_total counter" in text
+    assert text.endswith("\n")
+
+
+def test_track_upstream_counts_errors_by_reason():
+    with pytest.raises(TimeoutError):
+        with track_upstream("test-upstream", "quote"):
+            raise TimeoutError()
+
+    assert _samples(UPSTREAM_ERRORS)['remit_upstream_errors_total{upstream="test-upstream",operation="quote",reason="TimeoutError"}'] == "1"
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+
+from src.services import price_history as ph
+from src.services.price_history import PriceHistoryStore
+
+
+def test_append_range_and_growth(tmp_path, monkeypatch):
+    monkeypatch.setattr(ph, "INITIAL_CAPACITY", 4)
+    writer, reader = PriceHistoryStore(str(tmp_path)), PriceHistoryStore(str(tmp_path))
+    assert reader.range("ada_usd")[0].size == 0
+
+    for i in range(10):  # grows the file twice
+        writer.append("ada_usd", 0.5 + i / 100, timestamp=1000.0 + i)
+
+    ts, values = reader.range("ada_usd", start=1002, end=1005)
+    assert ts.tolist() == [1002, 1003, 1004]
+    assert values.tolist() == [0.52, 0.53, 0.54]
+    assert reader.range("ada_usd")[0].size == 10
+    assert reader.series() == ["ada_usd"]
+
+
+def test_ohlc_buckets(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    samples = [(0, 1.0), (15, 3.0), (30, 0.5), (45, 2.0), (60, 4.0), (190, 5.0)]
+    for t, v in samples:
+        store.append("binance_ada_usdt", v, timestamp=t)
+
+    candles = store.ohlc("binance_ada_usdt", 60)
+    assert [c["timestamp"] for c in candles] == [0, 60, 180]  # empty buckets are skipped
+    assert candles[0] == {"timestamp": 0.0, "open": 1.0, "high": 3.0, "low": 0.5, "close": 2.0, "samples": 4}
+    assert candles[1]["open"] == candles[1]["close"] == 4.0
+    assert np.isclose(store.ohlc("binance_ada_usdt", 3600)[0]["close"], 5.0)
+
+
+def test_rejects_unsafe_names_and_disabled_store(tmp_path):
+    store = PriceHistoryStore(str(tmp_path))
+    store.append("../etc/passwd", 1.0)
+    assert store.series() == []
+
+    disabled = PriceHistoryStore("")
+    disabled.append("ada_usd", 1.0)
+    assert disabled.series() == [] and disabled.ohlc("ada_usd", 60) == []
+
+
+def test_retention_compacts_full_files_instead_of_growing(tmp_path, monkeypatch):
+    monkeypatch.setattr(ph, "INITIAL_CAPACITY", 4)
+    writer = PriceHistoryStore(str(tmp_path), retention_days=1)
+    reader = PriceHistoryStore(str(tmp_path))
+    now = time.time()
+
+    for i in range(3):
+        writer.append("ada_usd", 0.1, timestamp=now - 3 * 86400 + i)  # expired
+    writer.append("ada_usd", 0.2, timestamp=now - 10)
+    assert reader.range("ada_usd")[0].size == 4  # reader maps the file before compaction
+    size = (tmp_path / "ada_usd.ts").stat().st_size
+
+    writer.append("ada_usd", 0.3, timestamp=now)  # full: drops the 3 expired samples
+
+    assert (tmp_path / "ada_usd.ts").stat().st_size == size
+    assert reader.range("ada_usd")[1].tolist() == [0.2, 0.3]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ada_usd.ts"]
@@ -0,0 +1,50 @@
+import pytest
+
+from src.services.cross_rate_service import CrossRateService
+from src.services.price_impact import PriceImpactCurve
+from src.services.rater_service import RaterService
+
+
+def test_curve_passes_through_quotes_and_interpolates_between():
+    curve = PriceImpactCurve("ADA/iUSD", [10_000, 100, 1_000], [3_400, 35, 349], [3.0, 0.0, 0.3])
+
+    assert curve.min_amount == 100 and curve.max_amount == 10_000
+    assert curve.covers(500) and not curve.covers(50_000)
+
+    exact, between = curve.evaluate([1_000, 3_000])
+    assert exact["amount_out"] == pytest.approx(349)
+    assert exact["price_impact_percent"] == pytest.approx(0.3)
+    assert 0.3 < between["price_impact_percent"] < 3.0
+    assert 0.34 < between["effective_rate"] < 0.349
+
+
+def test_amounts_outside_the_ladder_are_flagged_extrapolated():
+    curve = PriceImpactCurve("ADA/iUSD", [100, 1_000], [35, 349], [0.0, 0.3])
+
+    small, inside, large = curve.evaluate([10, 500, 50_000])
+    assert small["extrapolated"] and large["extrapolated"]
+    assert not inside["extrapolated"]
+    assert large["effective_rate"] == pytest.approx(0.349)  # clamped to the largest quote
+
+
+async def test_service_flags_points_by_amount_not_cache_state():
+    rater = RaterService(CrossRateService(["ada", "iusd", "usd"]))
+
+    async def minswap(amount, token_out=RaterService.IUSD_TOKEN):
+        if amount > 100_000:
+            return None  # no liquidity quote for this size
+        return {"amount_out": amount * 0.35 * (1 - amount / 1e6), "avg_price_impact": amount / 1e4}
+
+    rater._fetch_minswap_estimate = minswap
+
+    live = await rater.get_price_impact_curve([1_000, 3_000, 200_000])
+    cached = await rater.get_price_impact_curve([1_000, 2_000])
+    assert (live.source, cached.source) == ("live", "cache")
+
+    exact, quoted, too_large = live.points
+    assert not exact.interpolated and not quoted.interpolated
+    assert too_large.extrapolated and not too_large.interpolated
+
+    exact, between = cached.points
+    assert not exact.interpolated and not exact.extrapolated
+    assert between.interpolated
@@ -0,0 +1,29 @@
+import threading
+import time
+
+from src.core.profiler import SamplingProfiler
+
+
+def _busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profiler_samples_the_target_thread_until_stopped():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_work, args=(stop,))
+    worker.start()
+    try:
+        profiler = SamplingProfiler(thread_id=worker.ident).start()
+        time.sleep(0.05)
+        profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert not profiler._thread.is_alive()
+    samples = profiler.samples
+    assert samples > 0
+    assert "_busy_work" in profiler.collapsed()
+    time.sleep(0.01)
+    assert profiler.samples == samples
@@ -0,0 +1,53 @@
+from src.models.schemas import RateRequest
+from src.services.cross_rate_service import CrossRateService
+from src.services.rater_service import RaterService
+
+
+def _rater(calls):
+    rates = CrossRateService(["ada", "iusd", "usd", "php"])
+    rates.update_legs({"iusd": 0.35, "usd": 0.35, "php": 20.0})
+    rater = RaterService(rates)
+
+    async def binance(symbol="ADAUSDT"):
+        calls.append("binance")
+        return 0.35
+
+    async def minswap(amount, token_out=RaterService.IUSD_TOKEN):
+        calls.append(amount)
+        return {"amount_out": amount * 0.35 * (1 - amount / 1e6), "avg_price_impact": amount / 1e4}
+
+    rater._fetch_binance_price = binance
+    rater._fetch_minswap_estimate = minswap
+    return rater
+
+
+REQUESTS = [
+    RateRequest(from_currency="ada", to_currency="php", amount=100),
+    RateRequest(from_currency="ada", to_currency="usd", amount=50_000, preferred_speed="cheap"),
+    RateRequest(from_currency="ada", to_currency="php", amount=100, preferred_speed="fast"),
+]
+
+
+async def test_batch_shares_quotes_and_matches_single_requests():
+    calls = []
+    rater = _rater(calls)
+    await rater.refresh_route_table()
+    calls.clear()
+    results = await rater.rate_batch(REQUESTS)
+
+    assert [r.index for r in results] == [0, 1, 2]
+    assert calls.count("binance") == 1
+    assert sorted(a for a in calls if a != "binance") == [100, 50_000]  # one quote per distinct amount
+
+    for request, item in zip(REQUESTS, results):
+        single = await rater.get_comprehensive_rating(request)
+        assert item.error is None
+        assert item.result.recommended_providers == single.recommended_providers
+        assert item.result.route_rating == single.route_rating
+
+
+async def test_stream_yields_every_request_once():
+    rater = _rater([])
+    items = [item async for item in rater.rate_batch_stream(REQUESTS)]
+    assert sorted(item.index for item in items) == [0, 1, 2]
+    assert all(item.result for item in items)
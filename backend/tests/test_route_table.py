@@ -0,0 +1,84 @@
+import pytest
+
+from src.services.cross_rate_service import CrossRateService
+from src.services.rater_service import RaterService, TransactionMetrics
+from src.services.route_table import RouteRatingTable
+from src.services.scoring_engine import ScoringEngine
+from src.tools.market_data import market_data
+
+METRICS = [
+    TransactionMetrics(provider_name="MinswapDEX", true_cost_usd=1.0, estimated_time_hours=0.08, reliability=5.0),
+    TransactionMetrics(provider_name="Binance", true_cost_usd=0.35, estimated_time_hours=0.5, reliability=4.8),
+    TransactionMetrics(provider_name="Wise", true_cost_usd=5.25, estimated_time_hours=24, reliability=4.5),
+    TransactionMetrics(provider_name="MoonPay (Card)", true_cost_usd=13.65, estimated_time_hours=0.2, reliability=4.2),
+]
+
+
+def _table():
+    rates = CrossRateService(["ada", "iusd", "usd", "php", "inr"])
+    rates.update_legs({"iusd": 0.35, "usd": 0.35, "php": 20.0})
+    return rates, RouteRatingTable(rates, ScoringEngine())
+
+
+def test_rebuild_is_versioned_and_skips_unchanged_inputs():
+    rates, table = _table()
+    assert table.rebuild(METRICS, 350.0, 0.05, 1e8)
+    assert table.version == 1
+    assert not table.rebuild(METRICS, 350.0, 0.05, 1e8)
+    assert table.version == 1
+
+    rates.update_leg("inr", 29.0)
+    assert table.get("usd", "inr") is None  # not picked up until the next rebuild
+    assert table.rebuild(METRICS, 350.0, 0.05, 1e8)
+    assert table.version == 2
+    assert table.get("usd", "inr").average_rate == 29.0 / 0.35
+
+
+def test_ratings_depend_on_corridor_kind():
+    _, table = _table()
+    table.rebuild(METRICS, 350.0, 0.05, 1e8)
+
+    on_chain = table.get("ada", "php", "", "PH")
+    assert "MinswapDEX" in on_chain.best_providers
+    assert on_chain.liquidity_score == 5.0
+    fiat = table.get("usd", "php")
+    assert "Wise" in fiat.best_providers and "MinswapDEX" not in fiat.best_providers
+    assert table.get("usd", "usd") is None
+    assert table.get("usd", "inr") is None  # INR leg unknown
+
+
+def test_alternatives_are_two_hop_routes():
+    _, table = _table()
+    table.rebuild(METRICS, 350.0, 0.05, 1e8)
+    alternatives = table.alternatives("usd", "php", k=2)
+    assert [a.route_id for a in alternatives] == ["USD-ADA-PHP", "USD-IUSD-PHP"]
+    assert alternatives[0].average_rate == table.get("usd", "php").average_rate
+
+
+async def test_refresh_quotes_once_and_corridors_without_data_are_not_rated(monkeypatch):
+    rates, _ = _table()
+
+    async def coingecko():
+        return {"usd": 0.35, "php": 20.0}
+
+    monkeypatch.setattr(market_data, "fetch_all_prices_async", coingecko)
+    rater = RaterService(rates)
+    quotes = []
+
+    async def binance(symbol="ADAUSDT"):
+        return 0.35
+
+    async def minswap(amount, token_out=RaterService.IUSD_TOKEN):
+        quotes.append(amount)
+        return {"amount_out": amount * 0.35, "avg_price_impact": 0.05}
+
+    rater._fetch_binance_price = binance
+    rater._fetch_minswap_estimate = minswap
+    await rater.refresh_route_table()
+    assert quotes.count(RaterService.ROUTE_REFERENCE_AMOUNT_ADA) == 1
+
+    assert (await rater.rate_route("usd", "php", "", "PH")).average_rate == pytest.approx(20.0 / 0.35)
+    with pytest.raises(ValueError):
+        await rater.rate_route("usd", "inr", "", "IN")  # INR leg unknown: no data yet
+    assert await rater.rate_route("usd", "xyz", "", "") is None  # unsupported currency
+    assert await rater.rate_route("usd", "USD", "", "") is None
@@ -0,0 +1,33 @@
+import numpy as np
+
+from src.services.scoring_engine import ScoringEngine
+
+
+def test_relative_score_bands():
+    scores = ScoringEngine.relative_scores([10.0, 10.5, 12.0, 15.0, 20.0, 21.0])
+    assert scores.tolist() == [5.0, 5.0, 4.0, 3.0, 2.0, 1.0]
+    assert ScoringEngine.relative_scores([0.0, 3.0]).tolist() == [1.0, 1.0]  # best is zero
+
+
+def test_weights_follow_preferred_speed():
+    engine = ScoringEngine()
+    # cheap-but-slow vs fast-but-pricey
+    cost, hours, reliability = np.array([1.0, 3.0]), np.array([24.0, 0.1]), np.array([4.5, 4.5])
+
+    normal = engine.score(cost, hours, reliability, engine.weights_for("normal"))["overall"]
+    fast = engine.score(cost, hours, reliability, engine.weights_for("fast"))["overall"]
+    assert normal.tolist() == [3.6, 3.2]   # 0.4/0.3/0.3, as before
+    assert fast[1] > fast[0]
+    assert engine.weights_for("unknown").tolist() == engine.weights_for("normal").tolist()
+    assert engine.weights_for(None, {"cost": 1.0, "speed": 0.0, "reliability": 0.0}).tolist() == [1.0, 0.0, 0.0]
+
+
+def test_batched_corridors_and_top_k():
+    engine = ScoringEngine()
+    cost = np.array([[1.0, 2.0, 1.0, np.nan], [5.0, 1.0, 3.0, 2.0]])  # 2 corridors x 4 providers
+    hours = np.array([[1.0, 1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0]])
+    overall = engine.score(cost, hours, np.full(4, 5.0), engine.weights_for("normal"))["overall"]
+
+    assert np.isnan(overall[0, 3])
+    assert engine.top_k(overall).tolist() == [[0, 2, 1, 3], [1, 3, 0, 2]]  # ties keep input order
+    assert engine.top_k(overall, 2).tolist() == [[0, 2], [1, 3]]
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from src.core.serialization import project, serialize_records
+from src.core.settings import settings
+from src.models.schemas import User
+from src.services import user_service as user_service_module
+
+RECORDS = [
+    {"id": 1, "name": "Ana", "country": "PH", "wallet": "addr1", "currency": "PHP",
+     "internal_note": "dropped", "payees": [
+         {"id": "p1", "name": "Rosa", "wallet_address": "addr2", "country": "PH", "currency": "PHP",
+          "created_at": "2025-01-01T00:00:00"},
+     ]},
+]
+
+
+def _model_path(records):
+    adapter = TypeAdapter(list[User])
+    return adapter.dump_json(adapter.validate_python(records))
+
+
+def test_fast_path_matches_model_serialization():
+    with open(user_service_module.DATA_FILE) as f:
+        seed = json.load(f)
+    for records in (RECORDS, seed):
+        assert json.loads(serialize_records(records, User)) == json.loads(_model_path(records))
+
+    user = project(RECORDS[0], User)
+    assert "internal_note" not in user and user["match_score"] is None
+    assert user["payees"][0]["tags"] == []
+
+
+def test_validation_mode(monkeypatch):
+    bad = [{**RECORDS[0], "id": "not-a-number"}]
+    assert json.loads(serialize_records(bad, User))[0]["id"] == "not-a-number"  # trusted as stored
+
+    monkeypatch.setattr(settings, "VALIDATE_FAST_RESPONSES", True)
+    with pytest.raises(ValidationError):
+        serialize_records(bad, User)
+    assert json.loads(serialize_records(RECORDS, User)) == json.loads(_model_path(RECORDS))
+
+
+def test_missing_required_field_is_an_error():
+    with pytest.raises(ValueError, match="wallet"):
+        serialize_records([{"id": 2, "name": "B", "country": "US", "currency": "USD"}], User)
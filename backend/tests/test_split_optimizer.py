@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.services.split_optimizer import CostCurve, optimize
+
+
+def _dex(x):
+    # 1% price impact per 10k ADA
+    return x * (1 - np.minimum(x / 10_000 * 0.01, 0.5))
+
+
+def test_large_order_is_split_between_dex_and_linear_provider():
+    options = {
+        "DEX": [CostCurve("DEX", _dex)],
+        "CEX": [CostCurve("CEX", lambda x: x * 0.995)],
+    }
+    plan = optimize(options, 10_000)
+    amounts = {leg["curve"].provider: leg["amount"] for leg in plan["legs"]}
+    # DEX marginal output 1 - 2x/1e6 falls to the CEX's 0.995 at x = 2,500
+    assert amounts["DEX"] == pytest.approx(2_500, abs=50)
+    assert amounts["DEX"] + amounts["CEX"] == pytest.approx(10_000)
+    assert plan["total"] > max(_dex(10_000), 10_000 * 0.995)
+
+
+def test_fixed_fees_and_slicing():
+    dex = CostCurve("DEX", _dex, fixed_fee_usd=5.0)
+    options = {"DEX": [dex.sliced(n, 0.1) for n in (1, 2, 4)], "CEX": [CostCurve("CEX", lambda x: x * 0.99, fixed_fee_usd=1.0)]}
+
+    small = optimize(options, 100)
+    assert [leg["curve"].provider for leg in small["legs"]] == ["CEX"]  # DEX fee not worth it
+
+    large = optimize(options, 20_000)
+    dex_leg = next(leg for leg in large["legs"] if leg["curve"].provider == "DEX")
+    assert dex_leg["curve"].slices == 4
+    assert dex_leg["curve"].time_hours == pytest.approx(0.3)
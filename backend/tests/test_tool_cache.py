@@ -0,0 +1,69 @@
+from src.core.settings import settings
+from src.core.tracing import end_trace, start_trace
+from src.tools import agent_tools, tool_cache
+from src.tools.agent_tools import RemitTools
+from src.tools.tool_cache import tool_run
+
+
+class CountingDex:
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def get_ada_to_stable_quote_async(self, amount_ada):
+        self.calls += 1
+        if self.fail:
+            return {"success": False, "error": "down", "fallback_rate": 0.35}
+        return {"success": True, "input_ada": amount_ada, "estimated_iusd": amount_ada * 0.7,
+                "minimum_iusd": amount_ada * 0.69, "protocols_used": ["minswap"]}
+
+
+def test_identical_calls_are_deduplicated_within_a_run(monkeypatch):
+    monkeypatch.setattr(settings, "AGENT_TOOL_CACHE_TTL_SECONDS", 0.0)
+    dex = CountingDex()
+    monkeypatch.setattr(agent_tools, "get_dex_service", lambda: dex)
+
+    trace, token = start_trace("chat")
+    try:
+        with tool_run("rate_inquiry") as run:
+            first = RemitTools.swap_ada_to_stable.run(amount_ada=100)
+            assert RemitTools.swap_ada_to_stable.run(amount_ada=100.0) == first
+            RemitTools.swap_ada_to_stable.run(amount_ada=250)
+    finally:
+        end_trace(token)
+
+    assert dex.calls == 2
+    assert run.stats["swap_ada_to_stable"]["calls"] == 3 and run.stats["swap_ada_to_stable"]["hits"] == 1
+    names = [name for name, _, _ in trace.spans]
+    assert names.count("tool.swap_ada_to_stable") == 2 and names.count("tool.swap_ada_to_stable.hit") == 1
+
+    with tool_run("rate_inquiry"):  # a new run starts empty when nothing is shared
+        RemitTools.swap_ada_to_stable.run(amount_ada=100)
+    assert dex.calls == 3
+
+
+def test_quotes_shared_across_runs_until_ttl(monkeypatch):
+    tool_cache.clear_shared()
+    monkeypatch.setattr(settings, "AGENT_TOOL_CACHE_TTL_SECONDS", 30.0)
+    dex = CountingDex()
+    monkeypatch.setattr(agent_tools, "get_dex_service", lambda: dex)
+
+    for _ in range(3):
+        with tool_run("transaction_plan"):
+            RemitTools.swap_ada_to_stable.run(amount_ada=42)
+    assert dex.calls == 1
+
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: float("inf"))
+    RemitTools.swap_ada_to_stable.run(amount_ada=42)
+    assert dex.calls == 2
+    tool_cache.clear_shared()
+
+
+def test_errors_are_not_memoized(monkeypatch):
+    tool_cache.clear_shared()
+    dex = CountingDex(fail=True)
+    monkeypatch.setattr(agent_tools, "get_dex_service", lambda: dex)
+    with tool_run("transaction_plan"):
+        assert RemitTools.swap_ada_to_stable.run(amount_ada=10).startswith("Error getting quote")
+        RemitTools.swap_ada_to_stable.run(amount_ada=10)
+    assert dex.calls == 2
@@ -0,0 +1,36 @@
+from src.models.schemas import Payee
+from src.tools.tool_format import CompactFormat, VerboseFormat
+
+WALLET = "addr_test1qrmatet32euhulze7yh0ge72q0rwul4qs0gltcvnxny8599rpeayejgv008cah9rwjdzvugr7pp3eq8gjdkws7zja82smavwkv"
+PAYEES = [
+    Payee(id=f"a1b2c3d{i}", name=f"Payee {i}", wallet_address=WALLET, country="Finland", currency="Euro",
+          tags=["Family", "Sister"], created_at="2025-11-29T22:24:51.440762")
+    for i in range(5)
+]
+
+
+def test_compact_payees_are_top_k_with_full_wallet_addresses():
+    compact = CompactFormat(top_k=2).payees("sister", PAYEES)
+    verbose = VerboseFormat().payees("sister", PAYEES)
+    assert compact.splitlines() == [
+        "Payees matching 'sister' (best 2 of 5):",
+        f"#a1b2c3d0 Payee 0 | Family,Sister | Finland/Euro | {WALLET}",
+        f"#a1b2c3d1 Payee 1 | Family,Sister | Finland/Euro | {WALLET}",
+    ]
+    assert "created_at" not in compact and len(compact) < len(verbose) / 2
+
+
+def test_error_results_keep_the_verbose_prefix():
+    failed = {"success": False, "error": "down", "fallback_rate": 0.35}
+    for fmt in (CompactFormat(), VerboseFormat()):
+        assert fmt.quote(10, failed).startswith("Error getting quote: down")
+        assert fmt.corridor_rate("usd", "xyz", None).startswith("No rate is available")
+        assert fmt.payees("nobody", []).startswith("No payee found")
+
+
+def test_compact_quote():
+    quote = {"success": True, "input_ada": 250.0, "estimated_iusd": 87.449125, "minimum_iusd": 86.574634,
+             "price_impact_percent": 0.0025, "protocols_used": ["MinswapV2"], "stale": True}
+    assert CompactFormat().quote(250.0, quote) == (
+        "250 ADA -> 87.4491 iUSD (min 86.5746; impact 0.0025%; via MinswapV2; stale)"
+    )
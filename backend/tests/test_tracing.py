@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.tracing import TracedRoute, current_trace, end_trace, span, start_trace, traced
+
+
+def test_span_outside_a_request_is_a_noop():
+    with span("orphan"):
+        pass
+    assert current_trace() is None
+
+
+def test_nested_spans_are_recorded_inside_their_parent():
+    trace, token = start_trace("GET /x")
+    try:
+        with span("outer"):
+            time.sleep(0.01)
+            with span("inner"):
+                time.sleep(0.01)
+    finally:
+        end_trace(token)
+
+    spans = {s["name"]: s for s in trace.to_dict()["spans"]}
+    outer, inner = spans["outer"], spans["inner"]
+    assert outer["offset_ms"] <= inner["offset_ms"]
+    assert inner["offset_ms"] + inner["duration_ms"] <= outer["offset_ms"] + outer["duration_ms"]
+    assert current_trace() is None
+
+
+def test_traced_async_functions_share_the_request_trace():
+    @traced("minswap.estimate")
+    async def quote():
+        await asyncio.sleep(0.005)
+
+    async def handle():
+        trace, token = start_trace("POST /rate")
+        try:
+            await asyncio.gather(quote(), quote())
+        finally:
+            end_trace(token)
+        return trace
+
+    trace = asyncio.run(handle())
+    assert [s["name"] for s in trace.to_dict()["spans"]] == ["minswap.estimate"] * 2
+
+
+def test_server_timing_aggregates_by_name_and_sanitizes_tokens():
+    trace, token = start_trace("GET /x")
+    try:
+        for _ in range(2):
+            with span("binance.price"):
+                pass
+        with span("db lookup"):
+            pass
+    finally:
+        end_trace(token)
+
+    parts = [p.split(";") for p in trace.server_timing().split(", ")]
+    assert [p[0] for p in parts] == ["binance.price", "db_lookup", "total"]
+    assert parts[0][2] == 'desc="x2"'
+    assert all(p[1].startswith("dur=") for p in parts)
+
+
+def test_traced_route_records_handler_and_framework_spans():
+    router = APIRouter(route_class=TracedRoute)
+    traces = []
+
+    @router.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.middleware("http")
+    async def tracing(request, call_next):
+        trace, token = start_trace(request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            end_trace(token)
+        traces.append(trace)
+        response.headers["Server-Timing"] = trace.server_timing()
+        return response
+
+    response = TestClient(app).get("/ping")
+    names = response.headers["server-timing"].split(", ")
+    assert [n.split(";")[0] for n in names] == ["handler", "framework", "total"]
+    assert traces[0].duration_of("handler") > 0
@@ -1,46 +1,52 @@
+import shutil
 import pytest
-from src.tools.users import Users
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.core.pagination import encode_cursor
+from src.dependencies import get_user_service
+from src.models.schemas import UserPage
+from src.routers import users as users_router
+from src.services import user_service as user_service_module
+from src.services.user_service import UserService
+
 
 @pytest.fixture
-def user_service():
-    """Setup the Users instance for every test."""
-    return Users()
+def user_service(tmp_path, monkeypatch):
+    """Setup a UserService backed by a copy of the seed data for every test."""
+    data_file = tmp_path / "users.json"
+    shutil.copy(user_service_module.DATA_FILE, data_file)
+    monkeypatch.setattr(user_service_module, "DATA_FILE", str(data_file))
+    return UserService()
 
 
 @pytest.mark.parametrize("query, expected_name_fragment", [
-    ("Dipish", "Dipish"),           # Case 1: Fuzzy
-    ("Rahul Sharma", "Rahul Sharma"), # Case 2: Exact
-    ("Alice", "Alice"),             # Case 3: Partial
+    ("Dipish", "Dipisha"),   # Case 1: Fuzzy
+    ("Geeno", "Geeno"),      # Case 2: Exact
+    ("sister", "Dipisha"),   # Case 3: Tag
 ])
 def test_search_scenarios(user_service, query, expected_name_fragment):
     """
-    Parametrized test to verify fuzzy, exact, and partial searches.
+    Parametrized test to verify fuzzy, exact, and tag searches.
     """
     # Act
-    results = user_service.search_user(query)
+    results = user_service.search_payees(99, query)
 
     # Assert
     assert len(results) > 0, f"Expected results for query: '{query}'"
-    
-    # Verify at least one result matches the expectation
-    # We use a generator expression inside any() for cleaner code
-    match_found = any(expected_name_fragment in r['name'] for r in results)
-    assert match_found, f"Expected to find '{expected_name_fragment}' in results for '{query}'"
+    assert expected_name_fragment in results[0].name, f"Expected '{expected_name_fragment}' first for '{query}'"
 
 
 @pytest.mark.parametrize("user_id, expected_country", [
-    (2, None), # We assume we don't know the country strictly, or you can fill it in if known
+    (99, "USA"),
 ])
 def test_get_user_by_id(user_service, user_id, expected_country):
     """
     Verify retrieval by ID.
     """
-    user = user_service.get_user_by_id(user_id)
+    user = user_service.get_by_id(user_id)
     assert user is not None, f"User {user_id} should exist"
-    assert user['id'] == user_id
-    
-    if expected_country:
-        assert user['country'] == expected_country
+    assert user.id == user_id
+    assert user.country == expected_country
 
 
 def test_get_all_users_structure(user_service):
@@ -48,6 +54,74 @@ def test_get_all_users_structure(user_service):
     Verify the structure of the full user list.
     Kept separate as it doesn't fit the 'input -> output' pattern of the others.
     """
-    all_users = user_service.get_all_users()
+    all_users = user_service.get_all()
     assert len(all_users) > 0
-    assert isinstance(all_users, list)
\ No newline at end of file
+    assert isinstance(all_users, list)
+    assert all(u.payees is not None for u in all_users)
+
+
+def test_streamed_records_match_the_file(user_service, monkeypatch):
+    """
+    The incremental reader yields exactly what json.load does, even when a
+    record spans read chunks.
+    """
+    monkeypatch.setattr(user_service_module, "READ_CHUNK_SIZE", 7)
+    assert list(user_service.iter_records()) == user_service._load_users()
+
+
+def test_user_pages_follow_id_order(user_service):
+    users = [{"id": i, "name": f"U{i}", "country": "PH", "wallet": f"w{i}", "currency": "PHP", "payees": []}
+             for i in (5, 1, 9, 3, 7)]
+    user_service._save_users(users)
+
+    seen, after, more = [], None, True
+    while more:
+        page, more = user_service.page_users(after, limit=2)
+        seen += [u["id"] for u in page]
+        after = page[-1]["id"]
+    assert seen == [1, 3, 5, 7, 9]
+
+
+def test_payee_pages_follow_creation_order(user_service):
+    payees = user_service.get_payee_records(99)
+    first, more = user_service.page_payees(99, None, limit=1)
+    assert more == (len(payees) > 1)
+    rest, _ = user_service.page_payees(99, (first[0]["created_at"], first[0]["id"]), limit=len(payees))
+    assert [p["id"] for p in first + rest] == [p["id"] for p in sorted(payees, key=lambda p: (p["created_at"], p["id"]))]
+
+
+def test_pages_match_their_declared_model(user_service):
+    app = FastAPI()
+    app.include_router(users_router.router)
+    app.dependency_overrides[get_user_service] = lambda: user_service
+
+    page = UserPage.model_validate(TestClient(app).get("/api/users", params={"limit": 1}).json())
+    assert len(page.items) == 1
+    schema = app.openapi()["paths"]["/api/users"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/UserPage"} in schema["anyOf"]
+
+
+@pytest.mark.parametrize("path, position", [
+    ("/api/users", {"id": "x"}),
+    ("/api/users", {"id": True}),
+    ("/api/users/99/payees", {"created_at": 1, "id": 2}),
+    ("/api/users/99/payees", {"id": "de7e9967"}),
+])
+def test_mistyped_cursor_is_a_bad_request(user_service, path, position):
+    app = FastAPI()
+    app.include_router(users_router.router)
+    app.dependency_overrides[get_user_service] = lambda: user_service
+
+    response = TestClient(app).get(path, params={"limit": 2, "cursor": encode_cursor(position)})
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/api/users", "/api/users/99/payees"])
+def test_unknown_format_is_rejected(user_service, path):
+    app = FastAPI()
+    app.include_router(users_router.router)
+    app.dependency_overrides[get_user_service] = lambda: user_service
+
+    client = TestClient(app)
+    assert client.get(path, params={"format": "xml"}).status_code == 422
+    assert client.get(path, params={"format": "json"}).json() == client.get(path).json()
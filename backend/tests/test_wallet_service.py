@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import httpx
+
+from src.core.settings import settings
+from src.services import wallet_service as wallet_service_module
+from src.services.wallet_service import WalletService
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        wallet = json.loads(request.content)["wallet"]
+        self.calls.append(wallet)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        if wallet == "addr_unknown":
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json={"wallet": wallet, "ada": {"amount": "10"}, "balance": []})
+
+
+def _service(monkeypatch) -> tuple:
+    upstream = Upstream()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(wallet_service_module.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(upstream.handler), **kwargs))
+    return WalletService(), upstream
+
+
+def test_dedup_and_cache(monkeypatch):
+    service, upstream = _service(monkeypatch)
+
+    async def run():
+        first = await asyncio.gather(*(service.get_balance("addr1") for _ in range(10)))
+        again = await service.get_balance("addr1")
+        await service.aclose()
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert upstream.calls == ["addr1"]
+    assert all(b["wallet"] == "addr1" for b in first) and again == first[0]
+
+
+def test_batch_is_capped_and_isolates_failures(monkeypatch):
+    monkeypatch.setattr(settings, "WALLET_MAX_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "WALLET_BALANCE_TTL_SECONDS", 0.0)
+    service, upstream = _service(monkeypatch)
+    wallets = [f"addr{i}" for i in range(12)] + ["addr_unknown"]
+
+    async def run():
+        items = await service.get_balances(wallets)
+        await service.get_balance("addr0")  # no caching with TTL 0
+        await service.aclose()
+        return items
+
+    items = asyncio.run(run())
+    assert [i.wallet for i in items] == wallets
+    assert all(i.balance and not i.error for i in items[:-1])
+    assert items[-1].balance is None and "404" in items[-1].error
+    assert upstream.peak <= 3
+    assert len(upstream.calls) == len(wallets) + 1
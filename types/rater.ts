@@ -49,7 +49,7 @@ export interface RateRequest {
 }
 
 export interface RateResponse {
-    route_rating: RouteRating;
+    route_rating: RouteRating | null;
     recommended_providers: ProviderRating[];
     alternative_routes: RouteRating[];
     best_transaction: TransactionRating;